@@ -1,17 +1,50 @@
 import random
 from dataclasses import dataclass
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date
+
+from catalog_schema import SCHEMA_VERSION
 
 # Import Embedded Data
 try:
     from embedded_data import RAW_ANIME_DATA, CN_TITLES, CN_SYNOPSIS
 except ImportError:
-    print("Warning: embedded_data.py not found. Please run generate_embedded.py.")
+    # Web bundle (build_bundle.py) ships a data pack instead; see install_data()
+    print("Warning: embedded_data.py not found. Run generate_embedded.py, or load a data pack.")
     RAW_ANIME_DATA = []
     CN_TITLES = {}
     CN_SYNOPSIS = {}
 
+try:
+    from embedded_data import DAILY_SCHEDULE
+except ImportError:
+    DAILY_SCHEDULE = {}
+
+try:
+    from embedded_data import MASKED_SYNOPSIS
+except ImportError:
+    MASKED_SYNOPSIS = {}
+
+try:
+    from embedded_data import IMAGE_MAP
+except ImportError:
+    IMAGE_MAP = {}
+
+try:
+    from embedded_data import ALIASES
+except ImportError:
+    ALIASES = {}
+
+try:
+    from embedded_data import FRANCHISES
+except ImportError:
+    FRANCHISES = {}
+
+try:
+    from embedded_data import CATALOG_SCHEMA
+except ImportError:
+    CATALOG_SCHEMA = 0 # Generated before validation existed: checked on load
+
 @dataclass
 class Anime:
     id: int
@@ -26,6 +59,20 @@ class Anime:
     demographic: str
     source: str
     synopsis: str = "" # New field
+    name_jp: str = ""
+    masked_synopsis: str = "" # Pre-masked at build time (generate_masked_synopsis.py)
+    blur_url: str = "" # Pre-blurred LV2 cover (build_images.py), empty = blur live
+    score: float = 0.0 # MAL score, used as the popularity prior in search
+    media_type: str = "" # TV / Movie / OVA ... (Jikan list fields, see jikan.py)
+    season: str = "" # spring / summer / fall / winter, empty if unknown
+    rating: str = "" # Age rating, e.g. "PG-13 - Teens 13 or older"
+    status: str = "" # Finished Airing / Currently Airing
+    members: int = 0 # MAL members
+    franchise_id: int = 0 # Smallest MAL id among related seasons (franchise.py), own id if none
+
+    def __post_init__(self):
+        if not self.franchise_id:
+            self.franchise_id = self.id
 
 
 # Mappings (Ported from JS, unchanged)
@@ -65,13 +112,40 @@ SOURCE_MAP = {
 }
 
 # Pre-process Maps
-# Convert string keys to int for Titles
 TITLE_MAP = {}
-for k, v in CN_TITLES.items():
-    try:
-        TITLE_MAP[int(k)] = v
-    except ValueError:
-        pass
+_SCHEDULE_START = None
+
+def _index_data():
+    global _SCHEDULE_START
+    # Convert string keys to int for Titles
+    TITLE_MAP.clear()
+    for k, v in CN_TITLES.items():
+        try:
+            TITLE_MAP[int(k)] = v
+        except ValueError:
+            pass
+    _SCHEDULE_START = date.fromisoformat(DAILY_SCHEDULE['start']) if DAILY_SCHEDULE.get('start') else None
+
+_index_data()
+
+DATA_KEYS = ('RAW_ANIME_DATA', 'CN_TITLES', 'CN_SYNOPSIS', 'DAILY_SCHEDULE', 'MASKED_SYNOPSIS', 'IMAGE_MAP', 'ALIASES', 'FRANCHISES', 'CATALOG_SCHEMA')
+
+def install_data(data: Dict):
+    """Replace the embedded data with a data pack (same keys as embedded_data.py)."""
+    global RAW_ANIME_DATA, CN_TITLES, CN_SYNOPSIS, DAILY_SCHEDULE, MASKED_SYNOPSIS, IMAGE_MAP, ALIASES, FRANCHISES, CATALOG_SCHEMA
+    RAW_ANIME_DATA = data.get('RAW_ANIME_DATA', [])
+    CN_TITLES = data.get('CN_TITLES', {})
+    CN_SYNOPSIS = data.get('CN_SYNOPSIS', {})
+    DAILY_SCHEDULE = data.get('DAILY_SCHEDULE', {})
+    MASKED_SYNOPSIS = data.get('MASKED_SYNOPSIS', {})
+    IMAGE_MAP = data.get('IMAGE_MAP', {})
+    ALIASES = data.get('ALIASES', {})
+    FRANCHISES = data.get('FRANCHISES', {})
+    CATALOG_SCHEMA = data.get('CATALOG_SCHEMA', 0)
+    _index_data()
+
+def has_data() -> bool:
+    return bool(RAW_ANIME_DATA)
 
 def load_anime_data() -> List[Anime]:
     raw_data = RAW_ANIME_DATA
@@ -79,33 +153,42 @@ def load_anime_data() -> List[Anime]:
         print("Warning: RAW_ANIME_DATA is empty.")
         return []
 
+    # generate_embedded.py validates and fills every field (catalog_schema.py),
+    # so entries are indexed directly; older data is validated here instead
+    if CATALOG_SCHEMA != SCHEMA_VERSION:
+        from catalog_schema import validate_catalog
+        raw_data, errors, _ = validate_catalog(raw_data)
+        print(f"Warning: data was not built with catalog schema v{SCHEMA_VERSION}, "
+              f"validated on load ({len(errors)} problem(s)). Run generate_embedded.py.")
+
     anime_list = []
     for item in raw_data:
         # Translate Genres
-        raw_genres = item.get('genres', []) + item.get('themes', [])
+        raw_genres = item['genres'] + item['themes']
         translated_genres = []
         for g in raw_genres:
             if g in GENRE_MAP:
                 translated_genres.append(GENRE_MAP[g])
         
-        # Unique and top 3
-        unique_genres = list(set(translated_genres))[:3]
+        # Unique and top 3, in data order: a set's order changes with the hash
+        # seed, and saved sessions store hint tags as indices into this list
+        unique_genres = list(dict.fromkeys(translated_genres))[:3]
         if not unique_genres:
             unique_genres = ["其他"]
 
         # Studio
-        studios = item.get('studios', [])
+        studios = item['studios']
         studio_name = studios[0] if studios else "Unknown"
 
         # Demo
-        demos = item.get('demographics', [])
+        demos = item['demographics']
         demo_name = DEMO_MAP.get(demos[0], "未知") if demos else "未知"
         
         # Source
-        src = SOURCE_MAP.get(item.get('source'), item.get('source'))
+        src = SOURCE_MAP.get(item['source'], item['source'])
 
         # Translate Themes
-        raw_themes = item.get('themes', [])
+        raw_themes = item['themes']
         translated_themes = []
         for t in raw_themes:
             # Try THEME_MAP first, then GENRE_MAP
@@ -121,35 +204,68 @@ def load_anime_data() -> List[Anime]:
         # But we also have TITLE_MAP with Int keys.
         # CN_SYNOPSIS keys are likely strings (from JSON).
         cn_desc = CN_SYNOPSIS.get(str(item['id']))
-        final_synopsis = cn_desc if cn_desc else item.get('synopsis', '')
+        final_synopsis = cn_desc if cn_desc else item['synopsis']
+
+        # Bundled thumbnails replace the full-size MAL CDN image when available
+        images = IMAGE_MAP.get(str(item['id']), {})
 
         anime = Anime(
             id=item['id'],
-            name_cn=TITLE_MAP.get(int(item['id']), item['name_en']), # Ensure Int key
+            name_cn=TITLE_MAP.get(item['id'], item['name_en']),
             name_en=item['name_en'],
-            image_url=item.get('image_url', ''), # Load URL
+            image_url=images.get('thumb') or item['image_url'],
             genres=unique_genres,
             themes=translated_themes, # Use translated themes
             studio=studio_name,
-            year=item.get('year') or 0,
-            episodes=item.get('episodes') or 0,
+            year=item['year'],
+            episodes=item['episodes'],
             demographic=demo_name,
             source=src,
-            synopsis=final_synopsis # Use combined logic
+            synopsis=final_synopsis, # Use combined logic
+            name_jp=item['name_jp'],
+            masked_synopsis=MASKED_SYNOPSIS.get(str(item['id']), ''),
+            blur_url=images.get('blur', ''),
+            score=item['score'],
+            media_type=item['media_type'],
+            season=item['season'],
+            rating=item['rating'],
+            status=item['status'],
+            members=item['members'],
+            franchise_id=FRANCHISES.get(str(item['id']), item['id']),
         )
         anime_list.append(anime)
     
     return anime_list
 
-def get_daily_anime(anime_list: List[Anime]) -> Optional[Anime]:
+_lookup_cache = (None, {}, [])
+
+def _daily_lookup(anime_list: List[Anime]):
+    """(id -> Anime, id-sorted list) for anime_list, built once per list (the catalog is never mutated)."""
+    global _lookup_cache
+    if _lookup_cache[0] is not anime_list:
+        _lookup_cache = (anime_list, {a.id: a for a in anime_list}, sorted(anime_list, key=lambda a: a.id))
+    return _lookup_cache[1], _lookup_cache[2]
+
+def get_daily_anime(anime_list: List[Anime], day: Optional[date] = None) -> Optional[Anime]:
     if not anime_list:
         return None
     
-    # Seed by date
-    today = datetime.now()
+    today = day or date.today()
+
+    # Precomputed rotation (generate_daily_schedule.py): O(1) index by day offset
+    schedule_ids = DAILY_SCHEDULE.get('ids', [])
+    if schedule_ids:
+        offset = (today - _SCHEDULE_START).days
+        if 0 <= offset < len(schedule_ids):
+            mal_id = schedule_ids[offset]
+            anime = _daily_lookup(anime_list)[0].get(mal_id)
+            if anime:
+                return anime
+
+    # Fallback: isolated PRNG seeded by date, over id-sorted catalog
+    # (never reseeds the global random module)
     seed = today.year * 1000 + today.month * 100 + today.day
-    random.seed(seed)
-    return random.choice(anime_list)
+    return random.Random(seed).choice(_daily_lookup(anime_list)[1])
 
 def get_random_anime(anime_list: List[Anime]) -> Optional[Anime]:
     if not anime_list:
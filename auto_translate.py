@@ -9,6 +9,7 @@ import urllib.request
 # Config
 import sys
 from deep_translator import GoogleTranslator # Added import
+from catalog_schema import load_raw_anime
 # Fix stdout encoding for Windows
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -60,14 +61,7 @@ def search_bangumi(keyword):
 
 def main():
     print("Loading data...")
-    raw_data = load_json(RAW_DATA_PATH)
-    if isinstance(raw_data, dict): # Handle if rawAnime is dict or list
-        raw_data = raw_data.get('data', []) # Should be a list based on Jikan structure usually, but our logic saved a list directly
-    
-    # Ensuring raw_data is a list
-    if not isinstance(raw_data, list):
-        print("Error: rawAnime.json format incorrect.")
-        return
+    raw_data = load_raw_anime(RAW_DATA_PATH)
 
     cn_titles = load_json(CN_TITLES_PATH)
     
@@ -0,0 +1,101 @@
+import random
+import sys
+import time
+
+from anime_data import load_anime_data
+from game_engine import GameSession, compare
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+SEED = 42
+REPEAT = 5           # Best-of-N timing
+GAMES = 2000         # Full random games for the end-to-end case
+
+
+def bench(name, func, number):
+    """Run func() `number` times, REPEAT rounds, and print the best per-op time."""
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    per_op = best / number
+    print(f"{name:<28} {per_op * 1e6:>10.2f} us/op  {1 / per_op:>12,.0f} ops/s")
+
+
+def play_random_game(anime_list, rng):
+    """Guess uniformly at random among unguessed titles until solved."""
+    session = GameSession(anime_list, target=rng.choice(anime_list), rng=rng)
+    pool = list(anime_list)
+    rng.shuffle(pool)
+    for anime in pool:
+        if session.has_guessed(anime):
+            continue  # Catalog may list the same id twice
+        session.guess(anime)
+        if session.game_over:
+            break
+    return session.attempts
+
+
+def main():
+    anime_list = load_anime_data()
+    if not anime_list:
+        print("No data loaded.")
+        return
+
+    rng = random.Random(SEED)
+    pairs = [(rng.choice(anime_list), rng.choice(anime_list)) for _ in range(1000)]
+    print(f"Catalog: {len(anime_list)} anime\n")
+
+    # compare(): the per-row rule set behind build_guess_row
+    it = iter(pairs * 10_000)
+    bench("compare", lambda: compare(*next(it)), 10_000)
+
+    # guess(): compare + state update (fresh session every 8 guesses)
+    state = {"session": None, "n": 0}
+    def one_guess():
+        if state["n"] % 8 == 0:
+            state["session"] = GameSession(anime_list, target=rng.choice(anime_list), rng=rng)
+        session = state["session"]
+        anime = rng.choice(anime_list)
+        if not session.game_over and not session.has_guessed(anime):
+            session.guess(anime)
+        state["n"] += 1
+    bench("GameSession.guess", one_guess, 10_000)
+
+    # Hint unlock with a few guesses on the board
+    def unlock_all():
+        session = GameSession(anime_list, target=rng.choice(anime_list), rng=rng)
+        for anime in rng.sample(anime_list, 5):
+            if not session.game_over:
+                session.guess(anime)
+        for level in (1, 1, 1, 2, 3):
+            session.unlock_hint(level)
+    bench("5 guesses + 5 hint unlocks", unlock_all, 2_000)
+
+    # Serialize / restore round trip
+    session = GameSession(anime_list, target=anime_list[0], rng=rng)
+    for anime in anime_list[1:9]:
+        session.guess(anime)
+    session.unlock_hint(1)
+    data = session.to_dict()
+    bench("to_dict", session.to_dict, 10_000)
+    bench("from_dict", lambda: GameSession.from_dict(data, anime_list), 200)
+    blob = session.to_bytes()
+    bench(f"to_bytes ({len(blob)} bytes)", session.to_bytes, 10_000)
+    bench("from_bytes", lambda: GameSession.from_bytes(blob, anime_list), 200)
+
+    # End-to-end random games
+    start = time.perf_counter()
+    total = sum(play_random_game(anime_list, rng) for _ in range(GAMES))
+    elapsed = time.perf_counter() - start
+    print(f"\n{GAMES} random games in {elapsed:.2f}s "
+          f"({GAMES / elapsed:,.0f} games/s, avg {total / GAMES:.1f} guesses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import random
+import sys
+import time
+
+import flet as ft
+import msgpack
+from flet.controls.base_control import BaseControl
+from flet.controls.object_patch import ObjectPatch
+from flet.messaging.protocol import MessageAction, PatchControlBody, configure_encode_object_for_msgpack
+
+from anime_data import load_anime_data
+from game_engine import compare
+from guess_row import COLORS, COL_WIDTHS, build_guess_row
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+SEED = 7
+ROWS = 2000
+PATCHED_ROWS = 200        # Guesses replayed through Flet's diff (it re-walks the whole list each time)
+
+
+# --- Baseline: the per-call renderer main.py used before guess_row.py ---
+
+def legacy_create_cell(content, status, width):
+    status_colors = {
+        "correct": COLORS["green_600"],
+        "incorrect": COLORS["red_600"],
+        "partial": COLORS["amber_600"],
+        "neutral": COLORS["blue_grey_700"],
+    }
+    return ft.Container(
+        content=ft.Text(str(content), size=16, weight="bold", text_align="center", color="white"),
+        width=width, height=110,
+        bgcolor=status_colors.get(status, COLORS["blue_grey_800"]),
+        border_radius=8, alignment=ft.Alignment(0, 0),
+        animate=ft.Animation(500, ft.AnimationCurve.BOUNCE_OUT), padding=5,
+    )
+
+
+def legacy_build_guess_row(guess, feedback):
+    tags = [
+        ft.Container(
+            content=ft.Text(g, size=20, weight="bold", color="white"),
+            bgcolor=COLORS["green_600"] if ok else COLORS["red_600"],
+            padding=ft.Padding(left=6, right=6, top=3, bottom=3), border_radius=4,
+        )
+        for g, ok in feedback.genres
+    ]
+    cells = [
+        ft.Container(
+            content=ft.Image(src=guess.image_url, fit="cover", border_radius=4),
+            width=COL_WIDTHS[0], height=110, bgcolor=COLORS["blue_grey_900"],
+            border_radius=8, padding=5, animate=ft.Animation(500, ft.AnimationCurve.BOUNCE_OUT),
+        ),
+        legacy_create_cell(guess.name_cn, feedback.title, COL_WIDTHS[1]),
+        legacy_create_cell(guess.studio, feedback.studio, COL_WIDTHS[2]),
+        ft.Container(
+            content=ft.Row(controls=tags, wrap=True, spacing=4, run_spacing=4, alignment=ft.MainAxisAlignment.CENTER),
+            width=COL_WIDTHS[3], height=110, bgcolor=COLORS["blue_grey_800"],
+            border_radius=8, alignment=ft.Alignment(0, 0), padding=5,
+        ),
+        legacy_create_cell(f"{guess.year} {feedback.year_arrow}", feedback.year, COL_WIDTHS[4]),
+        legacy_create_cell(f"{guess.episodes} {feedback.episodes_arrow}", feedback.episodes, COL_WIDTHS[5]),
+        legacy_create_cell(guess.demographic, feedback.demographic, COL_WIDTHS[6]),
+        legacy_create_cell(guess.source, feedback.source, COL_WIDTHS[7]),
+    ]
+    return ft.Row(controls=cells, alignment=ft.MainAxisAlignment.CENTER, spacing=5)
+
+
+# --- Measurement helpers ---
+
+def guess_patch(view, encode, mount=False):
+    """
+    What page.update() sends after a guess: Flet's own diff of the guess
+    list (ObjectPatch, as Session.patch_control computes it), packed into a
+    PATCH_CONTROL message with the transport's msgpack encoder. Returns
+    (message bytes, controls added). mount=True sends the whole view.
+    """
+    patch, added, _ = ObjectPatch.from_diff(None if mount else view, view, control_cls=BaseControl)
+    body = msgpack.packb([MessageAction.PATCH_CONTROL, PatchControlBody(view._i, patch.to_message())],
+                         default=encode)
+    return len(body), len(added)
+
+
+def measure(name, render, pairs):
+    start = time.perf_counter()
+    rows = [render(g, fb) for g, fb in pairs]
+    elapsed = time.perf_counter() - start
+
+    # Replay the game: one row inserted at the top per guess, as main.process_guess does
+    encode = configure_encode_object_for_msgpack(BaseControl)
+    view = ft.ListView()
+    guess_patch(view, encode, mount=True)  # Initial page load, not counted
+    wire_bytes = controls = 0
+    for row in rows[:PATCHED_ROWS]:
+        view.controls.insert(0, row)
+        size, added = guess_patch(view, encode)
+        wire_bytes += size
+        controls += added
+    n = min(len(rows), PATCHED_ROWS)
+    print(f"{name:<10} {elapsed / len(rows) * 1e6:8.1f} us/row  "
+          f"{controls / n:6.1f} controls/guess  {wire_bytes / n:8.0f} bytes/guess")
+    return wire_bytes / n
+
+
+def main():
+    anime_list = load_anime_data()
+    if not anime_list:
+        print("No data loaded.")
+        return
+    rng = random.Random(SEED)
+    pairs = []
+    for _ in range(ROWS):
+        guess, target = rng.choice(anime_list), rng.choice(anime_list)
+        pairs.append((guess, compare(guess, target)))
+
+    print(f"Rendering {ROWS} guess rows...\n")
+    before = measure("before", legacy_build_guess_row, pairs)
+    after = measure("after", build_guess_row, pairs)
+    print(f"\nPATCH_CONTROL message per guess: {after / before:.0%} of before (Flet {ft.__version__})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import statistics
+import sys
+import time
+
+from anime_data import load_anime_data, ALIASES
+from search_index import SearchIndex
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+TOP_N = 3        # The title counts as "found" once it is within the first N suggestions
+SHOWN = 10       # Suggestions shown by the UI
+
+
+def legacy_search(anime_list, val):
+    """The substring filter main.py used before SearchIndex (catalog order)."""
+    val = val.lower().strip()
+    return [a for a in anime_list if val in a.name_cn or val in a.name_en.lower()][:SHOWN]
+
+
+def keystrokes_to_find(search, target, name):
+    """Characters of name typed before target shows up in the top TOP_N (None = never)."""
+    for n in range(1, len(name) + 1):
+        if any(a.id == target.id for a in search(name[:n])[:TOP_N]):
+            return n
+    return None
+
+
+def report(label, search, anime_list, field):
+    counts, latencies = [], []
+    for a in anime_list:
+        name = getattr(a, field)
+        start = time.perf_counter()
+        n = keystrokes_to_find(search, a, name)
+        latencies.append((time.perf_counter() - start) * 1000 / (n or len(name)))
+        counts.append(n if n is not None else len(name))
+    found = sum(1 for a, n in zip(anime_list, counts) if n < len(getattr(a, field)))
+    print(f"{label:<8} {statistics.mean(counts):6.2f} keys avg  "
+          f"{found / len(anime_list):6.1%} found before the full title  "
+          f"{statistics.median(latencies):6.2f} ms/keystroke (median)")
+
+
+def main():
+    anime_list = load_anime_data()
+    if not anime_list:
+        print("No data loaded.")
+        return
+    # One entry per MAL id
+    anime_list = list({a.id: a for a in anime_list}.values())
+
+    start = time.perf_counter()
+    index = SearchIndex(anime_list, ALIASES)
+    print(f"Index built in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"({len(index.keys)} keys, {len(index.prefix_top)} prefixes)\n")
+
+    for field in ("name_cn", "name_en"):
+        print(f"Typing {field}, target in top {TOP_N}:")
+        report("before", lambda q: legacy_search(anime_list, q), anime_list, field)
+        report("after", lambda q: index.search(q, SHOWN), anime_list, field)
+        print()
+
+
+if __name__ == "__main__":
+    main()
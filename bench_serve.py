@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from anime_data import load_anime_data
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+HOST = "127.0.0.1"
+PORT = 8650
+WORKER_BASE_PORT = 8700
+WORKER_COUNTS = [1, 2, 4]
+CLIENTS = 64
+CLIENT_PROCS = 4          # Load generator processes
+DURATION = 5.0            # Seconds of load per worker count
+KEYSTROKES = 3            # Search requests before each guess
+STARTUP_TIMEOUT = 30.0
+SEED = 42
+
+
+def wait_for_port(port, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+async def client(anime_list, rng, deadline, counts):
+    """One simulated player: type a few characters, then guess; new game when over."""
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+
+    async def call(request):
+        writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        counts["requests"] += 1
+        return reply
+
+    try:
+        while time.perf_counter() < deadline:
+            anime = rng.choice(anime_list)
+            for n in range(1, min(KEYSTROKES, len(anime.name_cn)) + 1):
+                await call({"op": "search", "q": anime.name_cn[:n]})
+            reply = await call({"op": "guess", "id": anime.id})
+            if reply.get("won") or reply.get("error"):
+                await call({"op": "new"})
+    finally:
+        writer.close()
+
+
+async def run_clients(anime_list, first, count, duration):
+    counts = {"requests": 0}
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        client(anime_list, random.Random(f"{SEED}:{i}"), deadline, counts) for i in range(first, first + count)
+    ))
+    return counts["requests"]
+
+
+def _client_process(args):
+    first, count, duration = args
+    return asyncio.run(run_clients(load_anime_data(), first, count, duration))
+
+
+def worker_memory(server_pid):
+    """
+    Mean (RSS, PSS) in KB of the server's worker processes, from Linux
+    /proc (None elsewhere). PSS splits shared pages between the processes
+    mapping them, so it shows what each worker really costs.
+    """
+    try:
+        with open(f"/proc/{server_pid}/task/{server_pid}/children") as f:
+            pids = f.read().split()
+        totals = []
+        for pid in pids:
+            fields = {}
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                for line in f:
+                    name, _, rest = line.partition(":")
+                    if name in ("Rss", "Pss"):
+                        fields[name] = int(rest.split()[0])
+            totals.append((fields["Rss"], fields["Pss"]))
+    except (OSError, KeyError, ValueError):
+        return None
+    if not totals:
+        return None
+    return (sum(r for r, _ in totals) / len(totals), sum(p for _, p in totals) / len(totals))
+
+
+def run_load(clients, procs, duration):
+    """Requests/s over all clients, spread over several processes so the load generator is not the bottleneck."""
+    per_proc = -(-clients // procs)
+    jobs = [(i, min(per_proc, clients - i), duration) for i in range(0, clients, per_proc)]
+    with multiprocessing.Pool(len(jobs)) as pool:
+        total = sum(pool.map(_client_process, jobs))
+    return total / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test serve.py (headless workers) at several worker counts.")
+    parser.add_argument("--workers", type=int, nargs="+", default=WORKER_COUNTS)
+    parser.add_argument("--clients", type=int, default=CLIENTS)
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--procs", type=int, default=CLIENT_PROCS)
+    args = parser.parse_args()
+
+    if not load_anime_data():
+        print("No data loaded.")
+        return
+
+    print(f"{args.clients} clients in {args.procs} processes, {args.duration:.0f}s per run, "
+          f"{os.cpu_count()} CPUs (scaling stops at the core count)\n")
+    print(f"{'workers':>7} {'req/s':>10} {'speedup':>8} {'RSS/worker':>11} {'PSS/worker':>11}")
+    baseline = None
+    for n in args.workers:
+        server = subprocess.Popen(
+            [sys.executable, "serve.py", "--headless", "--workers", str(n),
+             "--port", str(PORT), "--worker-base-port", str(WORKER_BASE_PORT),
+             "--affinity", "connection"],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            if not wait_for_port(PORT, STARTUP_TIMEOUT) or not all(
+                    wait_for_port(WORKER_BASE_PORT + i, STARTUP_TIMEOUT) for i in range(n)):
+                print(f"{n:>7} server did not start")
+                continue
+            rate = run_load(args.clients, args.procs, args.duration)
+            baseline = baseline or rate
+            memory = worker_memory(server.pid)  # After the load: pages the handlers touched count too
+            memory_text = f"{memory[0] / 1024:>9.1f}MB {memory[1] / 1024:>9.1f}MB" if memory else f"{'n/a':>11} {'n/a':>11}"
+            print(f"{n:>7} {rate:>10.0f} {rate / baseline:>7.2f}x {memory_text}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
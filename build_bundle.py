@@ -0,0 +1,363 @@
+import ast
+import hashlib
+import io
+import json
+import os
+import py_compile
+import re
+import shutil
+import sys
+import tarfile
+import time
+
+from data_pack import PACK_NAME, JS_PREFETCH, JS_PACK_URL, encode_pack, decode_pack
+from generate_embedded import collect_data
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+ENTRY = 'main.py'
+BUILD_DIR = 'build'
+APP_DIR = os.path.join(BUILD_DIR, 'web_app')   # What `flet publish` packs into app.tar.gz
+PACK_PATH = os.path.join(BUILD_DIR, PACK_NAME)  # Served next to index.html, not inside the archive
+EMBEDDED_MODULE = 'embedded_data'               # Replaced by the data pack
+RUNTIME_PACKAGES = {'flet'}                     # requirements.txt entries needed in the browser
+PYODIDE_PYTHON = (3, 12)                        # Pyodide 0.27 (docs/python.js); .pyc only loads on the same version
+SKIP_DIRS = {'.git', 'docs', 'dist', BUILD_DIR, 'assets', '__pycache__', '.image_cache'}
+HASHED_FILES = ['app.tar.gz', PACK_NAME]        # Renamed to name.<hash>.ext, so they can be cached forever
+HASH_LEN = 10
+PACK_STEM = PACK_NAME.split('.')[0]             # anidle_data.<hash>.json.gz after hashing
+SERVICE_WORKER = 'flutter_service_worker.js'
+BOOTSTRAP = 'flutter_bootstrap.js'              # Holds serviceWorkerVersion
+UNCACHED_SUFFIXES = ('.map',)                   # Never requested by players
+PRECACHE_DIRS = ('covers/', 'fonts/')           # Downloaded in the background for offline play
+# Third-party files with immutable URLs (Pyodide wheels, MAL covers, Flutter fallback fonts): cache first
+RUNTIME_CACHE_HOSTS = ['files.pythonhosted.org', 'cdn.myanimelist.net', 'fonts.gstatic.com']
+
+# Appended to flutter_service_worker.js. Flutter's own fetch handler only
+# serves files listed in RESOURCES; this adds a background precache of
+# PRECACHE (covers, font, data pack) and a runtime cache for cross-origin
+# requests, so the game starts and plays without the network.
+SW_OFFLINE_JS = '''
+// --- Offline play (added by build_bundle.py) ---
+const PRECACHE = %(precache)s;
+const RUNTIME_CACHE = 'anidle-runtime-cache';
+const RUNTIME_CACHE_HOSTS = %(hosts)s;
+
+// Sent by index.html once the page has loaded, so it never competes with startup
+self.addEventListener('message', (event) => {
+  if (event.data === 'precacheOffline') {
+    event.waitUntil(precacheOffline());
+  }
+});
+async function precacheOffline() {
+  var cache = await caches.open(CACHE_NAME);
+  var missing = [];
+  for (var key of PRECACHE) {
+    if (!(await cache.match(key))) {
+      missing.push(key);
+    }
+  }
+  // Unlike cache.addAll, one failed file does not discard the rest
+  await Promise.all(missing.map((key) => fetch(key).then((response) => {
+    if (response.ok) {
+      return cache.put(key, response);
+    }
+  }).catch(() => {})));
+}
+// Cross-origin GETs (micropip's PyPI lookups, MAL covers without a local
+// thumbnail): cache first for immutable hosts, otherwise network first
+// with the last response as the offline fallback.
+self.addEventListener('fetch', (event) => {
+  var url = new URL(event.request.url);
+  if (event.request.method !== 'GET' || url.origin === self.origin || !url.protocol.startsWith('http')) {
+    return;
+  }
+  var cacheFirst = RUNTIME_CACHE_HOSTS.includes(url.hostname);
+  event.respondWith(caches.open(RUNTIME_CACHE).then(async (cache) => {
+    var cached = await cache.match(event.request);
+    if (cached && cacheFirst) {
+      return cached;
+    }
+    try {
+      var response = await fetch(event.request);
+      if (response.ok) {
+        cache.put(event.request, response.clone());
+      }
+      return response;
+    } catch (err) {
+      if (cached) {
+        return cached;
+      }
+      throw err;
+    }
+  }));
+});
+'''
+SW_OFFLINE_MARKER = '// --- Offline play'
+PRECACHE_TRIGGER = '''<script>
+    // Ask the service worker to fill the offline cache once the game is up
+    window.addEventListener('load', () => navigator.serviceWorker?.ready.then((reg) => reg.active?.postMessage('precacheOffline')));
+  </script>'''
+
+
+def find_runtime_modules(entry):
+    """Local modules reachable from entry through import statements (including lazy ones)."""
+    found, queue = [], [os.path.splitext(entry)[0]]
+    while queue:
+        name = queue.pop()
+        if name in found or name == EMBEDDED_MODULE or not os.path.exists(f"{name}.py"):
+            continue
+        found.append(name)
+        with open(f"{name}.py", 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                queue.extend(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                queue.append(node.module.split('.')[0])
+    return sorted(found)
+
+
+def runtime_requirements():
+    if not os.path.exists('requirements.txt'):
+        return []
+    with open('requirements.txt', 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return [line for line in lines
+            if line.split('>')[0].split('=')[0].split('<')[0].strip().lower() in RUNTIME_PACKAGES]
+
+
+def stage_app(modules):
+    """Copy runtime modules into APP_DIR; ship bytecode only if it matches Pyodide's Python."""
+    if os.path.exists(APP_DIR):
+        shutil.rmtree(APP_DIR)
+    os.makedirs(APP_DIR)
+
+    ship_bytecode = sys.version_info[:2] == PYODIDE_PYTHON
+    entry_module = os.path.splitext(ENTRY)[0]
+    for name in modules:
+        src = f"{name}.py"
+        if ship_bytecode and name != entry_module:
+            # Sourceless .pyc next to where the .py would be: no parse/compile in the browser
+            py_compile.compile(src, cfile=os.path.join(APP_DIR, f"{name}.pyc"), doraise=True,
+                               invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        else:
+            # Still compiled here so syntax errors fail the build, not the page
+            py_compile.compile(src, cfile=os.path.join(BUILD_DIR, '__pycache__', f"{name}.pyc"), doraise=True)
+            shutil.copy2(src, os.path.join(APP_DIR, src))
+
+    with open(os.path.join(APP_DIR, 'requirements.txt'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(runtime_requirements()) + '\n')
+    return ship_bytecode
+
+
+def slim_for_web(data):
+    """
+    Drop data the browser never uses: relations, and synopsis text the
+    browser never shows (LV3 uses the pre-masked synopsis when there is
+    one, so the raw English and CN originals are only kept without it).
+    """
+    masked = data['MASKED_SYNOPSIS']
+    cn = data['CN_SYNOPSIS']
+    raw = data['RAW_ANIME_DATA']
+    slim = dict(data)
+    slim['CN_SYNOPSIS'] = {k: v for k, v in cn.items() if k not in masked}
+    # Relations only matter to the data scripts. Dropped synopses stay as ''
+    # so every entry keeps the validated field set (catalog_schema.py).
+    slim['RAW_ANIME_DATA'] = [
+        {k: '' if k == 'synopsis' and (str(item['id']) in masked or str(item['id']) in cn) else v
+         for k, v in item.items() if k != 'relations'}
+        for item in raw
+    ]
+    return slim
+
+
+def write_data_pack():
+    data = collect_data()
+    if data is None:
+        return None
+    blob = encode_pack(slim_for_web(data))
+    with open(PACK_PATH, 'wb') as f:
+        f.write(blob)
+    return blob
+
+
+def patch_web_build(dist_dir):
+    """
+    Put the data pack next to index.html and start downloading it early:
+    a preload link in index.html (while Flutter boots) and a fetch at the
+    top of python-worker.js (while Pyodide boots). index.html also starts
+    the offline precache after load. Safe to run twice.
+    """
+    shutil.copy2(PACK_PATH, os.path.join(dist_dir, PACK_NAME))
+
+    index_path = os.path.join(dist_dir, 'index.html')
+    with open(index_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    patched = html
+    if 'rel="preload"' not in patched:
+        link = f'<link rel="preload" href="{PACK_NAME}" as="fetch" crossorigin="anonymous">'
+        patched = patched.replace('</title>', f'</title>\n  {link}', 1)
+    if PRECACHE_TRIGGER not in patched:
+        patched = patched.replace('</body>', f'  {PRECACHE_TRIGGER}\n</body>', 1)
+    if patched != html:
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(patched)
+
+    worker_path = os.path.join(dist_dir, 'python-worker.js')
+    with open(worker_path, 'r', encoding='utf-8') as f:
+        worker = f.read()
+    if f'self.{JS_PREFETCH} =' not in worker:
+        # fetch_pack() reads the URL back, so it still works after hashing renames the pack
+        prefetch = f'self.{JS_PACK_URL} = "{PACK_NAME}"; self.{JS_PREFETCH} = fetch(self.{JS_PACK_URL});'
+        with open(worker_path, 'w', encoding='utf-8') as f:
+            f.write(f"{prefetch} // Data pack download overlaps Pyodide boot\n{worker}")
+
+
+def _digest(path, algorithm='md5'):
+    h = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _replace_in_file(path, old, new):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if old in text:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text.replace(old, new))
+
+
+def hash_asset_names(dist_dir):
+    """
+    Rename the app package and data pack to name.<content hash>.ext and
+    point index.html / python-worker.js at the new names. A changed file
+    gets a new URL; an unchanged one keeps its URL and stays cached.
+    """
+    renamed = {}
+    for name in HASHED_FILES:
+        path = os.path.join(dist_dir, name)
+        if not os.path.exists(path):
+            continue
+        stem, ext = name.split('.', 1)
+        hashed = f"{stem}.{_digest(path, 'sha256')[:HASH_LEN]}.{ext}"
+        os.replace(path, os.path.join(dist_dir, hashed))
+        for ref in ('index.html', 'python-worker.js'):
+            _replace_in_file(os.path.join(dist_dir, ref), f'"{name}"', f'"{hashed}"')
+        renamed[name] = hashed
+    return renamed
+
+
+def write_sw_manifest(dist_dir):
+    """
+    Regenerate the service worker's RESOURCES table from what is actually
+    in dist (hashed files and Pyodide included), so an upgrade only evicts
+    files whose checksum changed. serviceWorkerVersion becomes a hash of
+    that table: a deploy that changes nothing does not reinstall the worker.
+    Also appends the offline precache / runtime cache (SW_OFFLINE_JS).
+    Run after every other change to dist.
+    """
+    resources = {}
+    for root, _, names in os.walk(dist_dir):
+        for n in names:
+            key = os.path.relpath(os.path.join(root, n), dist_dir).replace(os.sep, '/')
+            if key in (SERVICE_WORKER, BOOTSTRAP, 'index.html') or key.endswith(UNCACHED_SUFFIXES):
+                continue
+            resources[key] = _digest(os.path.join(root, n))
+
+    version = hashlib.sha256(json.dumps(resources, sort_keys=True).encode()).hexdigest()[:HASH_LEN]
+    bootstrap_path = os.path.join(dist_dir, BOOTSTRAP)
+    with open(bootstrap_path, 'r', encoding='utf-8') as f:
+        bootstrap = f.read()
+    with open(bootstrap_path, 'w', encoding='utf-8') as f:
+        f.write(re.sub(r'serviceWorkerVersion: "[^"]*"', f'serviceWorkerVersion: "{version}"', bootstrap))
+    for key in (BOOTSTRAP, 'index.html'):
+        resources[key] = _digest(os.path.join(dist_dir, key))
+    resources['/'] = resources['index.html']
+
+    sw_path = os.path.join(dist_dir, SERVICE_WORKER)
+    with open(sw_path, 'r', encoding='utf-8') as f:
+        sw = f.read()
+    table = ',\n'.join(f'"{k}": "{v}"' for k, v in sorted(resources.items()))
+    sw = re.sub(r'const RESOURCES = \{.*?\};', lambda _: f'const RESOURCES = {{{table}}};', sw, count=1, flags=re.S)
+    # Keys are relative to the worker's scope, not the origin: the site lives under /Anidle/
+    sw = sw.replace('self.location.origin', "self.registration.scope.replace(/\\/$/, '')")
+    precache = sorted(k for k in resources if k.startswith(PRECACHE_DIRS) or k.startswith(PACK_STEM))
+    sw = sw.split('\n' + SW_OFFLINE_MARKER)[0]
+    sw += SW_OFFLINE_JS % {'precache': json.dumps(precache, indent=0), 'hosts': json.dumps(RUNTIME_CACHE_HOSTS)}
+    with open(sw_path, 'w', encoding='utf-8') as f:
+        f.write(sw)
+    return version, len(resources)
+
+
+def _targz_size(paths):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tar:
+        for path in paths:
+            tar.add(path)
+    return buf.tell()
+
+
+def _legacy_bundle_files():
+    """Roughly what `flet publish main.py` packed before: the whole project folder."""
+    files = []
+    for root, dirs, names in os.walk('.'):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        files += [os.path.join(root, n) for n in names if not n.startswith('.') and not n.endswith('.pyc')]
+    return files
+
+
+def report(modules, blob):
+    before = _targz_size(_legacy_bundle_files())
+    app_files = [os.path.join(APP_DIR, n) for n in sorted(os.listdir(APP_DIR))]
+    after_app = _targz_size(app_files)
+    print(f"\nBundle size (Python side of the download):")
+    print(f"  before: app.tar.gz ~{before / 1024:.0f} KB (whole project, embedded_data.py)")
+    print(f"  after:  app.tar.gz ~{after_app / 1024:.0f} KB ({len(modules)} modules) "
+          f"+ {PACK_NAME} {len(blob) / 1024:.0f} KB (downloaded in parallel)")
+
+    # Boot-time data load: parsing embedded_data.py source vs decoding the pack.
+    # Native CPython timings; Pyodide is slower, but the ratio carries over.
+    if os.path.exists(f"{EMBEDDED_MODULE}.py"):
+        with open(f"{EMBEDDED_MODULE}.py", 'r', encoding='utf-8') as f:
+            source = f.read()
+        start = time.perf_counter()
+        exec(compile(source, f"{EMBEDDED_MODULE}.py", 'exec'), {})
+        before_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        decode_pack(blob)
+        after_ms = (time.perf_counter() - start) * 1000
+        print(f"\nData load before the first frame (CPython {sys.version_info[0]}.{sys.version_info[1]}):")
+        print(f"  before: compile + run {EMBEDDED_MODULE}.py  {before_ms:7.0f} ms")
+        print(f"  after:  decode {PACK_NAME}       {after_ms:7.0f} ms")
+
+
+def main():
+    print("Building web bundle...")
+    os.makedirs(BUILD_DIR, exist_ok=True)
+
+    modules = find_runtime_modules(ENTRY)
+    print(f"Runtime modules: {', '.join(modules)}")
+    if stage_app(modules):
+        print(f"Shipping bytecode (Python {PYODIDE_PYTHON[0]}.{PYODIDE_PYTHON[1]}).")
+    else:
+        print(f"Note: Python {sys.version_info[0]}.{sys.version_info[1]} != Pyodide's "
+              f"{PYODIDE_PYTHON[0]}.{PYODIDE_PYTHON[1]}, shipping sources (checked with py_compile).")
+    print(f"Runtime requirements: {', '.join(runtime_requirements()) or '(none)'}")
+
+    blob = write_data_pack()
+    if blob is None:
+        return
+    print(f"Wrote {PACK_PATH} ({len(blob) / 1024:.0f} KB)")
+
+    report(modules, blob)
+    print(f"\nNext: flet publish {os.path.join(APP_DIR, ENTRY)} (deploy.py does this)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import ast
+import gzip
+import io
+import os
+import shutil
+import sys
+import time
+import urllib.request
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    subset = None
+
+from build_bundle import ENTRY, find_runtime_modules, slim_for_web
+from generate_embedded import collect_data
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+FONT_URL = "https://fonts.gstatic.com/s/notosanstc/v35/-nF7OG829NcXan72yhO8IG99dBasx6w.ttf"
+FONT_CACHE = '.font_cache'            # Full download (not deployed)
+SOURCE_FILE = 'NotoSansTC-full.ttf'
+ASSETS_DIR = 'assets'                 # Flet assets_dir (bundled with the app)
+FONT_SUBDIR = 'fonts'
+FONT_FILE = 'NotoSansTC.ttf'          # main.py registers /fonts/NotoSansTC.ttf
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+# Always kept: what players can type into the search box besides titles
+EXTRA_TEXT = ''.join(chr(c) for c in range(0x20, 0x7F)) + '，。、！？：；「」『』（）《》…—～・'
+# Opt-in: also keep Big5 level-1 (常用字, 5401 characters) so text typed
+# outside the catalog renders offline too. Off by default: it multiplies the
+# subset, and online the missing glyphs come from Flutter's fallback fonts.
+KEEP_COMMON_CHARS = False
+BIG5_COMMON_RANGE = (0xA440, 0xC67E)
+BANDWIDTHS_MBPS = [('4G', 10.0), ('3G', 1.6)]
+
+
+def source_path():
+    return os.path.join(FONT_CACHE, SOURCE_FILE)
+
+
+def font_path():
+    return os.path.join(ASSETS_DIR, FONT_SUBDIR, FONT_FILE)
+
+
+def download_font(path):
+    """Fetch the TTF once; later builds reuse the local copy."""
+    if os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    req = urllib.request.Request(FONT_URL, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        body = response.read()
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(body)
+    os.replace(tmp, path)
+    return True
+
+
+def common_chars():
+    """Big5 level-1 characters, decoded through the big5 codec."""
+    first, last = BIG5_COMMON_RANGE
+    chars = []
+    for lead in range(first >> 8, (last >> 8) + 1):
+        for trail in [*range(0x40, 0x7F), *range(0xA1, 0xFF)]:
+            code = lead << 8 | trail
+            if first <= code <= last:
+                chars.append(bytes([lead, trail]).decode('big5'))
+    return ''.join(chars)
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            yield from _strings(k)
+            yield from _strings(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _strings(v)
+
+
+def collect_text(data):
+    """
+    Every character the game can draw: string literals in the runtime
+    modules (UI labels, genre/theme names) and all text in the web data
+    pack (CN titles, synopses, aliases), plus EXTRA_TEXT and, with
+    KEEP_COMMON_CHARS, common_chars().
+    """
+    chars = set(EXTRA_TEXT)
+    if KEEP_COMMON_CHARS:
+        chars.update(common_chars())
+    for name in find_runtime_modules(ENTRY):
+        with open(f"{name}.py", 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                chars.update(node.value)
+    for text in _strings(slim_for_web(data)):
+        chars.update(text)
+    return ''.join(sorted(c for c in chars if c.isprintable()))
+
+
+def subset_font(src, dst, text):
+    """Keep only the glyphs for text. TTF on purpose: CanvasKit (Flutter web) cannot decode WOFF2."""
+    options = subset.Options()
+    options.hinting = False            # CJK outlines render fine unhinted; hinting is a large share of the file
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+    font = TTFont(src)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    font.save(dst)
+    return font
+
+
+def _woff2_size(font):
+    """Size the subset would have as WOFF2 (needs brotli), for comparison only."""
+    try:
+        font.flavor = 'woff2'
+        buf = io.BytesIO()
+        font.save(buf)
+        return len(buf.getvalue())
+    except ImportError:
+        return None
+    finally:
+        font.flavor = None
+
+
+def _load_ms(path):
+    start = time.perf_counter()
+    font = TTFont(path)
+    for tag in font.keys():
+        font[tag]  # Tables decompile on first access
+    return (time.perf_counter() - start) * 1000
+
+
+def report(src, dst, font, glyph_count):
+    full, small = os.path.getsize(src), os.path.getsize(dst)
+    with open(src, 'rb') as f:
+        full_gz = len(gzip.compress(f.read()))
+    with open(dst, 'rb') as f:
+        small_gz = len(gzip.compress(f.read()))
+    woff2 = _woff2_size(font)
+
+    print(f"\nFont download ({glyph_count} characters kept):")
+    print(f"  before: {SOURCE_FILE:<24} {full / 1024:8.0f} KB ({full_gz / 1024:.0f} KB gzipped)")
+    print(f"  after:  {FONT_FILE:<24} {small / 1024:8.0f} KB ({small_gz / 1024:.0f} KB gzipped)")
+    if woff2:
+        print(f"  (as WOFF2: {woff2 / 1024:.0f} KB, not shipped: Flutter's CanvasKit only reads TTF/OTF)")
+
+    # Text cannot paint before the font arrives and is parsed
+    full_ms, small_ms = _load_ms(src), _load_ms(dst)
+    print(f"\nTime until text can paint (gzipped download + parse, parse measured on this machine):")
+    for label, mbps in BANDWIDTHS_MBPS:
+        before = full_gz * 8 / (mbps * 1e6) * 1000 + full_ms
+        after = small_gz * 8 / (mbps * 1e6) * 1000 + small_ms
+        print(f"  {label} ({mbps:g} Mbps): {before:7.0f} ms -> {after:5.0f} ms")
+
+
+def main():
+    src = source_path()
+    try:
+        if download_font(src):
+            print(f"Downloaded {FONT_URL}")
+    except OSError as e:
+        print(f"Error: could not download the font: {e}")
+        sys.exit(1)
+
+    dst = font_path()
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if subset is None:
+        shutil.copy2(src, dst)
+        print(f"Note: fontTools not installed (pip install fonttools), shipping the full font: "
+              f"{dst} ({os.path.getsize(dst) / 1024:.0f} KB)")
+        return
+
+    data = collect_data()
+    if data is None:
+        return
+    text = collect_text(data)
+    font = subset_font(src, dst, text)
+    print(f"Wrote {dst}")
+    report(src, dst, font, len(text))
+
+
+if __name__ == "__main__":
+    main()
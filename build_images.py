@@ -0,0 +1,180 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from catalog_schema import load_raw_anime
+
+try:
+    from PIL import Image, ImageFilter
+except ImportError:
+    Image = None
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+RAW_DATA_PATH = 'data/rawAnime.json'
+IMAGE_MAP_PATH = 'data/image_map.json'
+CACHE_DIR = '.image_cache'            # Content-addressed download cache (not deployed)
+ASSETS_DIR = 'assets'                 # Flet assets_dir (bundled with the app)
+COVERS_SUBDIR = 'covers'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+MAX_WORKERS = 8
+
+# Guess-row cell is 100x110 with 5px padding -> 90x100 image; 2x for HiDPI screens
+THUMB_SIZE = (180, 200)
+# LV2 hint shows a 150x210 cover; blur is baked in so the client does no blur work
+BLUR_SIZE = (150, 210)
+BLUR_RADIUS = 6
+WEBP_QUALITY = 70
+
+
+def load_json(path):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+
+
+class ImageCache:
+    """
+    Downloads stored once under their content hash (blobs/<sha256>), with a
+    url -> hash index so re-runs skip the network entirely.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.blob_dir = os.path.join(root, 'blobs')
+        self.index_path = os.path.join(root, 'index.json')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.index = load_json(self.index_path)
+
+    def blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest)
+
+    def get(self, url):
+        digest = self.index.get(url)
+        if digest and os.path.exists(self.blob_path(digest)):
+            return digest
+        return None
+
+    def fetch(self, url):
+        """Return the content hash for url, downloading only on a cache miss."""
+        digest = self.get(url)
+        if digest:
+            return digest, False
+
+        req = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(req, timeout=30) as response:
+            body = response.read()
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+        self.index[url] = digest
+        return digest, True
+
+    def save(self):
+        save_json(self.index_path, self.index)
+
+
+def _fit(img, size):
+    """Center-crop to the target aspect ratio, then resize (same as fit='cover')."""
+    tw, th = size
+    w, h = img.size
+    scale = max(tw / w, th / h)
+    cw, ch = round(tw / scale), round(th / scale)
+    left, top = (w - cw) // 2, (h - ch) // 2
+    return img.crop((left, top, left + cw, top + ch)).resize(size, Image.LANCZOS)
+
+
+def render_variants(blob_path, out_dir, digest):
+    """Write <digest>.webp (thumbnail) and <digest>_blur.webp; skip if present."""
+    name = digest[:16]
+    thumb_path = os.path.join(out_dir, f"{name}.webp")
+    blur_path = os.path.join(out_dir, f"{name}_blur.webp")
+    if os.path.exists(thumb_path) and os.path.exists(blur_path):
+        return name
+
+    with Image.open(blob_path) as src:
+        img = src.convert('RGB')
+    _fit(img, THUMB_SIZE).save(thumb_path, 'WEBP', quality=WEBP_QUALITY, method=6)
+    blurred = _fit(img, BLUR_SIZE).filter(ImageFilter.GaussianBlur(BLUR_RADIUS))
+    blurred.save(blur_path, 'WEBP', quality=WEBP_QUALITY, method=6)
+    return name
+
+
+def main():
+    if Image is None:
+        print("Error: Pillow is required for the image pipeline (pip install Pillow).")
+        return
+
+    raw_data = load_raw_anime(RAW_DATA_PATH)
+    jobs = {str(a['id']): a['image_url'] for a in raw_data if a.get('image_url')}
+    print(f"Processing {len(jobs)} covers...")
+
+    cache = ImageCache(CACHE_DIR)
+    out_dir = os.path.join(ASSETS_DIR, COVERS_SUBDIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    image_map = {}
+    downloaded = failed = 0
+    original_bytes = output_bytes = 0
+    start = time.perf_counter()
+
+    def process(mal_id, url):
+        digest, fresh = cache.fetch(url)
+        name = render_variants(cache.blob_path(digest), out_dir, digest)
+        return mal_id, digest, name, fresh
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = [pool.submit(process, mal_id, url) for mal_id, url in jobs.items()]
+            for i, future in enumerate(as_completed(futures), 1):
+                try:
+                    mal_id, digest, name, fresh = future.result()
+                except (urllib.error.URLError, OSError) as e:
+                    failed += 1
+                    print(f"  Failed: {e}")
+                    continue
+                downloaded += fresh
+                # Paths relative to the assets dir, as Flet expects for bundled files
+                image_map[mal_id] = {
+                    "thumb": f"/{COVERS_SUBDIR}/{name}.webp",
+                    "blur": f"/{COVERS_SUBDIR}/{name}_blur.webp",
+                }
+                original_bytes += os.path.getsize(cache.blob_path(digest))
+                output_bytes += os.path.getsize(os.path.join(out_dir, f"{name}.webp"))
+                if i % 100 == 0:
+                    print(f"  [{i}/{len(jobs)}]")
+    except KeyboardInterrupt:
+        print("\nProcess interrupted by user.")
+    finally:
+        cache.save()
+
+    save_json(IMAGE_MAP_PATH, image_map)
+    elapsed = time.perf_counter() - start
+    print(f"\nDone in {elapsed:.1f}s: {len(image_map)} covers, {downloaded} downloaded, {failed} failed.")
+    if image_map:
+        print(f"Original JPGs: {original_bytes / 1024:.0f} KB -> thumbnails: {output_bytes / 1024:.0f} KB "
+              f"({output_bytes / original_bytes:.0%})")
+    print(f"Saved to {IMAGE_MAP_PATH}")
+
+
+if __name__ == "__main__":
+    main()
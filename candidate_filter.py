@@ -0,0 +1,122 @@
+from typing import Dict, List
+
+from anime_data import Anime
+from game_engine import GuessFeedback, STATUS_CORRECT, ARROW_UP
+
+
+class _NumericIndex:
+    """Bitmasks for ==, < and > on one integer column (year / episodes)."""
+
+    def __init__(self, values: List[int]):
+        self.eq: Dict[int, int] = {}
+        for i, v in enumerate(values):
+            self.eq[v] = self.eq.get(v, 0) | (1 << i)
+
+        # Prefix / suffix ORs over the distinct values, so each lookup is one dict hit
+        self.lt: Dict[int, int] = {}
+        self.gt: Dict[int, int] = {}
+        acc = 0
+        for v in sorted(self.eq):
+            self.lt[v] = acc
+            acc |= self.eq[v]
+        acc = 0
+        for v in sorted(self.eq, reverse=True):
+            self.gt[v] = acc
+            acc |= self.eq[v]
+
+    def mask(self, guess_value: int, status: str, arrow: str) -> int:
+        if status == STATUS_CORRECT:
+            return self.eq.get(guess_value, 0)
+        # ↑ means the target is larger than the guess
+        if arrow == ARROW_UP:
+            return self.gt[guess_value]
+        return self.lt[guess_value]
+
+
+def _group_masks(values) -> Dict:
+    masks = {}
+    for i, v in enumerate(values):
+        masks[v] = masks.get(v, 0) | (1 << i)
+    return masks
+
+
+class CandidateIndex:
+    """
+    Per-catalog lookup tables: one bitmask (Python int, bit i = anime_list[i])
+    per column value. Built once; narrowing a candidate set after a guess is
+    then a handful of big-int ANDs over the whole catalog.
+    """
+
+    def __init__(self, anime_list: List[Anime]):
+        self.anime_list = anime_list
+        self.all_mask = (1 << len(anime_list)) - 1
+
+        self.id_masks = _group_masks(a.id for a in anime_list)
+        self.franchise_masks = _group_masks(a.franchise_id for a in anime_list)
+        self.studio_masks = _group_masks(a.studio for a in anime_list)
+        self.demo_masks = _group_masks(a.demographic for a in anime_list)
+        self.source_masks = _group_masks(a.source for a in anime_list)
+
+        self.genre_masks: Dict[str, int] = {}
+        for i, a in enumerate(anime_list):
+            for g in a.genres:
+                self.genre_masks[g] = self.genre_masks.get(g, 0) | (1 << i)
+
+        self.years = _NumericIndex([a.year for a in anime_list])
+        self.episodes = _NumericIndex([a.episodes for a in anime_list])
+
+    def feedback_mask(self, guess: Anime, feedback: GuessFeedback, franchise_mode: bool = False) -> int:
+        """All catalog entries that would have produced exactly this row."""
+        def pick(masks, value, status):
+            m = masks.get(value, 0)
+            return m if status == STATUS_CORRECT else ~m
+
+        mask = self.all_mask
+        if franchise_mode:
+            mask &= pick(self.franchise_masks, guess.franchise_id, feedback.title)
+        else:
+            mask &= pick(self.id_masks, guess.id, feedback.title)
+        mask &= pick(self.studio_masks, guess.studio, feedback.studio)
+        mask &= pick(self.demo_masks, guess.demographic, feedback.demographic)
+        mask &= pick(self.source_masks, guess.source, feedback.source)
+        for tag, is_match in feedback.genres:
+            m = self.genre_masks.get(tag, 0)
+            mask &= m if is_match else ~m
+        mask &= self.years.mask(guess.year, feedback.year, feedback.year_arrow)
+        mask &= self.episodes.mask(guess.episodes, feedback.episodes, feedback.episodes_arrow)
+        return mask
+
+    def new_set(self, franchise_mode: bool = False) -> "CandidateSet":
+        return CandidateSet(self, franchise_mode)
+
+
+class CandidateSet:
+    """The titles still consistent with every row shown in one game."""
+
+    def __init__(self, index: CandidateIndex, franchise_mode: bool = False):
+        self.index = index
+        self.franchise_mode = franchise_mode  # Must match the GameSession's
+        self.mask = index.all_mask
+
+    def reset(self):
+        self.mask = self.index.all_mask
+
+    def apply(self, guess: Anime, feedback: GuessFeedback):
+        self.mask &= self.index.feedback_mask(guess, feedback, self.franchise_mode)
+
+    @property
+    def count(self) -> int:
+        return bin(self.mask).count("1")
+
+    def contains(self, anime: Anime) -> bool:
+        return bool(self.mask & self.index.id_masks.get(anime.id, 0))
+
+    def members(self) -> List[Anime]:
+        result = []
+        m = self.mask
+        anime_list = self.index.anime_list
+        while m:
+            low = m & -m
+            result.append(anime_list[low.bit_length() - 1])
+            m ^= low
+        return result
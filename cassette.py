@@ -0,0 +1,264 @@
+import argparse
+import base64
+import datetime
+import gzip
+import io
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import urllib.response
+from collections import defaultdict, deque
+from email.message import Message
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+CASSETTE_DIR = 'fixtures/cassettes'
+TRANSLATE_PATH = '/__translate__'     # Stub server route for translator calls
+KEPT_HEADERS = ('Content-Type',)
+
+
+class VirtualClock:
+    """Monotonic time that only moves when something sleeps (replay rate limiting)."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += max(0.0, seconds)
+
+
+class CassetteMiss(urllib.error.URLError):
+    """A replayed request that was never recorded (URLError, so scripts handle it like a network error)."""
+
+
+def http_key(method, url):
+    """Request identity: method + URL with the query parameters sorted."""
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))}"
+
+
+def translate_key(source, target, text):
+    return f"TRANSLATE {source}>{target} {text}"
+
+
+def cassette_path(name, directory=CASSETTE_DIR):
+    return os.path.join(directory, f"{name}.json.gz")
+
+
+class Cassette:
+    """
+    Recorded interactions in order: {"key", "status", "headers", "body"}.
+    Replay hands out the responses for a key in the order they were
+    recorded (then keeps repeating the last one), so a script that asks
+    the same thing twice gets what it got while recording.
+    """
+
+    def __init__(self, interactions=None, today=None):
+        self.interactions = interactions or []
+        self.today = today or datetime.date.today().isoformat()
+        self.misses = []
+        self._lock = threading.Lock()
+        self._queues = defaultdict(deque)
+        self._last = {}
+        for item in self.interactions:
+            self._queues[item['key']].append(item)
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['interactions'], data.get('today'))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump({'today': self.today, 'interactions': self.interactions}, f, ensure_ascii=False)
+
+    def add(self, key, status, headers, body: bytes):
+        try:
+            stored, encoding = body.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            stored, encoding = base64.b64encode(body).decode('ascii'), 'base64'
+        item = {'key': key, 'status': status, 'encoding': encoding, 'body': stored,
+                'headers': {k: v for k, v in headers.items() if k in KEPT_HEADERS}}
+        with self._lock:
+            self.interactions.append(item)
+
+    def next(self, key):
+        """The next recorded response for key, or None (also noted in misses)."""
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            item = self._last.get(key)
+            if item is None:
+                self.misses.append(key)
+            return item
+
+
+def body_bytes(item) -> bytes:
+    if item['encoding'] == 'base64':
+        return base64.b64decode(item['body'])
+    return item['body'].encode('utf-8')
+
+
+def _response(url, item):
+    headers = Message()
+    for k, v in item['headers'].items():
+        headers[k] = v
+    body = io.BytesIO(body_bytes(item))
+    if item['status'] >= 400:
+        raise urllib.error.HTTPError(url, item['status'], 'Recorded error', headers, body)
+    return urllib.response.addinfourl(body, headers, url, item['status'])
+
+
+def _request_parts(request):
+    if isinstance(request, urllib.request.Request):
+        return request.get_method(), request.full_url
+    return 'GET', request
+
+
+def install(cassette: Cassette, mode: str, server: str = None):
+    """
+    Patch urllib.request.urlopen and GoogleTranslator.translate (if
+    deep_translator is installed) to record into or replay from cassette.
+    Replay also freezes date.today() to the recording day, turns
+    time.sleep into a no-op (the scripts only sleep to rate-limit) and
+    puts jikan.RateLimiter on a virtual clock.
+    With server, replay goes over HTTP through stub_server.py instead.
+    """
+    real_urlopen = urllib.request.urlopen
+
+    def recording_urlopen(request, *args, **kwargs):
+        method, url = _request_parts(request)
+        try:
+            response = real_urlopen(request, *args, **kwargs)
+        except urllib.error.HTTPError as e:
+            body = e.read()
+            cassette.add(http_key(method, url), e.code, dict(e.headers or {}), body)
+            raise urllib.error.HTTPError(url, e.code, e.msg, e.headers, io.BytesIO(body))
+        body = response.read()
+        cassette.add(http_key(method, url), response.status, dict(response.headers), body)
+        return _response(url, {'status': response.status, 'encoding': 'base64',
+                               'body': base64.b64encode(body).decode('ascii'),
+                               'headers': dict(response.headers)})
+
+    def replaying_urlopen(request, *args, **kwargs):
+        method, url = _request_parts(request)
+        if server:
+            parts = urllib.parse.urlsplit(url)
+            local = f"{server}/{parts.scheme}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+            return real_urlopen(urllib.request.Request(local, method=method), *args, **kwargs)
+        item = cassette.next(http_key(method, url))
+        if item is None:
+            raise CassetteMiss(f"not in cassette: {method} {url}")
+        return _response(url, item)
+
+    urllib.request.urlopen = recording_urlopen if mode == 'record' else replaying_urlopen
+
+    try:
+        from deep_translator import GoogleTranslator
+    except ImportError:
+        GoogleTranslator = None
+    if GoogleTranslator is not None:
+        real_translate = GoogleTranslator.translate
+
+        def recording_translate(self, text, **kwargs):
+            result = real_translate(self, text, **kwargs)
+            cassette.add(translate_key(self.source, self.target, text), 200, {}, (result or '').encode('utf-8'))
+            return result
+
+        def replaying_translate(self, text, **kwargs):
+            key = translate_key(self.source, self.target, text)
+            if server:
+                query = urllib.parse.urlencode({'key': key})
+                with real_urlopen(f"{server}{TRANSLATE_PATH}?{query}") as response:
+                    return response.read().decode('utf-8')
+            item = cassette.next(key)
+            if item is None:
+                raise CassetteMiss(f"not in cassette: {key[:80]}")
+            return body_bytes(item).decode('utf-8')
+
+        GoogleTranslator.translate = recording_translate if mode == 'record' else replaying_translate
+
+    if mode == 'replay':
+        frozen = datetime.date.fromisoformat(cassette.today)
+
+        class FrozenDate(datetime.date):
+            @classmethod
+            def today(cls):
+                return cls(frozen.year, frozen.month, frozen.day)
+
+        datetime.date = FrozenDate  # Picked up by `from datetime import date` in the script
+        time.sleep = lambda seconds: None
+
+        # jikan.RateLimiter loops on its clock until the window frees up:
+        # with a no-op sleep on the real clock that would spin for real time
+        import jikan
+        clock = VirtualClock()
+        jikan.RateLimiter.clock = staticmethod(clock.time)
+        jikan.RateLimiter.sleep = staticmethod(clock.sleep)
+
+
+def run_script(script, script_args, cassette: Cassette, mode: str, server: str = None):
+    """Run script as __main__ with the cassette installed. Returns the script's exit code."""
+    install(cassette, mode, server)
+    sys.argv = [script] + list(script_args)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a pipeline script against recorded HTTP / translator traffic.")
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('name', help=f"cassette name ({CASSETTE_DIR}/<name>.json.gz)")
+    parser.add_argument('script')
+    parser.add_argument('script_args', nargs=argparse.REMAINDER)
+    parser.add_argument('--dir', default=CASSETTE_DIR, help="cassette directory")
+    parser.add_argument('--server', help="replay through stub_server.py at this URL (e.g. http://127.0.0.1:8765)")
+    args = parser.parse_args()
+
+    path = cassette_path(args.name, os.path.abspath(args.dir))
+    if args.mode == 'record':
+        cassette = Cassette()
+    elif os.path.exists(path):
+        cassette = Cassette.load(path)
+    else:
+        cassette = Cassette()  # Nothing recorded: every request is a miss
+    start = time.perf_counter()
+    try:
+        code = run_script(args.script, args.script_args, cassette, args.mode, args.server)
+    finally:
+        if args.mode == 'record':
+            cassette.save(path)
+            print(f"[cassette] Recorded {len(cassette.interactions)} interactions to {path}")
+    elapsed = time.perf_counter() - start
+
+    if cassette.misses:
+        print(f"[cassette] {len(cassette.misses)} request(s) not in {path}, e.g. {cassette.misses[0][:100]}")
+        code = code or 1
+    print(f"[cassette] {args.mode} {args.script}: {elapsed:.2f}s")
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
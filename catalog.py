@@ -0,0 +1,68 @@
+import os
+import random
+import threading
+from typing import Dict, List, Optional
+
+import anime_data
+from anime_data import Anime, load_anime_data
+from candidate_filter import CandidateIndex
+from catalog_pack import load_pack
+from game_engine import GameSession
+from search_index import SearchIndex
+
+# Config
+PACK_ENV = "ANIDLE_CATALOG_PACK"  # Set by serve.py for spawned workers: read the pack instead
+
+_lock = threading.Lock()
+_catalog: Optional["Catalog"] = None
+
+
+class Catalog:
+    """
+    Everything derived from the embedded data: the Anime list, id lookup,
+    candidate bitmask tables and the search index. Built once per process
+    and shared by every browser session, so it must be treated as read-only;
+    per-session state lives in GameSession / CandidateSet.
+    """
+
+    def __init__(self, anime_list: List[Anime]):
+        self.anime_list = anime_list
+        self.by_id: Dict[int, Anime] = {a.id: a for a in anime_list}
+        self.candidate_index = CandidateIndex(anime_list)
+        # Module attribute, not an import-time copy: a data pack may replace it
+        self.search_index = SearchIndex(anime_list, anime_data.ALIASES)
+
+
+class CatalogSession:
+    """
+    One player's game over a shared Catalog: what main() keeps per browser
+    session, minus the Flet controls. Used by the headless server workers
+    (serve.py) and the load simulation (load_test.py).
+    """
+
+    def __init__(self, catalog: Catalog, rng: random.Random):
+        self.catalog = catalog
+        self.rng = rng
+        self.session = GameSession(catalog.anime_list, target=rng.choice(catalog.anime_list), rng=rng)
+        self.candidates = catalog.candidate_index.new_set()
+
+    def on_search_change(self, text: str):
+        return self.catalog.search_index.search(
+            text, limit=10, accept=lambda a: not self.session.has_guessed(a),
+        )
+
+    def process_guess(self, anime: Anime):
+        feedback = self.session.guess(anime)
+        self.candidates.apply(anime, feedback)
+        return feedback
+
+
+def get_catalog() -> Catalog:
+    """The process-wide Catalog, built on first use (thread-safe)."""
+    global _catalog
+    if _catalog is None:
+        with _lock:
+            if _catalog is None:
+                pack = os.environ.get(PACK_ENV)
+                _catalog = Catalog(load_pack(pack) if pack else load_anime_data())
+    return _catalog
@@ -0,0 +1,57 @@
+import dataclasses
+import json
+import mmap
+import os
+import struct
+from typing import List
+
+from anime_data import Anime
+
+# Config
+PACK_MAGIC = b"ANIDLEPK"
+PACK_VERSION = 1
+# magic, version, record count, then one (offset, length) pair per record
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<II")
+
+
+def write_pack(path: str, anime_list: List[Anime]):
+    """
+    Serialize the processed catalog (translated titles, tags, image map
+    already applied) so spawned server workers (no fork, e.g. Windows)
+    skip load_anime_data(). Records are UTF-8 JSON, addressed by an
+    offset table.
+    """
+    blobs = [json.dumps(dataclasses.asdict(a), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+             for a in anime_list]
+    offset = _HEADER.size + _ENTRY.size * len(blobs)
+    table = bytearray()
+    for blob in blobs:
+        table += _ENTRY.pack(offset, len(blob))
+        offset += len(blob)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(blobs)))
+        f.write(table)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+
+
+def load_pack(path: str) -> List[Anime]:
+    """
+    Read a pack through mmap: the raw bytes live once in the OS page
+    cache, but every process still decodes its own Anime objects.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, count = _HEADER.unpack_from(mm, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"Not a catalog pack: {path}")
+        if version != PACK_VERSION:
+            raise ValueError(f"Unsupported pack version: {version}")
+        anime_list = []
+        for i in range(count):
+            offset, length = _ENTRY.unpack_from(mm, _HEADER.size + i * _ENTRY.size)
+            anime_list.append(Anime(**json.loads(mm[offset:offset + length])))
+    return anime_list
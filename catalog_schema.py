@@ -0,0 +1,148 @@
+import json
+import os
+from typing import Callable, Dict, List, Tuple
+
+# Config
+RAW_DATA_PATH = 'data/rawAnime.json'
+SCHEMA_VERSION = 1          # Written next to the data; bump when CATALOG_SCHEMA changes
+
+REQUIRED = object()         # Default marker: the field must be present and non-null
+OPTIONAL = object()         # Default marker: may be absent, and is left absent
+
+# rawAnime.json entry: field -> (type, default). A type is int / float / str,
+# [type] for a list of that type, or [{field: type}] for a list of records.
+# Null or missing fields get the default, so every validated entry has
+# every field with a default and the game can index them directly.
+CATALOG_SCHEMA = {
+    'id': (int, REQUIRED),
+    'name_en': (str, REQUIRED),
+    'name_jp': (str, ''),
+    'image_url': (str, REQUIRED),
+    'genres': ([str], []),
+    'themes': ([str], []),
+    'demographics': ([str], []),
+    'studios': ([str], []),
+    'year': (int, REQUIRED),            # 0 = not aired yet (jikan.to_entry)
+    'episodes': (int, 0),
+    'source': (str, 'Unknown'),
+    'score': (float, 0.0),
+    'synopsis': (str, ''),
+    'media_type': (str, ''),
+    'season': (str, ''),
+    'rating': (str, ''),
+    'status': (str, ''),
+    'members': (int, 0),
+    'relations': ([{'relation': str, 'id': int}], OPTIONAL),  # Build-time only (enrich_data.py)
+}
+
+
+def load_raw_anime(path: str = RAW_DATA_PATH) -> List[Dict]:
+    """
+    rawAnime.json as a list of entries, also accepting the Jikan-style
+    {"data": [...]} wrapper. Returns [] if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    if isinstance(raw, dict):
+        raw = raw.get('data', [])
+    if not isinstance(raw, list):
+        raise ValueError(f"{path}: expected a list of anime, got {type(raw).__name__}")
+    return raw
+
+
+def _type_check(expr: str, spec) -> str:
+    """Python expression that is true when expr does NOT match spec."""
+    if spec is float:
+        return f"type({expr}) is not float"
+    if isinstance(spec, type):
+        return f"type({expr}) is not {spec.__name__}"
+    (item,) = spec
+    if isinstance(item, dict):
+        fields = ' and '.join(f"type(e.get({k!r})) is {t.__name__}" for k, t in item.items())
+        return f"type({expr}) is not list or not all(type(e) is dict and {fields} for e in {expr})"
+    return f"type({expr}) is not list or not all(type(e) is {item.__name__} for e in {expr})"
+
+
+def _type_name(spec) -> str:
+    if isinstance(spec, type):
+        return spec.__name__
+    (item,) = spec
+    if isinstance(item, dict):
+        return 'list of {' + ', '.join(f"{k}: {t.__name__}" for k, t in item.items()) + '}'
+    return f"list of {item.__name__}"
+
+
+def compile_validator(schema: Dict = CATALOG_SCHEMA) -> Callable[[Dict, List[str]], Dict]:
+    """
+    Generate and compile one straight-line function for schema:
+    validate(item, errors) -> normalized copy of item, appending a message
+    to errors for each problem. No per-field loops or lookups at run time.
+    """
+    lines = [
+        "def validate(item, errors):",
+        "    if type(item) is not dict:",
+        "        errors.append(f'expected an object, got {type(item).__name__}')",
+        "        return None",
+        "    out = {}",
+        "    extra = item.keys() - KNOWN",
+        "    if extra:",
+        "        errors.append(f'unknown fields {sorted(extra)}')",
+    ]
+    for name, (spec, default) in schema.items():
+        lines.append(f"    v = item.get({name!r})")
+        lines.append("    if v is None:")
+        if default is REQUIRED:
+            lines.append(f"        errors.append('missing {name}')")
+        elif default is OPTIONAL:
+            lines.append("        pass")
+        else:
+            lines.append(f"        out[{name!r}] = {default!r}")
+        if spec is float:
+            lines.append("    elif type(v) is int:")
+            lines.append(f"        out[{name!r}] = float(v)")
+        lines.append(f"    elif {_type_check('v', spec)}:")
+        expected = _type_name(spec).replace('{', '{{').replace('}', '}}')  # Inside an f-string
+        lines.append(f"        errors.append(f'{name}: expected {expected}, got {{v!r:.40}}')")
+        lines.append("    else:")
+        lines.append(f"        out[{name!r}] = v")
+    lines.append("    return out")
+
+    namespace = {'KNOWN': frozenset(schema)}
+    exec(compile('\n'.join(lines), '<catalog_schema>', 'exec'), namespace)
+    return namespace['validate']
+
+
+_validate = None  # Compiled on first use: the game only imports SCHEMA_VERSION
+
+
+def validate_catalog(raw_anime: List) -> Tuple[List[Dict], List[str], List[str]]:
+    """
+    (valid entries normalized to CATALOG_SCHEMA, errors, warnings).
+    Invalid entries are left out. Exact duplicates (overlapping fetch
+    pages) are dropped with a warning; different entries sharing an id
+    are an error.
+    """
+    global _validate
+    if _validate is None:
+        _validate = compile_validator()
+    entries, errors, warnings = [], [], []
+    seen: Dict[int, Dict] = {}
+    for i, item in enumerate(raw_anime):
+        problems = []
+        entry = _validate(item, problems)
+        where = f"entry {i}" + (f" (id {item['id']})" if type(item) is dict and 'id' in item else '')
+        if problems:
+            errors += [f"{where}: {p}" for p in problems]
+            continue
+        first = seen.get(entry['id'])
+        if first is not None:
+            if first == entry:
+                warnings.append(f"{where}: duplicate entry dropped")
+            else:
+                errors.append(f"{where}: id also used by a different entry")
+            continue
+        seen[entry['id']] = entry
+        entries.append(entry)
+    return entries, errors, warnings
@@ -2,15 +2,23 @@ import json
 import os
 import sys
 
+from catalog_schema import load_raw_anime, validate_catalog
+from franchise import build_franchises, franchise_groups
+
 # Fix stdout encoding
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
 
+def print_duplicates(title, duplicates, by_id):
+    print(f"\n--- {title} ---")
+    for name, ids in list(duplicates.items())[:10]: # Show top 10
+        print(f"CN: {name}")
+        for mid in ids:
+            print(f"  - EN: {by_id[mid]['name_en']}")
+
 def main():
     try:
-        with open('data/rawAnime.json', 'r', encoding='utf-8') as f:
-            raw_anime = json.load(f)
-        
+        raw_anime = load_raw_anime()
         with open('data/cn_titles.json', 'r', encoding='utf-8') as f:
             cn_titles = json.load(f)
             
@@ -21,33 +29,39 @@ def main():
     print(f"Total Anime: {len(raw_anime)}")
     print(f"Total Translations: {len(cn_titles)}")
 
-    mismatches = []
-    duplicates = {}
+    # Same schema check generate_embedded.py runs before building the game data
+    _, errors, warnings = validate_catalog(raw_anime)
+    print(f"\n--- Schema (catalog_schema.py): {len(errors)} error(s), {len(warnings)} warning(s) ---")
+    for message in (errors + warnings)[:10]:
+        print(f"  {message}")
 
-    # Check for duplicates in CN titles
+    # Duplicate CN titles, split by the franchise graph (franchise.py):
+    # within one franchise the seasons need telling apart, across
+    # franchises the translation is probably wrong.
+    franchises = build_franchises(raw_anime)
+    by_id = {str(x['id']): x for x in raw_anime}
     cn_counts = {}
     for k, v in cn_titles.items():
-        if v not in cn_counts:
-            cn_counts[v] = []
-        cn_counts[v].append(k)
-        
+        cn_counts.setdefault(v, []).append(k)
+
+    same_franchise = {}
+    unrelated = {}
     for name, ids in cn_counts.items():
-        if len(ids) > 1:
-            # Check if they are actually different seasons
-            names_en = []
-            for mid in ids:
-                # Find matching anime
-                a = next((x for x in raw_anime if str(x['id']) == mid), None)
-                if a:
-                    names_en.append(a['name_en'])
-            
-            duplicates[name] = names_en
+        ids = [mid for mid in ids if mid in by_id]
+        if len(ids) < 2:
+            continue
+        roots = {franchises.get(mid, int(mid)) for mid in ids}
+        (same_franchise if len(roots) == 1 else unrelated)[name] = ids
 
-    print("\n--- Potential Duplicates (Same CN Name, Diff EN Name) ---")
-    for name, en_names in list(duplicates.items())[:10]: # Show top 10
-        print(f"CN: {name}")
-        for en in en_names:
-            print(f"  - EN: {en}")
+    groups = franchise_groups(franchises)
+    print(f"Franchises: {len(groups)} with 2+ titles ({len(franchises)} titles linked)")
+    if any('relations' in x for x in raw_anime):
+        print_duplicates("Same CN Name Within One Franchise (Needs Season Marker)", same_franchise, by_id)
+        print_duplicates("Same CN Name Across Unrelated Anime (Likely Mistranslation)", unrelated, by_id)
+    else:
+        # No graph yet: every shared name is only a potential duplicate
+        print_duplicates("Potential Duplicates (Same CN Name; run enrich_data.py to group by franchise)",
+                         {**same_franchise, **unrelated}, by_id)
 
     # Check for Season Mismatches (Heuristic)
     print("\n--- Potential Mismatches (Season Number) ---")
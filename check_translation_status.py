@@ -3,6 +3,8 @@ import os
 import re
 import sys
 
+from catalog_schema import load_raw_anime
+
 # Fix stdout for Windows
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -22,9 +24,7 @@ def contains_kana(text):
 
 def main():
     try:
-        with open('data/rawAnime.json', 'r', encoding='utf-8') as f:
-            raw = json.load(f)
-        
+        raw = load_raw_anime()
         with open('data/cn_synopsis.json', 'r', encoding='utf-8') as f:
             synopsis_map = json.load(f)
     except FileNotFoundError:
@@ -0,0 +1,51 @@
+import gzip
+import json
+import os
+from typing import Dict, Optional
+
+# Config
+PACK_NAME = 'anidle_data.json.gz'   # Served next to index.html in the web build
+JS_PREFETCH = 'anidleDataPack'      # Promise<Response> started by the patched python-worker.js
+JS_PACK_URL = 'anidleDataPackUrl'   # Content-hashed pack name, set next to JS_PREFETCH
+
+
+def encode_pack(data: Dict) -> bytes:
+    """Gzipped compact JSON; mtime=0 so the same data always gives the same bytes."""
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def decode_pack(blob: bytes) -> Dict:
+    return json.loads(gzip.decompress(blob))
+
+
+def load_pack_file(path: str = PACK_NAME) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return decode_pack(f.read())
+
+
+async def fetch_pack(url: str = PACK_NAME) -> Optional[Dict]:
+    """
+    In the browser (Pyodide): reuse the download the worker started while
+    Pyodide was booting, or fetch it now. Returns None outside Pyodide.
+    """
+    try:
+        import js
+        from pyodide.http import pyfetch
+    except ImportError:
+        return None
+
+    prefetch = getattr(js, JS_PREFETCH, None)
+    if prefetch is not None:
+        response = await prefetch
+        if response.ok:
+            buffer = await response.arrayBuffer()
+            return decode_pack(buffer.to_bytes())
+
+    response = await pyfetch(getattr(js, JS_PACK_URL, None) or url)
+    if not response.ok:
+        print(f"Warning: data pack request failed ({response.status})")
+        return None
+    return decode_pack(await response.bytes())
@@ -3,6 +3,8 @@ import random
 import os
 import sys
 
+from catalog_schema import load_raw_anime
+
 # Fix stdout encoding for Windows
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -15,8 +17,7 @@ def load_json(path):
 
 def main():
     cn_synopsis = load_json('data/cn_synopsis.json')
-    raw_data = load_json('data/rawAnime.json')
-    if isinstance(raw_data, dict): raw_data = raw_data.get('data', [])
+    raw_data = load_raw_anime()
     
     raw_map = {str(a['id']): a for a in raw_data}
     
@@ -1,9 +1,12 @@
+import filecmp
 import os
 import shutil
 import subprocess
 import sys
 import time
 
+from build_bundle import APP_DIR, ENTRY, patch_web_build, hash_asset_names, write_sw_manifest
+
 # Config
 BASE_URL = "/Anidle/"
 COMMIT_MSG = "Auto deploy: Update Web App"
@@ -26,19 +29,42 @@ def run_command(command, cwd=None, ignore_errors=False):
             sys.exit(1)
         return False
 
+def sync_tree(src, dst):
+    """
+    Make dst identical to src, touching only files whose content differs,
+    so git sees (and GitHub Pages re-serves) just the changed files.
+    Returns (copied, unchanged, deleted) counts.
+    """
+    copied = unchanged = deleted = 0
+    wanted = set()
+    for root, _, names in os.walk(src):
+        rel_root = os.path.relpath(root, src)
+        os.makedirs(os.path.join(dst, rel_root), exist_ok=True)
+        for name in names:
+            rel = os.path.normpath(os.path.join(rel_root, name))
+            wanted.add(rel)
+            target = os.path.join(dst, rel)
+            if os.path.exists(target) and filecmp.cmp(os.path.join(src, rel), target, shallow=False):
+                unchanged += 1
+            else:
+                shutil.copy2(os.path.join(src, rel), target)
+                copied += 1
+
+    for root, dirs, names in os.walk(dst, topdown=False):
+        for name in names:
+            rel = os.path.normpath(os.path.relpath(os.path.join(root, name), dst))
+            if rel not in wanted:
+                os.remove(os.path.join(root, name))
+                deleted += 1
+        if root != dst and not os.listdir(root):
+            os.rmdir(root)
+    return copied, unchanged, deleted
+
 def main():
     print("=== Starting Auto Deployment ===")
     
-    # 1. Clean
+    # 1. Clean (docs/ is kept: step 3 only rewrites what changed)
     print("\n[1/4] Cleaning old build folders...")
-    if os.path.exists("docs"):
-        try:
-            shutil.rmtree("docs")
-            print("  Deleted 'docs' folder.")
-        except Exception as e:
-            print(f"  Error deleting docs: {e}")
-            sys.exit(1)
-            
     if os.path.exists("dist"):
         try:
             shutil.rmtree("dist")
@@ -49,24 +75,40 @@ def main():
 
     # 2. Build
     print("\n[2/4] Building Flet app...")
-    # Using python -m flet to ensure we use the same python env
-    success = run_command(f"flet publish main.py --base-url {BASE_URL}")
+    # Runtime modules only + data pack (build/), instead of packing the whole repo
+    if not run_command(f'"{sys.executable}" build_bundle.py'):
+        print("Bundle build failed.")
+        sys.exit(1)
+    # Font served from assets/ instead of Google Fonts (cached for offline play)
+    if not run_command(f'"{sys.executable}" build_font.py'):
+        print("Font build failed.")
+        sys.exit(1)
+    assets_dir = os.path.abspath("assets")
+    success = run_command(f"flet publish {os.path.join(APP_DIR, ENTRY)} --base-url {BASE_URL} --assets {assets_dir} --distpath dist")
     if not success:
         print("Build failed.")
         sys.exit(1)
+    patch_web_build("dist")
+    for name, hashed in hash_asset_names("dist").items():
+        print(f"  {name} -> {hashed}")
+    version, count = write_sw_manifest("dist")
+    print(f"  Service worker manifest: {count} files, version {version}")
 
-    # 3. Rename
+    # 3. Sync
     print("\n[3/4] Packaging...")
-    if os.path.exists("dist"):
-        try:
-            os.rename("dist", "docs")
-            print("  Renamed 'dist' to 'docs'.")
-        except Exception as e:
-            print(f"  Error renaming dist: {e}")
-            sys.exit(1)
-    else:
+    if not os.path.exists("dist"):
         print("Error: 'dist' folder not found after build.")
         sys.exit(1)
+    try:
+        copied, unchanged, deleted = sync_tree("dist", "docs")
+        shutil.rmtree("dist")
+        print(f"  Synced 'dist' into 'docs': {copied} changed, {unchanged} unchanged, {deleted} removed.")
+    except Exception as e:
+        print(f"  Error syncing dist: {e}")
+        sys.exit(1)
+    if copied == 0 and deleted == 0:
+        print("\nNothing changed since the last deploy.")
+        return
 
     # 4. Git Push
     print("\n[4/4] Pushing to GitHub...")
@@ -79,7 +121,7 @@ def main():
     if success:
         print("\n✅ Deployment Complete!")
         print(f"Visit: https://rc0824.github.io{BASE_URL}")
-        print("(Remember to Hard Reload Ctrl+F5 if you don't see changes immediately)")
+        print("(Returning players get the update on their next visit; unchanged files stay cached)")
     else:
         print("\n❌ Git Push Failed. Please check your git configuration.")
 
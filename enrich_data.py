@@ -0,0 +1,73 @@
+import json
+import sys
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from catalog_schema import load_raw_anime
+from jikan import DETAIL_FIELDS, LIST_FIELDS, RateLimiter, fetch_full, to_entry
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+RAW_DATA_PATH = 'data/rawAnime.json'
+MAX_WORKERS = 3           # Requests in flight; the shared RateLimiter sets the actual pace
+SAVE_EVERY = 25           # Progress is written after this many lookups
+ENRICHED_FIELDS = LIST_FIELDS + DETAIL_FIELDS
+
+
+def save_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def missing_fields(entry):
+    return [f for f in ENRICHED_FIELDS if f not in entry]
+
+
+def main():
+    raw_data = load_raw_anime(RAW_DATA_PATH)
+    if not raw_data:
+        print("Error: no anime data found.")
+        return
+
+    # The fetchers already store LIST_FIELDS; only entries still missing something need /full
+    todo = [entry for entry in raw_data if missing_fields(entry)]
+    print(f"{len(raw_data)} anime, {len(todo)} need a /full lookup "
+          f"({len(raw_data) - len(todo)} already complete).")
+    if not todo:
+        return
+
+    limiter = RateLimiter()
+    done = failed = 0
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {pool.submit(fetch_full, entry['id'], limiter): entry for entry in todo}
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    full = to_entry(future.result())
+                except (urllib.error.URLError, OSError, KeyError, ValueError) as e:
+                    failed += 1
+                    print(f"  Failed {entry['id']}: {e}")
+                    continue
+                for field in missing_fields(entry):
+                    entry[field] = full.get(field, [])
+                done += 1
+                if done % SAVE_EVERY == 0:
+                    save_json(RAW_DATA_PATH, raw_data)
+                    print(f"  [{done}/{len(todo)}] saved")
+    except KeyboardInterrupt:
+        print("\nProcess interrupted by user.")
+    finally:
+        save_json(RAW_DATA_PATH, raw_data)
+
+    elapsed = time.perf_counter() - start
+    print(f"\nEnriched {done} anime in {elapsed:.0f}s ({failed} failed). Saved to {RAW_DATA_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import json
 import time
 import urllib.parse
 import urllib.request
+from catalog_schema import load_raw_anime
 
 # Config
 RAW_DATA_PATH = 'data/rawAnime.json'
@@ -57,13 +58,7 @@ def search_bangumi_get_summary(keyword):
 
 def main():
     print("Loading data...")
-    raw_data = load_json(RAW_DATA_PATH)
-    if isinstance(raw_data, dict): 
-        raw_data = raw_data.get('data', [])
-    
-    if not isinstance(raw_data, list):
-        print("Error: rawAnime.json format incorrect.")
-        return
+    raw_data = load_raw_anime(RAW_DATA_PATH)
 
     cn_synopsis = load_json(CN_SYNOPSIS_PATH)
     
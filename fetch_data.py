@@ -3,6 +3,9 @@ import time
 import urllib.request
 import urllib.error
 
+from catalog_schema import load_raw_anime
+from jikan import carry_over, to_entry
+
 # Config
 TARGET_COUNT = 100 # How many anime to fetch
 OUTPUT_FILE = 'data/rawAnime.json'
@@ -27,19 +30,7 @@ def fetch_top_anime(limit=50):
                 for item in items:
                     # Filter logic similar to original criteria (optional)
                     # Mapping to our format
-                    entry = {
-                        "id": item['mal_id'],
-                        "name_en": item['title_english'] if item.get('title_english') else item['title'],
-                        "name_jp": item.get('title_japanese', ''),
-                        "genres": [g['name'] for g in item.get('genres', [])],
-                        "themes": [t['name'] for t in item.get('themes', [])],
-                        "demographics": [d['name'] for d in item.get('demographics', [])],
-                        "studios": [s['name'] for s in item.get('studios', [])],
-                        "year": item.get('year') or (int(item['aired']['prop']['from']['year']) if item.get('aired') and item['aired'].get('prop') and item['aired']['prop'].get('from') and item['aired']['prop']['from'].get('year') else 0),
-                        "episodes": item.get('episodes') or 0,
-                        "source": item.get('source', 'Unknown'),
-                        "score": item.get('score', 0)
-                    }
+                    entry = to_entry(item)  # Includes the extra list fields (jikan.LIST_FIELDS)
                     all_data.append(entry)
                     if len(all_data) >= limit:
                         break
@@ -69,6 +60,9 @@ def main():
         import os
         os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
         
+        # Relations come from per-id lookups (enrich_data.py): keep the ones already fetched
+        carry_over(data, load_raw_anime(OUTPUT_FILE))
+
         with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
             
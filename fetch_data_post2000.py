@@ -5,6 +5,9 @@ import urllib.error
 import urllib.parse
 from datetime import datetime
 
+from catalog_schema import load_raw_anime
+from jikan import carry_over, to_entry
+
 # Config
 TARGET_COUNT = 1000 # Increased limit
 OUTPUT_FILE = 'data/rawAnime.json'
@@ -45,21 +48,7 @@ def fetch_top_anime(limit=50):
                     # Skip hentai or non-standard entries if needed
                     # if item.get('rating') == 'Rx - Hentai': continue 
 
-                    entry = {
-                        "id": item['mal_id'],
-                        "name_en": item['title_english'] if item.get('title_english') else item['title'],
-                        "name_jp": item.get('title_japanese', ''),
-                        "image_url": item['images']['jpg']['image_url'],
-                        "genres": [g['name'] for g in item.get('genres', [])],
-                        "themes": [t['name'] for t in item.get('themes', [])],
-                        "demographics": [d['name'] for d in item.get('demographics', [])],
-                        "studios": [s['name'] for s in item.get('studios', [])],
-                        "year": item.get('year') or (int(item['aired']['prop']['from']['year']) if item.get('aired') and item['aired'].get('prop') and item['aired']['prop'].get('from') and item['aired']['prop']['from'].get('year') else 0),
-                        "episodes": item.get('episodes') or 0,
-                        "source": item.get('source', 'Unknown'),
-                        "score": item.get('score', 0),
-                        "synopsis": item.get('synopsis', '')
-                    }
+                    entry = to_entry(item)  # Includes the extra list fields (jikan.LIST_FIELDS)
                     all_data.append(entry)
                     if len(all_data) >= limit:
                         break
@@ -86,6 +75,9 @@ def main():
         import os
         os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
         
+        # Relations come from per-id lookups (enrich_data.py): keep the ones already fetched
+        carry_over(data, load_raw_anime(OUTPUT_FILE))
+
         with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
             
@@ -0,0 +1,70 @@
+from typing import Dict, Hashable, List
+
+# Config
+# Relations that keep two titles in one franchise. Alternative versions,
+# spin-offs and summaries are left out: they are separate games to guess.
+LINK_RELATIONS = {'Sequel', 'Prequel', 'Side Story', 'Parent Story'}
+
+
+class UnionFind:
+    """Disjoint sets over hashable items (union by size, path halving)."""
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def find(self, x):
+        parent = self.parent
+        if x not in parent:
+            parent[x] = x
+            self.size[x] = 1
+            return x
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+
+def build_franchises(raw_anime: List[Dict]) -> Dict[str, int]:
+    """
+    str(MAL id) -> franchise id (the smallest catalog id in the group), for
+    catalog entries linked to at least one other catalog entry. Titles
+    outside the catalog still connect their neighbours, e.g. two seasons
+    that are only related through a movie that was never fetched.
+    Entries without 'relations' (see enrich_data.py) stay on their own.
+    """
+    uf = UnionFind()
+    for item in raw_anime:
+        uf.find(item['id'])
+        for rel in item.get('relations', []):
+            if rel['relation'] in LINK_RELATIONS:
+                uf.union(item['id'], rel['id'])
+
+    groups: Dict[Hashable, set] = {}
+    for item in raw_anime:
+        groups.setdefault(uf.find(item['id']), set()).add(item['id'])
+    return {
+        str(mal_id): min(members)
+        for members in groups.values() if len(members) > 1
+        for mal_id in members
+    }
+
+
+def franchise_groups(franchises: Dict[str, int]) -> Dict[int, List[int]]:
+    """franchise id -> member ids (inverse of build_franchises)."""
+    groups: Dict[int, List[int]] = {}
+    for mal_id, root in franchises.items():
+        groups.setdefault(root, []).append(int(mal_id))
+    for members in groups.values():
+        members.sort()
+    return groups
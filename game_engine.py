@@ -0,0 +1,295 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from anime_data import Anime
+
+# Cell statuses (match the colour keys used by the UI)
+STATUS_CORRECT = "correct"
+STATUS_INCORRECT = "incorrect"
+
+ARROW_UP = "↑"
+ARROW_DOWN = "↓"
+
+# Hint level -> extra guesses charged when unlocked
+HINT_COSTS = {1: 2, 2: 5, 3: 10}
+
+SESSION_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)  # v1 predates franchise mode (no flags field)
+
+# to_bytes() flag bits
+FLAG_FRANCHISE = 1
+
+
+def _write_varint(out: bytearray, value: int):
+    """LEB128: 7 bits per byte, high bit set while more bytes follow."""
+    if value < 0:
+        raise ValueError(f"Cannot encode negative value: {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Returns (value, next position)."""
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated session data")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+@dataclass
+class GuessFeedback:
+    """Result of comparing one guess against the target (one grid row)."""
+    title: str
+    studio: str
+    genres: List[Tuple[str, bool]]  # (tag, matches target)
+    year: str
+    year_arrow: str
+    episodes: str
+    episodes_arrow: str
+    demographic: str
+    source: str
+
+    @property
+    def is_win(self) -> bool:
+        return self.title == STATUS_CORRECT
+
+    def key(self) -> Tuple:
+        """Hashable form of everything the player sees in the row."""
+        return (self.title, self.studio, tuple(self.genres), self.year, self.year_arrow,
+                self.episodes, self.episodes_arrow, self.demographic, self.source)
+
+
+def _compare_number(guess_value: int, target_value: int) -> Tuple[str, str]:
+    if guess_value == target_value:
+        return STATUS_CORRECT, ""
+    if guess_value < target_value:
+        return STATUS_INCORRECT, ARROW_UP
+    return STATUS_INCORRECT, ARROW_DOWN
+
+
+def _status(match: bool) -> str:
+    return STATUS_CORRECT if match else STATUS_INCORRECT
+
+
+def is_title_match(guess: Anime, target: Anime, franchise_mode: bool = False) -> bool:
+    """Exact title, or in franchise mode any season / side story of the target's franchise."""
+    if franchise_mode:
+        return guess.franchise_id == target.franchise_id
+    return guess.id == target.id
+
+
+def compare(guess: Anime, target: Anime, franchise_mode: bool = False) -> GuessFeedback:
+    """Compare a guess with the target, column by column (same rules as the grid)."""
+    target_genres = set(target.genres)
+    year_status, year_arrow = _compare_number(guess.year, target.year)
+    ep_status, ep_arrow = _compare_number(guess.episodes, target.episodes)
+    return GuessFeedback(
+        title=_status(is_title_match(guess, target, franchise_mode)),
+        studio=_status(guess.studio == target.studio),
+        genres=[(g, g in target_genres) for g in guess.genres],
+        year=year_status,
+        year_arrow=year_arrow,
+        episodes=ep_status,
+        episodes_arrow=ep_arrow,
+        demographic=_status(guess.demographic == target.demographic),
+        source=_status(guess.source == target.source),
+    )
+
+
+class GameSession:
+    """
+    Headless game state: target, guesses, hint unlocks and penalties.
+    The Flet UI in main.py only renders what this object reports.
+    In franchise mode any title of the target's franchise wins.
+    """
+
+    def __init__(self, anime_list: List[Anime], target: Optional[Anime] = None,
+                 rng: Optional[random.Random] = None, franchise_mode: bool = False):
+        self.anime_list = anime_list
+        # Own RNG so hint picks never touch (or depend on) the global random state
+        self.rng = rng or random.Random()
+        self.franchise_mode = franchise_mode
+        self.reset(target)
+
+    def reset(self, target: Optional[Anime] = None):
+        self.target = target if target is not None else self.rng.choice(self.anime_list)
+        self.guesses: List[Anime] = []
+        self.guessed_ids = set()
+        self.penalty_count = 0
+        self.unlocked_hints = set()
+        self.revealed_tag_indices = set()
+        self.game_over = False
+        self.won = False
+
+        # Hint tags: use genres strictly to match the game grid
+        self.hint_tags: List[str] = list(self.target.genres) if self.target.genres else []
+        self._hint_tag_index = {tag: i for i, tag in enumerate(self.hint_tags)}
+        # Target tags already shown green in some guess row (kept up to date by guess())
+        self.known_tag_set = set()
+        self.new_known_tags: List[int] = []   # Indices first revealed by the latest guess
+        self.last_unlocked_tag: Optional[int] = None
+
+    # --- Guessing ---
+
+    def has_guessed(self, anime: Anime) -> bool:
+        return anime.id in self.guessed_ids
+
+    def guess(self, anime: Anime) -> GuessFeedback:
+        if self.game_over:
+            raise ValueError("Game is already over")
+        if anime.id in self.guessed_ids:
+            raise ValueError(f"Already guessed: {anime.name_cn}")
+
+        feedback = compare(anime, self.target, self.franchise_mode)
+        self.guesses.append(anime)
+        self.guessed_ids.add(anime.id)
+
+        self.new_known_tags = []
+        for tag in anime.genres:
+            i = self._hint_tag_index.get(tag)
+            if i is not None and i not in self.known_tag_set:
+                self.known_tag_set.add(i)
+                self.new_known_tags.append(i)
+
+        if feedback.is_win:
+            self.game_over = True
+            self.won = True
+        return feedback
+
+    def give_up(self):
+        """End the game as a loss; the UI then reveals the target."""
+        self.game_over = True
+        self.won = False
+
+    @property
+    def attempts(self) -> int:
+        """Guesses plus hint penalties (what the player sees as '猜測次數')."""
+        return len(self.guesses) + self.penalty_count
+
+    @property
+    def score(self) -> int:
+        return self.attempts
+
+    # --- Hints ---
+
+    def known_tag_indices(self) -> set:
+        """Target tags already shown green in some guess row."""
+        return self.known_tag_set
+
+    def revealed_tags(self) -> set:
+        """Paid hints plus tags the player already knows from guesses."""
+        return self.revealed_tag_indices | self.known_tag_set
+
+    def remaining_tag_count(self) -> int:
+        return len(self.hint_tags) - len(self.revealed_tag_indices | self.known_tag_set)
+
+    def unlock_hint(self, level: int) -> bool:
+        """Unlock a hint level, charging its cost. Returns False if nothing changed."""
+        cost = HINT_COSTS[level]
+
+        if level == 1:
+            # Multi-unlock: pick a tag that is neither paid for nor already known
+            revealed = self.revealed_tags()
+            available = [i for i in range(len(self.hint_tags)) if i not in revealed]
+            if not available:
+                return False
+            self.last_unlocked_tag = self.rng.choice(available)
+            self.revealed_tag_indices.add(self.last_unlocked_tag)
+        elif level in self.unlocked_hints:
+            return False
+        else:
+            self.unlocked_hints.add(level)
+
+        self.penalty_count += cost
+        return True
+
+    # --- Serialization ---
+
+    def to_dict(self) -> Dict:
+        return {
+            "v": SESSION_VERSION,
+            "target": self.target.id,
+            "guesses": [a.id for a in self.guesses],
+            "hints": sorted(self.unlocked_hints),
+            "tags": sorted(self.revealed_tag_indices),
+            "penalty": self.penalty_count,
+            "franchise": self.franchise_mode,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, anime_list: List[Anime],
+                  rng: Optional[random.Random] = None) -> "GameSession":
+        by_id = {a.id: a for a in anime_list}
+        if data.get("v") not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported session version: {data.get('v')}")
+        if data["target"] not in by_id:
+            raise ValueError(f"Unknown target id: {data['target']}")
+
+        session = cls(anime_list, target=by_id[data["target"]], rng=rng,
+                      franchise_mode=data.get("franchise", False))
+        for anime_id in data["guesses"]:
+            if anime_id in by_id:
+                session.guess(by_id[anime_id])
+        # Saved state is untrusted (stale or corrupt): keep only hint levels
+        # and tag indices that exist for this target, and charge for those.
+        # LV1 is bought per tag, so it never appears as an unlocked level.
+        session.unlocked_hints = {level for level in data["hints"] if level in HINT_COSTS and level != 1}
+        session.revealed_tag_indices = {i for i in data["tags"] if type(i) is int and 0 <= i < len(session.hint_tags)}
+        session.penalty_count = (HINT_COSTS[1] * len(session.revealed_tag_indices)
+                                 + sum(HINT_COSTS[level] for level in session.unlocked_hints))
+        return session
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact binary form of to_dict(): version byte, then varints for the
+        target id, guess count and guess ids, hint levels and paid tag
+        indices as bitmasks, the penalty and the mode flags. A typical game
+        is ~20-40 bytes.
+        """
+        out = bytearray([SESSION_VERSION])
+        _write_varint(out, self.target.id)
+        _write_varint(out, len(self.guesses))
+        for anime in self.guesses:
+            _write_varint(out, anime.id)
+        _write_varint(out, sum(1 << (level - 1) for level in self.unlocked_hints))
+        _write_varint(out, sum(1 << i for i in self.revealed_tag_indices))
+        _write_varint(out, self.penalty_count)
+        _write_varint(out, FLAG_FRANCHISE if self.franchise_mode else 0)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, anime_list: List[Anime],
+                   rng: Optional[random.Random] = None) -> "GameSession":
+        if not data:
+            raise ValueError("Empty session data")
+        pos = 1
+        target, pos = _read_varint(data, pos)
+        count, pos = _read_varint(data, pos)
+        guesses = []
+        for _ in range(count):
+            anime_id, pos = _read_varint(data, pos)
+            guesses.append(anime_id)
+        hint_bits, pos = _read_varint(data, pos)
+        tag_bits, pos = _read_varint(data, pos)
+        penalty, pos = _read_varint(data, pos)
+        flags = 0
+        if data[0] >= 2:
+            flags, pos = _read_varint(data, pos)
+        return cls.from_dict({
+            "v": data[0],
+            "target": target,
+            "guesses": guesses,
+            "hints": [level for level in HINT_COSTS if hint_bits >> (level - 1) & 1],
+            "tags": [i for i in range(tag_bits.bit_length()) if tag_bits >> i & 1],
+            "penalty": penalty,
+            "franchise": bool(flags & FLAG_FRANCHISE),
+        }, anime_list, rng)
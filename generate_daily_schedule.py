@@ -0,0 +1,89 @@
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+from catalog_schema import load_raw_anime
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+RAW_DATA_PATH = 'data/rawAnime.json'
+SCHEDULE_PATH = 'data/daily_schedule.json'
+DAYS_AHEAD = 730          # How far past today the schedule must reach
+SEED = "anidle-daily"     # Fixed seed for an isolated PRNG (never the global one)
+
+
+def load_json(path):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def build_schedule(catalog_ids, existing, today, days_ahead):
+    """
+    Extend the rotation until it covers today + days_ahead.
+
+    Every day already scheduled is kept as it is, so re-running after a
+    data refresh never changes a past or already-announced pick (a day
+    whose anime was removed falls back to the seeded pick in the game).
+    New days are only appended, drawn from a shuffled cycle of the ids not
+    yet used in the current cycle, so no title repeats until the whole
+    catalog has been played.
+    """
+    ids = sorted(set(catalog_ids))  # Sorted: independent of catalog order
+    id_set = set(ids)
+
+    start = date.fromisoformat(existing['start']) if existing.get('start') else today
+    schedule = list(existing.get('ids', []))
+
+    # Replay the existing days to find the current cycle: it ends once every
+    # id in today's catalog has been used, whatever the catalog size was then
+    cycle, used = 0, set()
+    for mal_id in schedule:
+        if mal_id in id_set:
+            used.add(mal_id)
+        if len(used) == len(ids):
+            cycle, used = cycle + 1, set()
+
+    end = today + timedelta(days=days_ahead)
+    needed = max((end - start).days + 1, len(schedule))
+
+    while len(schedule) < needed:
+        rng = random.Random(f"{SEED}:{cycle}")
+        remaining = [i for i in ids if i not in used]
+        rng.shuffle(remaining)
+        # Avoid the same title on both sides of a cycle boundary
+        if schedule and remaining and remaining[0] == schedule[-1] and len(remaining) > 1:
+            remaining.append(remaining.pop(0))
+        schedule.extend(remaining)
+        cycle += 1
+        used = set()
+
+    return {"start": start.isoformat(), "ids": schedule[:needed]}
+
+
+def main():
+    raw_data = load_raw_anime(RAW_DATA_PATH)
+    if not raw_data:
+        print("Error: no anime data found.")
+        return
+
+    existing = load_json(SCHEDULE_PATH)
+    schedule = build_schedule([a['id'] for a in raw_data], existing, date.today(), DAYS_AHEAD)
+
+    with open(SCHEDULE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(schedule, f, ensure_ascii=False)
+
+    kept = min(len(existing.get('ids', [])), len(schedule['ids']))
+    print(f"Schedule: {len(schedule['ids'])} days from {schedule['start']} "
+          f"({kept} existing days considered, catalog size {len(set(a['id'] for a in raw_data))})")
+    print(f"Saved to {SCHEDULE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 import json
 import os
 
+from catalog_schema import SCHEMA_VERSION, load_raw_anime, validate_catalog
+from franchise import build_franchises
+
 # Config
 DATA_DIR = 'data'
 OUTPUT_FILE = 'embedded_data.py'
+ASSETS_DIR = 'assets'
+MAX_ERRORS_SHOWN = 20
 
 def split_large_list(data_list, var_name, chunk_size=50):
     """Splits a large list into smaller chunks to avoid MemoryError/Parser issues."""
@@ -22,14 +27,29 @@ def split_large_list(data_list, var_name, chunk_size=50):
     
     return lines
 
-def main():
-    print("Generating embedded_data.py...")
-    
+def collect_data():
+    """
+    Everything the game needs at runtime, keyed by the embedded_data.py
+    variable names (also the data pack layout, see build_bundle.py).
+    Returns None if a required file is missing or the catalog does not
+    match catalog_schema.CATALOG_SCHEMA.
+    """
+    # Validated once here, so the game can trust every entry (anime_data.load_anime_data)
+    raw_path = os.path.join(DATA_DIR, 'rawAnime.json')
+    raw_anime, errors, warnings = validate_catalog(load_raw_anime(raw_path))
+    for message in warnings:
+        print(f"Warning: {message}")
+    if errors:
+        print(f"Error: {len(errors)} problem(s) in {raw_path}:")
+        for message in errors[:MAX_ERRORS_SHOWN]:
+            print(f"  {message}")
+        return None
+    if not raw_anime:
+        print(f"Error: no anime in {raw_path}")
+        return None
+
     # Load JSONs
     try:
-        with open(os.path.join(DATA_DIR, 'rawAnime.json'), 'r', encoding='utf-8') as f:
-            raw_anime = json.load(f)
-        
         with open(os.path.join(DATA_DIR, 'cn_titles.json'), 'r', encoding='utf-8') as f:
             cn_titles = json.load(f)
             
@@ -38,6 +58,63 @@ def main():
 
     except FileNotFoundError as e:
         print(f"Error: {e}")
+        return None
+
+    # Optional: daily rotation (run generate_daily_schedule.py first)
+    daily_schedule = {}
+    schedule_path = os.path.join(DATA_DIR, 'daily_schedule.json')
+    if os.path.exists(schedule_path):
+        with open(schedule_path, 'r', encoding='utf-8') as f:
+            daily_schedule = json.load(f)
+    else:
+        print("Warning: daily_schedule.json not found, daily mode will fall back to a seeded pick.")
+
+    # Optional: pre-masked synopses for the LV3 hint (run generate_masked_synopsis.py first)
+    masked_synopsis = {}
+    masked_path = os.path.join(DATA_DIR, 'masked_synopsis.json')
+    if os.path.exists(masked_path):
+        with open(masked_path, 'r', encoding='utf-8') as f:
+            masked_synopsis = json.load(f)
+    else:
+        print("Warning: masked_synopsis.json not found, synopses will be masked at runtime.")
+
+    # Optional: bundled cover thumbnails (run build_images.py first).
+    # Only entries whose files exist are embedded, so a fresh clone keeps CDN URLs.
+    image_map = {}
+    image_map_path = os.path.join(DATA_DIR, 'image_map.json')
+    if os.path.exists(image_map_path):
+        with open(image_map_path, 'r', encoding='utf-8') as f:
+            image_map = {
+                k: v for k, v in json.load(f).items()
+                if all(os.path.exists(os.path.join(ASSETS_DIR, p.lstrip('/'))) for p in v.values())
+            }
+
+    # Optional: hand-maintained search aliases (abbreviations, nicknames)
+    aliases = {}
+    aliases_path = os.path.join(DATA_DIR, 'aliases.json')
+    if os.path.exists(aliases_path):
+        with open(aliases_path, 'r', encoding='utf-8') as f:
+            aliases = json.load(f)
+
+    # Seasons / side stories grouped through their Jikan relations (enrich_data.py)
+    franchises = build_franchises(raw_anime)
+
+    return {
+        'CN_TITLES': cn_titles,
+        'CN_SYNOPSIS': cn_synopsis,
+        'DAILY_SCHEDULE': daily_schedule,
+        'MASKED_SYNOPSIS': masked_synopsis,
+        'IMAGE_MAP': image_map,
+        'ALIASES': aliases,
+        'FRANCHISES': franchises,
+        'CATALOG_SCHEMA': SCHEMA_VERSION,
+        'RAW_ANIME_DATA': raw_anime,
+    }
+
+def main():
+    print("Generating embedded_data.py...")
+    data = collect_data()
+    if data is None:
         return
 
     # Write Python file
@@ -46,15 +123,11 @@ def main():
         f.write("# This file contains the game data directly as Python objects\n")
         f.write("# to avoid filesystem issues in Web/Pyodide environments.\n\n")
         
-        # Write Maps (usually smaller, repr checks out)
-        f.write(f"CN_TITLES = {repr(cn_titles)}\n\n")
-        f.write(f"CN_SYNOPSIS = {repr(cn_synopsis)}\n\n")
-        
-        # Write Main Data
+        # Write Maps (usually smaller, repr checks out), Main Data last
         # For very large lists, simple repr might hit limits on some IDEs, but usually fine for 1000 items.
-        # However, to be safe and cleaner, let's just write it.
         # If it's huge, splitting might be better, but 1.3MB is okay for one variable.
-        f.write(f"RAW_ANIME_DATA = {repr(raw_anime)}\n")
+        for name, value in data.items():
+            f.write(f"{name} = {repr(value)}\n\n")
         
     print(f"Successfully wrote {os.path.getsize(OUTPUT_FILE)} bytes to {OUTPUT_FILE}")
 
@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+import time
+
+from catalog_schema import load_raw_anime
+from synopsis_masking import compile_matcher, generic_aliases, mask_text, title_aliases
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+RAW_DATA_PATH = 'data/rawAnime.json'
+CN_TITLES_PATH = 'data/cn_titles.json'
+CN_SYNOPSIS_PATH = 'data/cn_synopsis.json'
+OUTPUT_PATH = 'data/masked_synopsis.json'
+
+
+def load_json(path):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def main():
+    raw_data = load_raw_anime(RAW_DATA_PATH)
+    cn_titles = load_json(CN_TITLES_PATH)
+    cn_synopsis = load_json(CN_SYNOPSIS_PATH)
+
+    print(f"Masking synopses for {len(raw_data)} anime...")
+    start = time.perf_counter()
+    titles = {
+        str(item['id']): (cn_titles.get(str(item['id']), ''), item.get('name_en', ''), item.get('name_jp', ''))
+        for item in raw_data
+    }
+    # Common words ("命運", "偶像") would mask unrelated text
+    generic = generic_aliases(list(titles.values()))
+    print(f"Skipping {len(generic)} generic aliases: {', '.join(sorted(generic))}")
+    masked = {}
+    changed = 0
+    for item in raw_data:
+        mal_id = str(item['id'])
+        # Same choice as load_anime_data(): CN > EN
+        synopsis = cn_synopsis.get(mal_id) or item.get('synopsis', '')
+        if not synopsis:
+            continue
+
+        # One automaton per anime over every alias of its titles
+        matcher = compile_matcher(title_aliases(*titles[mal_id], generic=generic))
+        masked[mal_id] = mask_text(synopsis, matcher)
+        if masked[mal_id] != synopsis:
+            changed += 1
+
+    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(masked, f, ensure_ascii=False)
+
+    print(f"Masked {changed}/{len(masked)} synopses in {time.perf_counter() - start:.2f}s")
+    print(f"Saved to {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import flet as ft
+
+from anime_data import Anime
+from game_engine import GuessFeedback, STATUS_CORRECT, STATUS_INCORRECT
+
+# Colors map (shared by the whole UI)
+COLORS = {
+    "green_600": "#15803d", # Darker Green (700)
+    "red_600": "#b91c1c",   # Darker Red (700)
+    "amber_600": "#b45309", # Darker Amber (700)
+    "blue_grey_700": "#27272a", # Zinc 800 (Neutral Dark Grey)
+    "blue_grey_800": "#18181b", # Zinc 900 (Deep Grey)
+    "blue_grey_900": "#09090b", # Zinc 950 (Almost Black)
+    "blue_grey_200": "#a1a1aa", # Zinc 400 (Muted Text)
+    "blue_grey_400": "#52525b", # Zinc 600 (Darker Label)
+    "white": "#e4e4e7"          # Zinc 200 (Off-white, softer)
+}
+
+# Column Config (8 Columns)
+# Image(100), Name(160), Studio(140), Genres(220), Year(80), Ep(80), Demo(90), Source(90) = 960 width
+COL_WIDTHS = [100, 160, 140, 220, 80, 80, 90, 90]
+CELL_HEIGHT = 110
+
+# Shared style values: built once at import, never mutated, reused by every row.
+# Plain numbers serialize smaller than Padding/BorderRadius objects.
+STATUS_COLORS = {
+    STATUS_CORRECT: COLORS["green_600"],
+    STATUS_INCORRECT: COLORS["red_600"],
+    "partial": COLORS["amber_600"],
+    "neutral": COLORS["blue_grey_700"],
+}
+DEFAULT_CELL_COLOR = COLORS["blue_grey_800"]
+CENTER = ft.Alignment(0, 0)
+CELL_RADIUS = 8
+CELL_PADDING = 5
+TAG_RADIUS = 4
+TAG_PADDING = ft.Padding(left=6, right=6, top=3, bottom=3)
+
+
+# Helper to create a cell
+# Container + Text is already the minimum: ft.Text has no box background,
+# radius, padding or vertical centering (TextStyle.bgcolor only highlights
+# the glyphs), so a bare Text would change how the board looks.
+def create_cell(content: str, status: str, width: int):
+    return ft.Container(
+        content=ft.Text(str(content), size=16, weight="bold", text_align="center", color="white"),
+        width=width,
+        height=CELL_HEIGHT,
+        bgcolor=STATUS_COLORS.get(status, DEFAULT_CELL_COLOR),
+        border_radius=CELL_RADIUS,
+        alignment=CENTER,
+        padding=CELL_PADDING,
+    )
+
+
+# Helper for Cover Image
+def create_image_cell(image_url: str, width: int):
+    return ft.Container(
+        content=ft.Image(src=image_url, fit="cover", border_radius=TAG_RADIUS),
+        width=width,
+        height=CELL_HEIGHT,
+        bgcolor=COLORS["blue_grey_900"], # Dark BG for image
+        border_radius=CELL_RADIUS,
+        padding=CELL_PADDING,
+    )
+
+
+# Helper to create tags cell (for Genres)
+def create_tags_cell(genres: list, width: int):
+    # genres: [(tag, matches target)] from GuessFeedback
+    tags = [
+        ft.Container(
+            content=ft.Text(g, size=20, weight="bold", color="white"),
+            bgcolor=STATUS_COLORS[STATUS_CORRECT if is_match else STATUS_INCORRECT],
+            padding=TAG_PADDING,
+            border_radius=TAG_RADIUS,
+        )
+        for g, is_match in genres
+    ]
+    return ft.Container(
+        content=ft.Row(controls=tags, wrap=True, spacing=4, run_spacing=4, alignment=ft.MainAxisAlignment.CENTER),
+        width=width,
+        height=CELL_HEIGHT,
+        bgcolor=DEFAULT_CELL_COLOR,
+        border_radius=CELL_RADIUS,
+        alignment=CENTER,
+        padding=CELL_PADDING,
+    )
+
+
+# Component: Guess Row
+def build_guess_row(guess: Anime, feedback: GuessFeedback):
+    # Cells are never mutated after insertion, so no per-cell ft.Animation
+    return ft.Row(
+        controls=[
+            create_image_cell(guess.image_url, COL_WIDTHS[0]),
+            create_cell(guess.name_cn, feedback.title, COL_WIDTHS[1]),
+            create_cell(guess.studio, feedback.studio, COL_WIDTHS[2]),
+            create_tags_cell(feedback.genres, COL_WIDTHS[3]),
+            create_cell(f"{guess.year} {feedback.year_arrow}", feedback.year, COL_WIDTHS[4]),
+            create_cell(f"{guess.episodes} {feedback.episodes_arrow}", feedback.episodes, COL_WIDTHS[5]),
+            create_cell(guess.demographic, feedback.demographic, COL_WIDTHS[6]),
+            create_cell(guess.source, feedback.source, COL_WIDTHS[7]),
+        ],
+        alignment=ft.MainAxisAlignment.CENTER,
+        spacing=5
+    )
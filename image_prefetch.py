@@ -0,0 +1,80 @@
+import asyncio
+from collections import deque
+from typing import Iterable, Optional
+
+import flet as ft
+
+# Config
+MAX_CONCURRENT = 3        # Images requested at the same time
+SLOT_HOLD_SECONDS = 0.8   # How long a slot keeps a URL mounted before taking the next one
+
+
+class ImagePrefetcher:
+    """
+    Warms the browser's image cache in the background by mounting tiny,
+    transparent Image controls for covers the player is likely to need next
+    (the LV2 hint cover and the suggestion entries on screen).
+
+    At most MAX_CONCURRENT covers load at once. Calling prefetch() again
+    drops whatever is still queued from the previous call (the suggestions
+    changed), while pinned URLs always go first until they have been loaded.
+    """
+
+    def __init__(self, page: ft.Page, max_concurrent: int = MAX_CONCURRENT,
+                 hold_seconds: float = SLOT_HOLD_SECONDS):
+        self.page = page
+        self.hold_seconds = hold_seconds
+        self.queue = deque()
+        self.done = set()
+        self.pinned = []
+        self._task = None
+
+        self.slots = [
+            ft.Image(src="", width=1, height=1, opacity=0, visible=False)
+            for _ in range(max_concurrent)
+        ]
+        # Mount in page.overlay; 1x1 and click-through so it never affects layout
+        self.control = ft.Container(
+            content=ft.Row(self.slots, spacing=0),
+            width=1, height=1, left=0, top=0,
+            ignore_interactions=True,
+        )
+
+    def pin(self, url: Optional[str]):
+        """Always prefetch this URL first (e.g. the current target's hint cover)."""
+        pending = [u for u in self.queue if u not in self.pinned]
+        self.pinned = [url] if url else []
+        self._restart(pending)
+
+    def prefetch(self, urls: Iterable[str]):
+        """Replace the pending queue with these URLs (most likely first)."""
+        self._restart(urls)
+
+    def cancel(self):
+        self._restart([])
+
+    def _restart(self, urls: Iterable[str]):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+        self.queue.clear()
+        seen = set()
+        for url in list(self.pinned) + list(urls):
+            if url and url not in self.done and url not in seen:
+                seen.add(url)
+                self.queue.append(url)
+        if self.queue:
+            self._task = self.page.run_task(self._run)
+
+    async def _run(self):
+        while self.queue:
+            batch = [self.queue.popleft() for _ in range(min(len(self.slots), len(self.queue)))]
+            for slot, url in zip(self.slots, batch):
+                slot.src = url
+                slot.visible = True
+            self.control.update()
+            await asyncio.sleep(self.hold_seconds)
+            # Only after a full hold: a batch cut short by a restart may not
+            # have loaded yet, so it can be queued again
+            self.done.update(batch)
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+
+# Config
+API_BASE = "https://api.jikan.moe/v4"
+USER_AGENT = 'Mozilla/5.0'
+RATE_LIMITS = [(3, 1.0), (60, 60.0)]   # Jikan allows 3 requests/s and 60/min
+PAGE_LIMIT = 25                        # Largest page the list endpoints return
+MAX_RETRIES = 4                        # On 429 / 5xx, with exponential backoff
+
+# Extra catalog fields that every /v4/anime list item already carries
+LIST_FIELDS = ('media_type', 'season', 'rating', 'status', 'members')
+# Fields only the per-id /v4/anime/{id}/full response has
+DETAIL_FIELDS = ('relations',)
+# Relation kinds kept (anime entries only; adaptations and music videos are dropped)
+RELATION_KINDS = {'Sequel', 'Prequel', 'Side Story', 'Parent Story', 'Alternative Version',
+                  'Alternative Setting', 'Spin-Off', 'Summary', 'Full Story'}
+
+
+class RateLimiter:
+    """
+    Blocks until a request fits in every (count, seconds) window. Thread-safe.
+    clock / sleep default to the class attributes, which cassette.py
+    replaces with a virtual clock in replay so no real time passes.
+    """
+    clock = staticmethod(time.monotonic)
+    sleep = staticmethod(time.sleep)
+
+    def __init__(self, limits=RATE_LIMITS, clock=None, sleep=None):
+        self.limits = limits
+        self.sent = deque()
+        self.lock = threading.Lock()
+        if clock is not None:
+            self.clock = clock
+        if sleep is not None:
+            self.sleep = sleep
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                longest = max(window for _, window in self.limits)
+                while self.sent and now - self.sent[0] >= longest:
+                    self.sent.popleft()
+                wait = 0.0
+                for count, window in self.limits:
+                    recent = [t for t in self.sent if now - t < window]
+                    if len(recent) >= count:
+                        wait = max(wait, recent[-count] + window - now)
+                if wait <= 0:
+                    self.sent.append(now)
+                    return
+            self.sleep(wait)
+
+
+def get_json(path, params=None, limiter: RateLimiter = None):
+    """GET API_BASE + path, retrying rate-limit and server errors."""
+    url = f"{API_BASE}{path}" + (f"?{urllib.parse.urlencode(params)}" if params else '')
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            limiter.acquire()
+        try:
+            req = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return json.loads(response.read().decode())
+        except urllib.error.HTTPError as e:
+            if (e.code == 429 or e.code >= 500) and attempt < MAX_RETRIES:
+                time.sleep(2 ** attempt)
+                continue
+            raise
+
+
+def _aired_year(item):
+    year = (((item.get('aired') or {}).get('prop') or {}).get('from') or {}).get('year')
+    return int(year) if year else 0
+
+
+def _relations(item):
+    return [
+        {"relation": group['relation'], "id": entry['mal_id']}
+        for group in item.get('relations') or []
+        if group.get('relation') in RELATION_KINDS
+        for entry in group.get('entry', [])
+        if entry.get('type') == 'anime'
+    ]
+
+
+def to_entry(item):
+    """
+    One rawAnime.json entry from a Jikan anime object (list item or /full).
+    'relations' is only set when the object carries them (/full).
+    """
+    entry = {
+        "id": item['mal_id'],
+        "name_en": item['title_english'] if item.get('title_english') else item['title'],
+        "name_jp": item.get('title_japanese') or '',
+        "image_url": item['images']['jpg']['image_url'],
+        "genres": [g['name'] for g in item.get('genres', [])],
+        "themes": [t['name'] for t in item.get('themes', [])],
+        "demographics": [d['name'] for d in item.get('demographics', [])],
+        "studios": [s['name'] for s in item.get('studios', [])],
+        "year": item.get('year') or _aired_year(item),
+        "episodes": item.get('episodes') or 0,
+        "source": item.get('source', 'Unknown'),
+        "score": item.get('score') or 0,
+        "synopsis": item.get('synopsis') or '',
+        "media_type": item.get('type') or '',
+        "season": item.get('season') or '',
+        "rating": item.get('rating') or '',
+        "status": item.get('status') or '',
+        "members": item.get('members') or 0,
+    }
+    if 'relations' in item:
+        entry['relations'] = _relations(item)
+    return entry
+
+
+def fetch_full(mal_id, limiter: RateLimiter = None):
+    return get_json(f"/anime/{mal_id}/full", limiter=limiter)['data']
+
+
+def carry_over(entries, previous, fields=DETAIL_FIELDS):
+    """Keep detail-only fields from a previous rawAnime.json so a re-fetch does not need /full again."""
+    old = {e['id']: e for e in previous}
+    for entry in entries:
+        for field in fields:
+            if field not in entry and field in old.get(entry['id'], {}):
+                entry[field] = old[entry['id']][field]
+    return entries
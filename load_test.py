@@ -0,0 +1,107 @@
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from anime_data import load_anime_data, ALIASES
+from candidate_filter import CandidateIndex
+from catalog import Catalog, CatalogSession, get_catalog
+from search_index import SearchIndex
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+DEFAULT_SESSIONS = 300
+DEFAULT_BASELINE = 10     # Per-session catalogs are slow to build; extrapolate from a few
+DEFAULT_ROUNDS = 20       # Guesses per session (each preceded by a few search keystrokes)
+KEYSTROKES = 3
+SEED = 42
+
+
+def build_private_catalog() -> Catalog:
+    """The old behaviour: every session loads and indexes its own copy."""
+    catalog = Catalog.__new__(Catalog)
+    catalog.anime_list = load_anime_data()
+    catalog.by_id = {a.id: a for a in catalog.anime_list}
+    catalog.candidate_index = CandidateIndex(catalog.anime_list)
+    catalog.search_index = SearchIndex(catalog.anime_list, ALIASES)
+    return catalog
+
+
+def open_sessions(count, make_catalog, seed):
+    """Returns (sessions, bytes allocated per session, seconds per session)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    sessions = [CatalogSession(make_catalog(), random.Random(f"{seed}:{i}")) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sessions, (after - before) / count, elapsed / count
+
+
+def drive(sessions, rounds, rng):
+    """Interleave keystrokes and guesses across all sessions; per-handler latencies in ms."""
+    search_ms, guess_ms = [], []
+    for _ in range(rounds):
+        for sim in sessions:
+            if sim.session.game_over:
+                continue
+            anime = rng.choice(sim.catalog.anime_list)
+            if sim.session.has_guessed(anime):
+                continue
+            name = anime.name_cn
+            for n in range(1, min(KEYSTROKES, len(name)) + 1):
+                start = time.perf_counter()
+                sim.on_search_change(name[:n])
+                search_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            sim.process_guess(anime)
+            guess_ms.append((time.perf_counter() - start) * 1000)
+    return search_ms, guess_ms
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many concurrent game sessions in one server process.")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument("--baseline", type=int, default=DEFAULT_BASELINE,
+                        help="sessions opened with a private catalog each (0 to skip)")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = get_catalog()
+    if not catalog.anime_list:
+        print("No data loaded.")
+        return
+    print(f"Shared catalog built once in {time.perf_counter() - start:.2f}s ({len(catalog.anime_list)} titles)\n")
+
+    print(f"{'mode':<10} {'sessions':>8} {'KB/session':>11} {'open ms':>8}")
+    if args.baseline:
+        _, per_session, open_s = open_sessions(args.baseline, build_private_catalog, args.seed)
+        print(f"{'private':<10} {args.baseline:>8} {per_session / 1024:>11.1f} {open_s * 1000:>8.1f}")
+    sessions, per_session, open_s = open_sessions(args.sessions, get_catalog, args.seed)
+    print(f"{'shared':<10} {args.sessions:>8} {per_session / 1024:>11.1f} {open_s * 1000:>8.1f}")
+
+    search_ms, guess_ms = drive(sessions, args.rounds, random.Random(args.seed))
+    print(f"\nHandler latency over {args.sessions} sessions (ms):")
+    for name, values in (("search", search_ms), ("guess", guess_ms)):
+        print(f"  {name:<7} n={len(values):<6} p50={statistics.median(values):.3f} "
+              f"p95={pct(values, 0.95):.3f} p99={pct(values, 0.99):.3f} max={max(values):.3f}")
+
+
+if __name__ == "__main__":
+    main()
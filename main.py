@@ -1,29 +1,42 @@
 import flet as ft
-from anime_data import load_anime_data, get_daily_anime, get_random_anime, Anime
+from anime_data import get_daily_anime, get_random_anime, Anime, has_data, install_data
+from data_pack import load_pack_file, fetch_pack
+from catalog import get_catalog
+from game_engine import GameSession, HINT_COSTS, compare
+from synopsis_masking import mask_synopsis as mask_titles
+from image_prefetch import ImagePrefetcher
+from session_store import SessionStore, StatsStore
+from player_stats import HISTOGRAM_BOUNDS, PlayerStats, histogram_labels
+from guess_row import COLORS, COL_WIDTHS, build_guess_row
+import bisect
+import os
+import sys
 import time
-import random
-
-def main(page: ft.Page):
-    # Create Colors map
-    COLORS = {
-        "green_600": "#15803d", # Darker Green (700)
-        "red_600": "#b91c1c",   # Darker Red (700)
-        "amber_600": "#b45309", # Darker Amber (700)
-        "blue_grey_700": "#27272a", # Zinc 800 (Neutral Dark Grey)
-        "blue_grey_800": "#18181b", # Zinc 900 (Deep Grey)
-        "blue_grey_900": "#09090b", # Zinc 950 (Almost Black)
-        "blue_grey_200": "#a1a1aa", # Zinc 400 (Muted Text)
-        "blue_grey_400": "#52525b", # Zinc 600 (Darker Label)
-        "white": "#e4e4e7"          # Zinc 200 (Off-white, softer)
-    }
 
+# Config
+BUNDLED_FONT = "fonts/NotoSansTC.ttf"  # build_font.py output, under assets/
+REMOTE_FONT = "https://fonts.gstatic.com/s/notosanstc/v35/-nF7OG829NcXan72yhO8IG99dBasx6w.ttf"
+
+
+def font_source():
+    """
+    The bundled subset when it was built (always for web builds: deploy.py
+    runs build_font.py), otherwise the full font from Google Fonts.
+    """
+    assets = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+    if sys.platform == "emscripten" or os.path.exists(os.path.join(assets, BUNDLED_FONT)):
+        return "/" + BUNDLED_FONT
+    return REMOTE_FONT
+
+async def main(page: ft.Page):
     # 1. Config Page
     page.title = "Anidle (Web v1.6)" # Version bump for verification
     page.theme_mode = ft.ThemeMode.DARK
     
-    # Register Google Font
+    # Bundled font (build_font.py -> assets/fonts/): served with the app and cached for offline play.
+    # Characters missing from the subset come from Flutter's fallback fonts.
     page.fonts = {
-        "Noto Sans TC": "https://fonts.gstatic.com/s/notosanstc/v35/-nF7OG829NcXan72yhO8IG99dBasx6w.ttf"
+        "Noto Sans TC": font_source()
     }
     
     # Theme config with web-safe font
@@ -47,7 +60,17 @@ def main(page: ft.Page):
     )
 
     try:
-        anime_list = load_anime_data()
+        # Web bundle: no embedded_data.py, the data pack is downloaded in
+        # parallel with Pyodide boot (build_bundle.py)
+        if not has_data():
+            pack = load_pack_file() or await fetch_pack()
+            if pack:
+                install_data(pack)
+
+        # Catalog, search index and filter tables are built once per process
+        # and shared (read-only) by every session
+        catalog = get_catalog()
+        anime_list = catalog.anime_list
         if not anime_list:
             raise Exception("load_anime_data returned empty list")
     except Exception as e:
@@ -58,138 +81,67 @@ def main(page: ft.Page):
         ]))
         return
 
-    target = get_random_anime(anime_list)
-    guesses = []
-    game_over = False
+    # Current game survives a page refresh (saved after every guess / hint)
+    store = SessionStore(page)
+    # All-time player statistics
+    stats_store = StatsStore(page)
+    # Both loaded before the UI exists: nothing played meanwhile can be overwritten
+    stats = await stats_store.load()
+    restored = await store.load(anime_list)
+    if restored is not None and restored.game_over:
+        restored = None
 
-    print(f"Target is: {target.name_cn}") # Cheat for debug
+    # All game rules and state live in the headless engine
+    session = restored or GameSession(anime_list, target=get_random_anime(anime_list))
 
-    # 3. UI Components
-    
-    # Column Config (8 Columns)
-    # Image(100), Name(160), Studio(140), Genres(220), Year(80), Ep(80), Demo(90), Source(90) = 960 width
-    COL_WIDTHS = [100, 160, 140, 220, 80, 80, 90, 90] 
-
-    # Helper to create a cell
-    def create_cell(content: str, status: str, width: int, delay: int = 0):
-        # Color Logic
-        status_colors = {
-            "correct": COLORS["green_600"],
-            "incorrect": COLORS["red_600"],
-            "partial": COLORS["amber_600"],
-            "neutral": COLORS["blue_grey_700"],
-        }
-        bg_color = status_colors.get(status, COLORS["blue_grey_800"])
-        
-        return ft.Container(
-            content=ft.Text(str(content), size=16, weight="bold", text_align="center", color="white"),
-            width=width,
-            height=110, # Increased Height
-            bgcolor=bg_color,
-            border_radius=8,
-            alignment=ft.Alignment(0, 0),
-            animate=ft.Animation(500, ft.AnimationCurve.BOUNCE_OUT),
-            padding=5,
-        )
-
-    # Helper for Cover Image
-    def create_image_cell(image_url: str, width: int):
-        return ft.Container(
-            content=ft.Image(src=image_url, fit="cover", border_radius=4),
-            width=width,
-            height=110, # Increased Height
-            bgcolor=COLORS["blue_grey_900"], # Dark BG for image
-            border_radius=8,
-            padding=5,
-            animate=ft.Animation(500, ft.AnimationCurve.BOUNCE_OUT),
-        )
+    # Titles still consistent with the rows shown so far (bitset over the catalog)
+    candidates = catalog.candidate_index.new_set(session.franchise_mode)
 
-    # Helper to create tags cell (for Genres)
-    def create_tags_cell(genres: list, target_genres: list, width: int):
-        target_set = set(target_genres)
-        
-        tags = []
-        for g in genres:
-            is_match = g in target_set
-            tags.append(
-                ft.Container(
-                    content=ft.Text(g, size=20, weight="bold", color="white"),
-                    bgcolor=COLORS["green_600"] if is_match else COLORS["red_600"],
-                    padding=ft.Padding(left=6, right=6, top=3, bottom=3),
-                    border_radius=4,
-                )
-            )
+    # Ranked, typo-tolerant title search
+    search_index = catalog.search_index
 
-        return ft.Container(
-            content=ft.Row(controls=tags, wrap=True, spacing=4, run_spacing=4, alignment=ft.MainAxisAlignment.CENTER),
-            width=width,
-            height=110, # Increased Height
-            bgcolor=COLORS["blue_grey_800"], 
-            border_radius=8,
-            alignment=ft.Alignment(0, 0),
-            padding=5,
-        )
+    if restored is None:
+        print(f"Target is: {session.target.name_cn}") # Cheat for debug
 
-    # Component: Guess Row
-    def build_guess_row(guess: Anime, target: Anime):
-        row_controls = []
-        
-        # 0. Cover Image
-        row_controls.append(create_image_cell(guess.image_url, COL_WIDTHS[0]))
+    # Background cover warm-up (hint cover + visible suggestions)
+    prefetcher = ImagePrefetcher(page)
 
-        # 1. Title (Text Only)
-        status = "correct" if guess.id == target.id else "incorrect"
-        row_controls.append(create_cell(guess.name_cn, status, COL_WIDTHS[1]))
-        
-        # 2. Studio
-        status = "correct" if guess.studio == target.studio else "incorrect"
-        row_controls.append(create_cell(guess.studio, status, COL_WIDTHS[2]))
-
-        # 3. Genres (TAGS)
-        # Using create_tags_cell instead of standard cell
-        row_controls.append(create_tags_cell(guess.genres, target.genres, COL_WIDTHS[3]))
-
-        # 4. Year
-        arrow = ""
-        status = "incorrect"
-        if guess.year == target.year:
-            status = "correct"
-        elif guess.year < target.year:
-            arrow = "↑"
-        else:
-            arrow = "↓"
-        row_controls.append(create_cell(f"{guess.year} {arrow}", status, COL_WIDTHS[4]))
-
-        # 5. Episodes
-        arrow = ""
-        status = "incorrect"
-        if guess.episodes == target.episodes:
-            status = "correct"
-        elif guess.episodes < target.episodes:
-            arrow = "↑"
-        else:
-            arrow = "↓"
-        row_controls.append(create_cell(f"{guess.episodes} {arrow}", status, COL_WIDTHS[5]))
+    def save_session():
+        page.run_task(store.save, session)
 
-        # 6. Demographic
-        status = "correct" if guess.demographic == target.demographic else "incorrect"
-        row_controls.append(create_cell(guess.demographic, status, COL_WIDTHS[6]))
+    def record_game():
+        stats.record(session)
+        page.run_task(stats_store.save, stats)
 
-        # 7. Source
-        status = "correct" if guess.source == target.source else "incorrect"
-        row_controls.append(create_cell(guess.source, status, COL_WIDTHS[7]))
+    def hint_cover_url(anime: Anime) -> str:
+        return anime.blur_url or anime.image_url
 
-        return ft.Row(
-            controls=row_controls,
-            alignment=ft.MainAxisAlignment.CENTER,
-            spacing=5
-        )
+    # 3. UI Components
+    
+    # Guess rows are rendered by guess_row.build_guess_row (shared styles)
 
     # Layout Containers
-    guesses_column = ft.Column(spacing=10, horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+    # Fixed-extent ListView: Flutter only builds the rows in view, and each
+    # guess sends just this list's change instead of re-diffing the page.
+    ROW_EXTENT = 120 # Row height 110 + 10 gap
+    MAX_VISIBLE_ROWS = 8
+    guesses_view = ft.ListView(item_extent=ROW_EXTENT, spacing=0, height=0, width=1000)
+
+    def resize_guesses_view():
+        # Grow with the rows until MAX_VISIBLE_ROWS, then scroll inside the list
+        guesses_view.height = min(len(guesses_view.controls), MAX_VISIBLE_ROWS) * ROW_EXTENT
     
     # Attempts Counter
     attempts_text = ft.Text(f"猜測次數: 0", size=16, color=COLORS["blue_grey_400"], weight="bold")
+
+    # Remaining Possibilities Counter
+    remaining_text = ft.Text(f"剩餘可能: {candidates.count}", size=16, color=COLORS["blue_grey_400"], weight="bold")
+    consistent_only = ft.Checkbox(label="只顯示可能答案", value=False, label_style=ft.TextStyle(color=COLORS["blue_grey_400"]))
+    # Franchise mode: any season / side story of the answer counts (franchise.py).
+    # Hidden until the data has franchise groups (enrich_data.py): it would do nothing.
+    franchise_toggle = ft.Checkbox(label="系列模式", value=session.franchise_mode, tooltip="猜中同系列的任一季即算答對",
+                                   visible=any(a.franchise_id != a.id for a in anime_list),
+                                   label_style=ft.TextStyle(color=COLORS["blue_grey_400"]))
     
     # Header Grid (Labels)
     headers = ["🖼️", "🎬 動漫", "🏢 工作室", "🏷️ 類型", "📅 年份", "📺 集數", "👥 受眾", "📖 來源"]
@@ -210,25 +162,74 @@ def main(page: ft.Page):
     win_overlay = None
 
     def restart_game(e):
-        nonlocal target, guesses, game_over, win_overlay, penalty_count
-        target = get_random_anime(anime_list)
-        guesses = []
-        game_over = False
-        unlocked_hints.clear()
-        revealed_tag_indices.clear()
-        penalty_count = 0
+        nonlocal win_overlay
+        session.franchise_mode = candidates.franchise_mode = franchise_toggle.value
+        session.reset(get_random_anime(anime_list))
+        candidates.reset()
+        reset_hint_panel()
+        prefetcher.pin(hint_cover_url(session.target))
         
-        guesses_column.controls.clear()
+        guesses_view.controls.clear()
+        resize_guesses_view()
         input_field.disabled = False
         input_field.value = ""
         update_attempts_text()
+        save_session()
         # input_field.focus() # Removed to avoid RuntimeWarning
         
         if win_overlay and win_overlay in page.overlay:
             page.overlay.remove(win_overlay)
         
         page.update()
-        print(f"New Target is: {target.name_cn}")
+        print(f"New Target is: {session.target.name_cn}")
+
+    def on_mode_change(e):
+        # Switching mid-game would change rows already on screen: wait for the next game
+        if session.guesses:
+            page.snack_bar = ft.SnackBar(ft.Text("系列模式將在下一局生效"))
+            page.snack_bar.open = True
+            page.update()
+            return
+        session.franchise_mode = candidates.franchise_mode = franchise_toggle.value
+        save_session()
+
+    franchise_toggle.on_change = on_mode_change
+
+    def give_up(e):
+        if session.game_over: return
+        if not session.attempts:
+            restart_game(e)  # Nothing played yet: just draw another target
+            return
+        session.give_up()
+        record_game()  # Counts as a loss (resets the streak)
+        save_session()  # Finished games are removed from storage
+        input_field.disabled = True
+        close_menu()
+        show_loss_dialog(session.target)
+
+    def stats_panel():
+        """Player record, attempts histogram over won games and hint usage."""
+        rows = [ft.Text(
+            f"已玩 {stats.games} 場 · 勝率 {stats.win_rate:.0%} · "
+            f"連勝 {stats.current_streak} (最高 {stats.best_streak}) · 平均 {stats.average_attempts:.1f} 次",
+            size=14, color=COLORS["blue_grey_200"],
+        )]
+        # Buckets up to the last one with a win; this game's bucket in amber
+        used = [i for i, count in enumerate(stats.histogram) if count]
+        peak = max(stats.histogram) or 1
+        current = bisect.bisect_left(HISTOGRAM_BOUNDS, session.attempts) if session.won else -1
+        for i, label in enumerate(histogram_labels()[:used[-1] + 1] if used else []):
+            count = stats.histogram[i]
+            rows.append(ft.Row([
+                ft.Text(label, width=40, size=12, text_align="right", color=COLORS["blue_grey_400"]),
+                ft.Container(width=max(2, 200 * count // peak), height=12, border_radius=2,
+                             bgcolor=COLORS["amber_600"] if i == current else COLORS["green_600"]),
+                ft.Text(str(count), size=12),
+            ], spacing=6))
+        hints = " · ".join(f"LV{level} {stats.hint_uses[level]}" for level in HINT_COSTS)
+        rows.append(ft.Text(f"提示使用：{hints} (用過提示 {stats.games_with_hints} 場)",
+                            size=12, color=COLORS["blue_grey_400"]))
+        return ft.Column(rows, spacing=2, tight=True, horizontal_alignment=ft.CrossAxisAlignment.CENTER)
 
     def show_loss_dialog(anime: Anime):
         nonlocal win_overlay
@@ -240,12 +241,14 @@ def main(page: ft.Page):
                 content=ft.Column([
                     ft.Text("💀 遊戲結束", size=24, weight="bold", color=COLORS["red_600"]),
                     ft.Divider(),
-                    ft.Text("很遺憾，次數用盡了...", size=16),
+                    ft.Text("很遺憾，這局放棄了...", size=16),
                     ft.Container(height=10),
                     ft.Text(f"正確答案是：", size=14, color=COLORS["blue_grey_400"]),
                     ft.Text(f"{anime.name_cn}", size=22, weight="bold", color="white"),
                     ft.Text(f"{anime.name_en}", size=14, italic=True, color=COLORS["blue_grey_200"]),
                     ft.Divider(),
+                    stats_panel(),
+                    ft.Divider(),
                     ft.FilledButton("再試一次", on_click=restart_game, style=ft.ButtonStyle(bgcolor=COLORS["blue_grey_700"], color="white")),
                 ], tight=True, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
             ),
@@ -275,7 +278,8 @@ def main(page: ft.Page):
                     ft.Text("🎉 恭喜答對！", size=24, weight="bold", color=COLORS["green_600"]),
                     ft.Divider(),
                     ft.Text(f"正確答案：{anime.name_cn}", size=20, weight="bold"),
-                    ft.Text(f"總共猜測次數：{len(guesses) + penalty_count}", size=18, weight="bold", color="amber"),
+                    ft.Text(f"總共猜測次數：{session.attempts}", size=18, weight="bold", color="amber"),
+                    stats_panel(),
                     ft.Text(f"英文名稱：{anime.name_en}"),
                     ft.Divider(),
                     ft.Text(f"工作室：{anime.studio}"),
@@ -301,240 +305,205 @@ def main(page: ft.Page):
         page.update()
 
     # --- Hint System Logic ---
-    unlocked_hints = set()
-    revealed_tag_indices = set()
-    penalty_count = 0
-    
     def update_attempts_text():
-        total = len(guesses) + penalty_count
-        attempts_text.value = f"猜測次數: {total}"
+        attempts_text.value = f"猜測次數: {session.attempts}"
+        remaining_text.value = f"剩餘可能: {candidates.count}"
         # page.update() # Called by caller usually
 
     def mask_synopsis(synopsis: str, anime: Anime) -> str:
+        # Precomputed at build time; mask on the fly only for old embedded data
+        # (the web data pack ships only the masked text)
+        if anime.masked_synopsis:
+            return anime.masked_synopsis
         if not synopsis: return "無簡介資料"
-        masked = synopsis
-        # Mask Titles (Simple replacement)
-        titles = [anime.name_cn, anime.name_en, anime.name_cn.replace("：", ":")] 
-        for title in titles:
-            if title and title != "Unknown":
-                masked = masked.replace(title, "[***]")
-        return masked
-
-    def create_hint_content():
-        rows = [
+        return mask_titles(synopsis, anime.name_cn, anime.name_en, anime.name_jp)
+
+    # --- Hint Panel (built once, mutated in place) ---
+    # Only the slot that changed is re-sent to the client (control.update()),
+    # and only while the dialog is actually on screen.
+    hint_open = False
+    hint_tag_indices = []  # Sorted tag indices currently shown as chips
+
+    def hint_button(label: str, level: int):
+        return ft.FilledButton(
+            label,
+            on_click=lambda e: unlock_hint(level),
+            style=ft.ButtonStyle(bgcolor=COLORS["blue_grey_700"], color="white")
+        )
+
+    hint_tags_row = ft.Row(wrap=True, spacing=5)
+    hint_l1_action = ft.Container()
+    hint_l2_slot = ft.Container()
+    hint_l3_slot = ft.Container()
+
+    hint_content = ft.Container(
+        content=ft.Column([
             ft.Text("💡 提示系統", size=20, weight="bold", color="white"),
             ft.Divider(),
-        ]
+            ft.Text("LV 1", weight="bold"),
+            ft.Column([hint_tags_row, hint_l1_action], spacing=5),
+            ft.Divider(),
+            ft.Text("LV 2", weight="bold"),
+            hint_l2_slot,
+            ft.Divider(),
+            ft.Text("LV 3", weight="bold"),
+            hint_l3_slot,
+        ], width=400, spacing=10, tight=True),
+        padding=10
+    )
 
-        # LV1: Tags (Multi-unlock)
-        # LV1: Tags (Multi-unlock)
-        candidates = target.genres # Use genres strictly to match game grid
-        candidates = list(candidates) if candidates else []
-        
-        # Calculate indices of tags that correspond to already guessed anime
-        known_tag_indices = set()
-        for i, tag in enumerate(candidates):
-            # Check if this tag has appeared in any valid guess
-            # (In the game, if a tag matches, it's green. So user knows it.)
-            # But the game logic for 'match' is: if guess.genres matches target.genres
-            # Actually, `create_tags_cell` highlights MATCHING tags.
-            # So if any guess has this tag, the user knows this tag is correct.
-            for g in guesses:
-                guess_tags = g.genres # Strictly use genres (what user sees)
-                if tag in guess_tags:
-                    known_tag_indices.add(i)
-                    break
-        
-        # Total revealed = Paid Hints + Guessed Logic
-        all_revealed_indices = revealed_tag_indices.union(known_tag_indices)
-        
-        l1_content = ft.Column(spacing=5)
-        
-        # Display All Revealed Tags (Paid + Guessed)
-        if all_revealed_indices:
-            tags_row = ft.Row(wrap=True, spacing=5)
-            for idx in sorted(list(all_revealed_indices)):
-                if idx < len(candidates):
-                    is_paid = idx in revealed_tag_indices
-                    tags_row.controls.append(
-                        ft.Container(
-                            content=ft.Text(candidates[idx], size=14, color="white"),
-                            padding=5, 
-                            # Amber for paid hint, Green for guessed (as requested)
-                            bgcolor=COLORS["amber_600"] if is_paid else COLORS["green_600"],
-                            border_radius=4,
-                            border=None # Solid color is enough
-                        )
-                    )
-            l1_content.controls.append(tags_row)
-            
-        # Unlock Button (If more available)
+    def push_hint(*controls):
+        if hint_open:
+            for c in controls:
+                c.update()
+
+    def refresh_l1_action():
         # Available to unlock = Total - (Paid + Guessed)
-        if len(all_revealed_indices) < len(candidates):
-            remaining = len(candidates) - len(all_revealed_indices)
-            l1_content.controls.append(
-                 ft.FilledButton(
-                    f"解鎖標籤 (剩餘 {remaining} 個) (+2 猜測)", 
-                    on_click=lambda e: unlock_hint(1, 2),
-                    style=ft.ButtonStyle(bgcolor=COLORS["blue_grey_700"], color="white")
-                )
-            )
-        elif not candidates:
-             l1_content.controls.append(ft.Text("無可用標籤", color=COLORS["blue_grey_400"]))
+        remaining = session.remaining_tag_count()
+        if remaining > 0:
+            hint_l1_action.content = hint_button(f"解鎖標籤 (剩餘 {remaining} 個) (+{HINT_COSTS[1]} 猜測)", 1)
+        elif not session.hint_tags:
+            hint_l1_action.content = ft.Text("無可用標籤", color=COLORS["blue_grey_400"])
         else:
-             l1_content.controls.append(ft.Text("✅ 已顯示所有標籤", color=COLORS["green_600"], size=12))
-
-        rows.extend([ft.Text("LV 1", weight="bold"), l1_content, ft.Divider()])
-
-        # LV2: Blurred Image
-        l2_content = None
-        if 2 in unlocked_hints:
-            # Stack with Image and Blur Container
-            l2_content = ft.Stack([
-                ft.Image(src=target.image_url, width=150, height=210, fit="cover", border_radius=5),
-                ft.Container(
-                    width=150, height=210,
-                    blur=ft.Blur(5, 5), # Reduce blur intensity
-                    bgcolor="#03FFFFFF"
-                )
-            ], width=150, height=210)
-        else:
-            l2_content = ft.FilledButton(
-                "解鎖 LV2: 模糊封面 (+5 猜測)", 
-                on_click=lambda e: unlock_hint(2, 5),
-                style=ft.ButtonStyle(bgcolor=COLORS["blue_grey_700"], color="white")
-            )
-        rows.extend([ft.Text("LV 2", weight="bold"), l2_content, ft.Divider()])
+            hint_l1_action.content = ft.Text("✅ 已顯示所有標籤", color=COLORS["green_600"], size=12)
+
+    def add_hint_tag(idx: int, is_paid: bool):
+        # Keep chips in tag order, as the full rebuild used to
+        pos = bisect.bisect_left(hint_tag_indices, idx)
+        hint_tag_indices.insert(pos, idx)
+        hint_tags_row.controls.insert(pos, ft.Container(
+            content=ft.Text(session.hint_tags[idx], size=14, color="white"),
+            padding=5,
+            # Amber for paid hint, Green for guessed (as requested)
+            bgcolor=COLORS["amber_600"] if is_paid else COLORS["green_600"],
+            border_radius=4,
+        ))
+
+    def show_blurred_cover():
+        # Pre-blurred asset: no client-side blur filter needed
+        if session.target.blur_url:
+            hint_l2_slot.content = ft.Image(src=session.target.blur_url, width=150, height=210, fit="cover", border_radius=5)
+            return
 
-        # LV3: Synopsis
-        l3_content = None
-        if 3 in unlocked_hints:
-            l3_content = ft.Container(
-                content=ft.Column([
-                    ft.Text("劇情簡介:", size=14, color=COLORS["blue_grey_400"]),
-                    ft.Text(mask_synopsis(target.synopsis, target), size=14, selectable=True),
-                ], scroll=ft.ScrollMode.AUTO, height=150),
-                padding=10, border=ft.Border.all(1, COLORS["blue_grey_700"]), border_radius=5,
-                bgcolor=COLORS["blue_grey_800"]
-            )
-        else:
-            l3_content = ft.FilledButton(
-                "解鎖 LV3: 劇情簡介 (+10 猜測)", 
-                on_click=lambda e: unlock_hint(3, 10),
-                style=ft.ButtonStyle(bgcolor=COLORS["blue_grey_700"], color="white")
+        # Stack with Image and Blur Container
+        hint_l2_slot.content = ft.Stack([
+            ft.Image(src=session.target.image_url, width=150, height=210, fit="cover", border_radius=5),
+            ft.Container(
+                width=150, height=210,
+                blur=ft.Blur(5, 5), # Reduce blur intensity
+                bgcolor="#03FFFFFF"
             )
-        rows.extend([ft.Text("LV 3", weight="bold"), l3_content])
-
-        return ft.Container(
-            content=ft.Column(rows, width=400, spacing=10, tight=True),
-            padding=10
+        ], width=150, height=210)
+
+    def show_synopsis():
+        target = session.target
+        hint_l3_slot.content = ft.Container(
+            content=ft.Column([
+                ft.Text("劇情簡介:", size=14, color=COLORS["blue_grey_400"]),
+                ft.Text(mask_synopsis(target.synopsis, target), size=14, selectable=True),
+            ], scroll=ft.ScrollMode.AUTO, height=150),
+            padding=10, border=ft.Border.all(1, COLORS["blue_grey_700"]), border_radius=5,
+            bgcolor=COLORS["blue_grey_800"]
         )
 
-    hint_overlay = None
+    def reset_hint_panel():
+        """Called once per game: bring every slot back to its locked state."""
+        hint_tag_indices.clear()
+        hint_tags_row.controls.clear()
+        refresh_l1_action()
+        hint_l2_slot.content = hint_button(f"解鎖 LV2: 模糊封面 (+{HINT_COSTS[2]} 猜測)", 2)
+        hint_l3_slot.content = hint_button(f"解鎖 LV3: 劇情簡介 (+{HINT_COSTS[3]} 猜測)", 3)
+
+    reset_hint_panel()
 
     def close_hint_overlay(e=None):
-        nonlocal hint_overlay
-        if hint_overlay and hint_overlay in page.overlay:
+        nonlocal hint_open
+        if hint_open:
             page.overlay.remove(hint_overlay)
-            hint_overlay = None
+            hint_open = False
             page.update()
 
-    def open_hint_dialog(e):
-        nonlocal hint_overlay
-        content = create_hint_content()
-        
-        # Wrap content in a card style container
-        dialog_card = ft.Container(
-            content=content,
-            bgcolor=COLORS["blue_grey_900"],
-            padding=20,
-            border_radius=10,
-            border=ft.Border.all(1, COLORS["blue_grey_700"]),
-            width=400,
-            shadow=ft.BoxShadow(
-                blur_radius=20,
-                color="#80000000"
-            ),
-            on_click=lambda e: None # Trap clicks
-        )
+    # Wrap content in a card style container
+    dialog_card = ft.Container(
+        content=hint_content,
+        bgcolor=COLORS["blue_grey_900"],
+        padding=20,
+        border_radius=10,
+        border=ft.Border.all(1, COLORS["blue_grey_700"]),
+        width=400,
+        shadow=ft.BoxShadow(
+            blur_radius=20,
+            color="#80000000"
+        ),
+        on_click=lambda e: None # Trap clicks
+    )
 
-        hint_overlay = ft.Container(
-            content=dialog_card,
-            bgcolor="#B3000000",
-            alignment=ft.Alignment(0, 0),
-            left=0, top=0, right=0, bottom=0,
-            on_click=close_hint_overlay, # Click outside to close
-        )
-        
+    hint_overlay = ft.Container(
+        content=dialog_card,
+        bgcolor="#B3000000",
+        alignment=ft.Alignment(0, 0),
+        left=0, top=0, right=0, bottom=0,
+        on_click=close_hint_overlay, # Click outside to close
+    )
+
+    def open_hint_dialog(e):
+        nonlocal hint_open
+        if hint_open: return
+        hint_open = True
         page.overlay.append(hint_overlay)
         page.update()
 
-    def unlock_hint(level, cost):
-        nonlocal penalty_count, hint_overlay
-        
-        updated = False
-        
+    def unlock_hint(level):
+        # Engine picks the tag / charges the penalty; False if nothing left to unlock
+        if not session.unlock_hint(level):
+            return
+
+        update_attempts_text()
+        save_session()
         if level == 1:
-            # Multi-unlock logic for tags
-            candidates = target.genres # Use genres strictly
-            candidates = list(candidates) if candidates else []
-            
-            # Recalculate known tags to ensure we don't unlock something user just guessed
-            known_tag_indices = set()
-            for i, tag in enumerate(candidates):
-                for g in guesses:
-                    guess_tags = g.genres # Strictly use genres
-                    if tag in guess_tags:
-                        known_tag_indices.add(i)
-                        break
-            
-            # Available = Not Revealed AND Not Known
-            available = [i for i in range(len(candidates)) 
-                         if i not in revealed_tag_indices and i not in known_tag_indices]
-            
-            if available:
-                # Pick one random
-                idx = random.choice(available)
-                revealed_tag_indices.add(idx)
-                penalty_count += cost
-                updated = True
-        
-        elif level not in unlocked_hints:
-            unlocked_hints.add(level)
-            penalty_count += cost
-            updated = True
-            
-        if updated:
-            update_attempts_text()
-            
-            # Refresh overlay content if open
-            if hint_overlay:
-                # The content of overlay is the container, its content is the card
-                # Card content is the hint content
-                # Structure: hint_overlay -> dialog_card -> create_hint_content()
-                dialog_card = hint_overlay.content
-                dialog_card.content = create_hint_content()
-                page.update()
+            add_hint_tag(session.last_unlocked_tag, is_paid=True)
+            refresh_l1_action()
+            push_hint(hint_tags_row, hint_l1_action)
+        elif level == 2:
+            show_blurred_cover()
+            push_hint(hint_l2_slot)
+        else:
+            show_synopsis()
+            push_hint(hint_l3_slot)
+        attempts_text.update()
 
     def process_guess(anime: Anime):
-        nonlocal game_over
-        if game_over: return
+        if session.game_over: return
         
-        guesses_column.controls.insert(0, build_guess_row(anime, target))
-        guesses.append(anime)
+        feedback = session.guess(anime)
+        candidates.apply(anime, feedback)
+        guesses_view.controls.insert(0, build_guess_row(anime, feedback))
+        resize_guesses_view()
+
+        # Tags this guess turned green become known hints (no rescan of old guesses)
+        for idx in session.new_known_tags:
+            if idx not in session.revealed_tag_indices:
+                add_hint_tag(idx, is_paid=False)
+        if session.new_known_tags:
+            refresh_l1_action()
         
         # Update attempts
         update_attempts_text()
+        save_session()
 
         input_field.value = ""
         close_menu()
 
-        if anime.id == target.id:
-            game_over = True
+        if session.won:
+            record_game()
             input_field.disabled = True
             show_win_dialog(anime) # Handles its own update
         else:
-            page.update()
+            # Only the controls this guess touched
+            guesses_view.update()
+            attempts_text.update()
+            remaining_text.update()
+            input_field.update()
 
     pending_anime = None
 
@@ -542,7 +511,7 @@ def main(page: ft.Page):
         nonlocal pending_anime
         """Step 1: Fill input and store selection (Don't submit yet)"""
         anime = e.control.data
-        if anime in guesses:
+        if session.has_guessed(anime):
              page.snack_bar = ft.SnackBar(ft.Text(f"您已經猜過 {anime.name_cn} 了！"))
              page.snack_bar.open = True
              page.update()
@@ -567,10 +536,10 @@ def main(page: ft.Page):
             match = pending_anime
         else:
             # Priority 2: Fallback to name search
-            match = next((a for a in anime_list if a.name_cn.lower() == val.lower() or a.name_en.lower() == val.lower()), None)
+            match = search_index.find_exact(val)
         
         if match:
-            if match in guesses:
+            if session.has_guessed(match):
                 page.snack_bar = ft.SnackBar(ft.Text(f"您已經猜過 {match.name_cn} 了！"))
                 page.snack_bar.open = True
                 page.update()
@@ -589,14 +558,16 @@ def main(page: ft.Page):
         val = e.control.value.lower().strip()
         if not val:
             suggestions_container.visible = False
+            prefetcher.cancel()
             page.update()
             return
 
-        matches = [
-            a for a in anime_list 
-            if (val in a.name_cn or val in a.name_en.lower())
-            and a not in guesses
-        ][:10]
+        # Seasons of one franchise are listed together; the later ones indented
+        matches = search_index.search(
+            val, limit=10,
+            accept=lambda a: not session.has_guessed(a) and (not consistent_only.value or candidates.contains(a)),
+            group=True,
+        )
 
         if matches:
             suggestions_view.controls = [
@@ -606,15 +577,19 @@ def main(page: ft.Page):
                     data=a, # Store anime object in control data
                     on_click=on_suggestion_click, # Pass async function directly
                     bgcolor=COLORS["blue_grey_900"],
-                ) for a in matches
+                    content_padding=ft.Padding.only(left=40 if i and matches[i - 1].franchise_id == a.franchise_id else 16, right=16),
+                ) for i, a in enumerate(matches)
             ]
             suggestions_view.height = min(len(matches) * 60, 300)
             suggestions_container.height = suggestions_view.height
             suggestions_container.visible = True
             dismiss_layer.visible = True
+            # Warm the covers so a picked suggestion's row shows its image immediately
+            prefetcher.prefetch(a.image_url for a in matches)
         else:
             suggestions_container.visible = False
             dismiss_layer.visible = False
+            prefetcher.cancel()
         
         page.update()
 
@@ -647,6 +622,20 @@ def main(page: ft.Page):
                 ),
                 width=110,
                 height=50,
+            ),
+            ft.FilledButton(
+                "放棄",
+                icon="flag",
+                on_click=give_up,
+                tooltip="公布答案並記為敗場",
+                style=ft.ButtonStyle(
+                    bgcolor=COLORS["blue_grey_800"],
+                    color=COLORS["red_600"],
+                    shape=ft.RoundedRectangleBorder(radius=10),
+                    padding=10,
+                ),
+                width=110,
+                height=50,
             )
         ],
         alignment=ft.MainAxisAlignment.CENTER,
@@ -669,7 +658,8 @@ def main(page: ft.Page):
     def close_menu(e=None):
         suggestions_container.visible = False
         dismiss_layer.visible = False
-        page.update()
+        suggestions_container.update()
+        dismiss_layer.update()
 
     suggestions_container = ft.Container(
         content=ft.Container(
@@ -713,22 +703,45 @@ def main(page: ft.Page):
         controls=[
             ft.Text("Anidle", size=50, weight="w900", color="pink"),
             ft.Text("猜猜今天的動漫是哪一部？", color=COLORS["blue_grey_400"]),
-            attempts_text,
+            ft.Row([attempts_text, remaining_text, consistent_only, franchise_toggle], alignment=ft.MainAxisAlignment.CENTER, spacing=20),
             ft.Divider(height=20, color="transparent"),
             ft.Container(height=60, content=input_row), # Use input_row
             ft.Divider(height=20, color="transparent"),
             header_row,
-            guesses_column
+            guesses_view
         ],
         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
         spacing=10,
     )
 
+    def restore_view():
+        """Rebuild rows and hints of the restored game (before anything is on screen)."""
+        for anime in session.guesses:
+            feedback = compare(anime, session.target, session.franchise_mode)
+            candidates.apply(anime, feedback)
+            guesses_view.controls.insert(0, build_guess_row(anime, feedback))
+        resize_guesses_view()
+
+        for idx in session.revealed_tag_indices:
+            add_hint_tag(idx, is_paid=True)
+        for idx in session.known_tag_set - session.revealed_tag_indices:
+            add_hint_tag(idx, is_paid=False)
+        refresh_l1_action()
+        if 2 in session.unlocked_hints:
+            show_blurred_cover()
+        if 3 in session.unlocked_hints:
+            show_synopsis()
+        update_attempts_text()
+
+    if restored is not None:
+        restore_view()
+
     # Root Stack
     # Root Layout: Just the main content in the stack/column
     # The overlay handle suggestions automatically
     page.overlay.append(dismiss_layer) # Add layer first (behind)
     page.overlay.append(suggestions_container) # Add menu on top
+    page.overlay.append(prefetcher.control) # Invisible cover prefetch slots
 
     page.add(
         ft.Stack(
@@ -740,5 +753,7 @@ def main(page: ft.Page):
         )
     )
 
+    prefetcher.pin(hint_cover_url(session.target))
+
 if __name__ == "__main__":
-    ft.app(target=main)
+    ft.app(target=main, assets_dir="assets")
@@ -0,0 +1,329 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from build_bundle import find_runtime_modules
+from cassette import CASSETTE_DIR
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+STATE_PATH = 'build/pipeline_state.json'   # Input fingerprints of the last successful run per stage
+LOG_DIR = 'build/pipeline_logs'            # One log per stage (stages run side by side)
+MAX_PARALLEL = 4
+LOG_TAIL_LINES = 15                        # Shown when a stage fails
+SEED_DIR = 'fixtures/seed'                 # Starting files for --record / --offline runs
+OFFLINE_ROOT = 'build/pipeline_offline'    # Scratch copy of the project files the stages touch
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RAW = 'data/rawAnime.json'
+CN_TITLES = 'data/cn_titles.json'
+CN_SYNOPSIS = 'data/cn_synopsis.json'
+SCHEDULE = 'data/daily_schedule.json'
+MASKED = 'data/masked_synopsis.json'
+IMAGE_MAP = 'data/image_map.json'
+ALIASES = 'data/aliases.json'
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    manual: bool = False   # Only runs when asked for (publishes or needs extra setup)
+
+
+# In the order they would be run by hand. Dependencies are derived from
+# the declared files: a stage waits for every earlier stage that writes
+# what it reads, writes what it writes, or reads what it writes.
+STAGES = [
+    Stage('fetch', 'fetch_data_post2000.py', outputs=[RAW]),
+    Stage('enrich', 'enrich_data.py', inputs=[RAW], outputs=[RAW]),
+    Stage('titles', 'auto_translate.py', inputs=[RAW, CN_TITLES], outputs=[CN_TITLES]),
+    Stage('synopsis', 'fetch_cn_synopsis.py', inputs=[RAW, CN_SYNOPSIS], outputs=[CN_SYNOPSIS]),
+    Stage('synopsis_missing', 'translate_missing.py', inputs=[RAW, CN_SYNOPSIS], outputs=[CN_SYNOPSIS]),
+    Stage('synopsis_jp', 'translate_jp_to_cn.py', inputs=[CN_SYNOPSIS], outputs=[CN_SYNOPSIS]),
+    Stage('schedule', 'generate_daily_schedule.py', inputs=[RAW], outputs=[SCHEDULE]),
+    Stage('masked', 'generate_masked_synopsis.py', inputs=[RAW, CN_TITLES, CN_SYNOPSIS], outputs=[MASKED]),
+    Stage('images', 'build_images.py', inputs=[RAW], outputs=[IMAGE_MAP], manual=True),
+    Stage('check_quality', 'check_data_quality.py', inputs=[RAW, CN_TITLES]),
+    Stage('check_translation', 'check_translation_status.py', inputs=[RAW, CN_SYNOPSIS]),
+    Stage('embedded', 'generate_embedded.py',
+          inputs=[RAW, CN_TITLES, CN_SYNOPSIS, SCHEDULE, MASKED, IMAGE_MAP, ALIASES], outputs=['embedded_data.py']),
+    Stage('deploy', 'deploy.py',
+          inputs=[RAW, CN_TITLES, CN_SYNOPSIS, SCHEDULE, MASKED, IMAGE_MAP, ALIASES], manual=True),
+]
+
+
+def _hash_file(h, path):
+    h.update(path.encode('utf-8') + b'\0')
+    if not os.path.exists(path):
+        h.update(b'<missing>')
+        return
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+
+
+def fingerprint(stage: Stage, root='.') -> str:
+    """Content hash of the stage's code (script + local imports) and input files."""
+    h = hashlib.sha256()
+    for name in find_runtime_modules(stage.script):
+        _hash_file(h, f"{name}.py")
+    for path in sorted(set(stage.inputs)):
+        h.update(path.encode('utf-8'))
+        _hash_file(h, os.path.join(root, path))
+    return h.hexdigest()
+
+
+def _outputs_exist(stage: Stage, root='.'):
+    return all(os.path.exists(os.path.join(root, p)) for p in stage.outputs)
+
+
+def dependencies(stages: List[Stage]) -> Dict[str, List[str]]:
+    deps = {}
+    for i, stage in enumerate(stages):
+        reads, writes = set(stage.inputs), set(stage.outputs)
+        deps[stage.name] = [
+            earlier.name for earlier in stages[:i]
+            if reads & set(earlier.outputs) or writes & set(earlier.outputs) or writes & set(earlier.inputs)
+        ]
+    return deps
+
+
+def load_state(root='.'):
+    path = os.path.join(root, STATE_PATH)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state, root='.'):
+    path = os.path.join(root, STATE_PATH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1)
+
+
+def is_up_to_date(stage: Stage, state, root='.') -> bool:
+    if not _outputs_exist(stage, root):
+        return False
+    if not stage.inputs and stage.name not in state:
+        # Source stages (API fetches) never ran under the pipeline yet: keep the existing data
+        return True
+    return state.get(stage.name) == fingerprint(stage, root)
+
+
+def stage_command(stage: Stage, cassettes=None, server=None):
+    """
+    The command for one stage. cassettes=(mode, dir) runs it through
+    cassette.py, recording or replaying its HTTP and translator calls.
+    """
+    script = os.path.join(REPO_DIR, stage.script)
+    if cassettes is None:
+        return [sys.executable, script]
+    mode, directory = cassettes
+    command = [sys.executable, os.path.join(REPO_DIR, 'cassette.py'), '--dir', directory]
+    if server:
+        command += ['--server', server]
+    return command + [mode, stage.name, script]
+
+
+def run_stage(stage: Stage, root='.', cassettes=None, server=None):
+    """Run one script in root with its output in LOG_DIR/<name>.log. Returns (ok, seconds)."""
+    log_dir = os.path.join(root, LOG_DIR)
+    os.makedirs(log_dir, exist_ok=True)
+    # Scripts use project-relative paths (data/...): run them in root, importing from the repo
+    env = dict(os.environ, PYTHONIOENCODING='utf-8', PYTHONUNBUFFERED='1', PYTHONPATH=REPO_DIR)
+    start = time.perf_counter()
+    with open(os.path.join(log_dir, f"{stage.name}.log"), 'w', encoding='utf-8') as log:
+        result = subprocess.run(stage_command(stage, cassettes, server), stdout=log, stderr=subprocess.STDOUT,
+                                stdin=subprocess.DEVNULL, env=env, cwd=root)
+    elapsed = time.perf_counter() - start
+    # Most scripts print an error and return normally, so also check that the outputs exist
+    ok = result.returncode == 0 and _outputs_exist(stage, root)
+    return ok, elapsed
+
+
+def _print_log_tail(stage: Stage, root='.'):
+    path = os.path.join(root, LOG_DIR, f"{stage.name}.log")
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = f.read().splitlines()[-LOG_TAIL_LINES:]
+    for line in lines:
+        print(f"    | {line}")
+    print(f"    (full log: {path})")
+
+
+def run_pipeline(stages: List[Stage], force=(), jobs=MAX_PARALLEL, root='.', cassettes=None, server=None):
+    """
+    Start every stage as soon as its dependencies are done, at most `jobs`
+    at a time. A stage whose fingerprint matches its last successful run
+    (and whose outputs exist) is skipped; a failed stage blocks its dependents.
+    Returns ({name: (status, seconds)}, wall seconds).
+    """
+    deps = dependencies(stages)
+    state = load_state(root)
+    results = {}
+    pending = list(stages)
+    running = {}
+    wall_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for stage in list(pending):
+                statuses = [results.get(d, (None,))[0] for d in deps[stage.name]]
+                if any(s in ('failed', 'blocked') for s in statuses):
+                    results[stage.name] = ('blocked', 0.0)
+                    print(f"  [blocked] {stage.name} (a dependency failed)")
+                elif all(s is not None for s in statuses):
+                    if stage.name not in force and is_up_to_date(stage, state, root):
+                        results[stage.name] = ('skipped', 0.0)
+                        print(f"  [skip]    {stage.name} (inputs unchanged)")
+                    elif len(running) < jobs:
+                        print(f"  [start]   {stage.name}: {stage.script}")
+                        running[pool.submit(run_stage, stage, root, cassettes, server)] = stage
+                    else:
+                        continue
+                else:
+                    continue
+                pending.remove(stage)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                ok, elapsed = future.result()
+                results[stage.name] = ('ok' if ok else 'failed', elapsed)
+                if ok:
+                    # Fingerprint after the run: stages that rewrite their own input stay skipped next time
+                    state[stage.name] = fingerprint(stage, root)
+                    save_state(state, root)
+                    print(f"  [done]    {stage.name} ({elapsed:.1f}s)")
+                else:
+                    state.pop(stage.name, None)
+                    save_state(state, root)
+                    print(f"  [FAILED]  {stage.name} ({elapsed:.1f}s)")
+                    _print_log_tail(stage, root)
+
+    return results, time.perf_counter() - wall_start
+
+
+def seed_files(stages: List[Stage]) -> List[str]:
+    """Inputs that no selected stage produces: what a run from scratch has to start with."""
+    produced = {p for s in stages for p in s.outputs}
+    return sorted({p for s in stages for p in s.inputs} - produced)
+
+
+def prepare_workspace(stages: List[Stage], snapshot: bool):
+    """
+    Fresh OFFLINE_ROOT holding only SEED_DIR, so a replay starts from the
+    same files the recording did. snapshot=True (recording) first replaces
+    SEED_DIR with the current seed files.
+    """
+    if snapshot:
+        if os.path.exists(SEED_DIR):
+            shutil.rmtree(SEED_DIR)
+        for path in seed_files(stages):
+            if os.path.exists(path):
+                os.makedirs(os.path.dirname(os.path.join(SEED_DIR, path)), exist_ok=True)
+                shutil.copy2(path, os.path.join(SEED_DIR, path))
+    if os.path.exists(OFFLINE_ROOT):
+        shutil.rmtree(OFFLINE_ROOT)
+    if os.path.exists(SEED_DIR):
+        shutil.copytree(SEED_DIR, OFFLINE_ROOT)
+    else:
+        os.makedirs(OFFLINE_ROOT)
+
+
+def print_report(stages, results, wall):
+    print(f"\n{'stage':<18} {'status':<8} {'time':>8}")
+    for stage in stages:
+        status, seconds = results[stage.name]
+        print(f"{stage.name:<18} {status:<8} {seconds:>7.1f}s")
+    serial = sum(seconds for _, seconds in results.values())
+    print(f"\nWall time {wall:.1f}s (stages add up to {serial:.1f}s run one after another)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data pipeline: only stages whose inputs changed, in parallel where possible.")
+    parser.add_argument('stages', nargs='*', help=f"stages to run (default: all but manual ones): "
+                                                  f"{', '.join(s.name for s in STAGES)}")
+    parser.add_argument('--force', nargs='*', metavar='STAGE',
+                        help="rerun these stages even if unchanged (no names: all selected stages); "
+                             "e.g. --force fetch to pull fresh data from Jikan")
+    parser.add_argument('--deploy', action='store_true', help="finish with deploy.py (builds and pushes docs/)")
+    parser.add_argument('--jobs', type=int, default=MAX_PARALLEL)
+    parser.add_argument('--dry-run', action='store_true', help="show the plan without running anything")
+    parser.add_argument('--record', action='store_true',
+                        help=f"run live from the current seed files in a scratch copy ({OFFLINE_ROOT}), "
+                             f"recording all API / translator calls to {CASSETTE_DIR}")
+    parser.add_argument('--offline', action='store_true',
+                        help="replay the recording: same scratch setup, no network, deterministic (benchmark)")
+    parser.add_argument('--stub-latency', type=float, metavar='MS',
+                        help="with --offline: replay over HTTP through stub_server.py, adding MS per request")
+    args = parser.parse_args()
+
+    names = {s.name for s in STAGES}
+    unknown = [n for n in args.stages + (args.force or []) if n not in names]
+    if unknown:
+        print(f"Unknown stage(s): {', '.join(unknown)}")
+        sys.exit(2)
+
+    if (args.record or args.offline) and args.deploy:
+        print("--deploy cannot be combined with --record / --offline.")
+        sys.exit(2)
+
+    wanted = set(args.stages) | ({'deploy'} if args.deploy else set())
+    selected = [s for s in STAGES if s.name in wanted or (not args.stages and not s.manual)]
+    if args.force is None:
+        force = set()
+    else:
+        force = set(args.force) or {s.name for s in selected}
+
+    deps = dependencies(selected)
+    if args.dry_run:
+        state = load_state()
+        for stage in selected:
+            plan = 'run (forced)' if stage.name in force else (
+                'up to date' if is_up_to_date(stage, state) else 'run')
+            after = f" after {', '.join(deps[stage.name])}" if deps[stage.name] else ''
+            print(f"  {stage.name:<18} {plan}{after}")
+        return
+
+    root, cassettes, server = '.', None, None
+    if args.record or args.offline:
+        prepare_workspace(selected, snapshot=args.record)
+        root = OFFLINE_ROOT
+        cassettes = ('record' if args.record else 'replay', os.path.abspath(CASSETTE_DIR))
+        print(f"{'Recording' if args.record else 'Replaying'} in {OFFLINE_ROOT} "
+              f"(seed: {SEED_DIR}, cassettes: {CASSETTE_DIR})")
+        if args.offline and args.stub_latency is not None:
+            from stub_server import serve
+            stub = serve(CASSETTE_DIR, port=0, latency_ms=args.stub_latency)
+            server = f"http://{stub.server_address[0]}:{stub.server_address[1]}"
+            print(f"Stub server on {server} ({args.stub_latency:g} ms per request)")
+
+    print(f"Running {len(selected)} stages (up to {args.jobs} at a time)...")
+    results, wall = run_pipeline(selected, force, args.jobs, root, cassettes, server)
+    print_report(selected, results, wall)
+    if server and stub.cassette.misses:
+        print(f"Stub server: {len(stub.cassette.misses)} request(s) were not in the cassettes.")
+    if any(status in ('failed', 'blocked') for status, _ in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
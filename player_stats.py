@@ -0,0 +1,133 @@
+import bisect
+import time
+from typing import Dict, List, Optional
+
+from game_engine import GameSession, HINT_COSTS
+
+# Config
+STATS_VERSION = 1
+HISTORY_LIMIT = 100       # Finished games kept in full (most recent)
+COMPACT_BATCH = 25        # Oldest games folded into monthly totals once the limit is passed
+MONTHS_KEPT = 24          # Monthly totals kept; all-time aggregates never drop anything
+# Histogram buckets by attempts (guesses + hint penalty): 1, 2, ..., 8, 9-10, 11-15, 16-20, 21-30, 31+
+HISTOGRAM_BOUNDS = [1, 2, 3, 4, 5, 6, 7, 8, 10, 15, 20, 30]
+
+
+def histogram_labels() -> List[str]:
+    labels, low = [], 1
+    for high in HISTOGRAM_BOUNDS:
+        labels.append(str(high) if high == low else f"{low}-{high}")
+        low = high + 1
+    labels.append(f"{low}+")
+    return labels
+
+
+class PlayerStats:
+    """
+    All-time statistics over finished games. Every aggregate (win rate,
+    streaks, attempt histogram, hint usage) is updated in O(1) by record();
+    nothing is recomputed from the history, so the history itself can be
+    compacted: only the latest HISTORY_LIMIT games are kept in full, older
+    ones survive as per-month totals.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.current_streak = 0
+        self.best_streak = 0
+        self.win_attempts = 0           # Sum of attempts over won games
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)  # Won games by attempts
+        self.hint_uses = {level: 0 for level in HINT_COSTS}  # LV1 counts every tag bought
+        self.games_with_hints = 0
+        self.history: List[List[int]] = []  # [timestamp, target id, won, attempts, guesses, hint bits]
+        self.monthly: Dict[str, List[int]] = {}  # "YYYY-MM" -> [games, wins, win attempts]
+
+    # --- Recording ---
+
+    def record(self, session: GameSession, timestamp: Optional[int] = None):
+        """Add one finished (or abandoned) game."""
+        won = session.won
+        attempts = session.attempts
+        self.games += 1
+        if won:
+            self.wins += 1
+            self.current_streak += 1
+            self.best_streak = max(self.best_streak, self.current_streak)
+            self.win_attempts += attempts
+            self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS, attempts)] += 1
+        else:
+            self.current_streak = 0
+
+        tags_bought = len(session.revealed_tag_indices)
+        self.hint_uses[1] += tags_bought
+        for level in session.unlocked_hints:
+            self.hint_uses[level] += 1
+        if tags_bought or session.unlocked_hints:
+            self.games_with_hints += 1
+
+        hint_bits = sum(1 << (level - 1) for level in session.unlocked_hints)
+        when = int(time.time()) if timestamp is None else timestamp
+        self.history.append([when, session.target.id, int(won), attempts, len(session.guesses), hint_bits])
+        if len(self.history) > HISTORY_LIMIT:
+            self._compact()
+
+    def _compact(self):
+        """Fold the oldest COMPACT_BATCH games into monthly totals (amortized O(1) per game)."""
+        old, self.history = self.history[:COMPACT_BATCH], self.history[COMPACT_BATCH:]
+        for when, _, won, attempts, _, _ in old:
+            month = time.strftime("%Y-%m", time.gmtime(when))
+            totals = self.monthly.setdefault(month, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += won
+            totals[2] += attempts if won else 0
+        if len(self.monthly) > MONTHS_KEPT:
+            for month in sorted(self.monthly)[:-MONTHS_KEPT]:
+                del self.monthly[month]
+
+    # --- Aggregates ---
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def average_attempts(self) -> float:
+        """Mean attempts over won games."""
+        return self.win_attempts / self.wins if self.wins else 0.0
+
+    # --- Serialization ---
+
+    def to_dict(self) -> Dict:
+        return {
+            "v": STATS_VERSION,
+            "games": self.games,
+            "wins": self.wins,
+            "streak": self.current_streak,
+            "best": self.best_streak,
+            "win_attempts": self.win_attempts,
+            "hist": self.histogram,
+            "hints": {str(k): v for k, v in self.hint_uses.items()},
+            "hint_games": self.games_with_hints,
+            "history": self.history,
+            "monthly": self.monthly,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PlayerStats":
+        if data.get("v") != STATS_VERSION:
+            raise ValueError(f"Unsupported stats version: {data.get('v')}")
+        if len(data["hist"]) != len(HISTOGRAM_BOUNDS) + 1:
+            raise ValueError("Histogram buckets changed")
+        stats = cls()
+        stats.games = data["games"]
+        stats.wins = data["wins"]
+        stats.current_streak = data["streak"]
+        stats.best_streak = data["best"]
+        stats.win_attempts = data["win_attempts"]
+        stats.histogram = list(data["hist"])
+        stats.hint_uses.update({int(k): v for k, v in data["hints"].items()})
+        stats.games_with_hints = data["hint_games"]
+        stats.history = [list(r) for r in data["history"]]
+        stats.monthly = {k: list(v) for k, v in data["monthly"].items()}
+        return stats
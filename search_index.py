@@ -0,0 +1,249 @@
+import re
+import time
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+
+from anime_data import Anime
+from synopsis_masking import title_aliases
+
+# Config
+MAX_VERIFY = 300          # Fuzzy candidates checked with edit distance per query
+LATENCY_BUDGET_MS = 15    # Stop verifying candidates after this long (per keystroke)
+PREFIX_TABLE_LEN = 4      # Queries up to this many characters are answered from the prefix table
+PREFIX_TOP_K = 30         # Titles kept per prefix (more than shown, so filtered ones can be skipped)
+
+# Score bands (higher is better); fuzzy hits always rank below literal ones
+SCORE_EXACT = 1000
+SCORE_PREFIX = 800
+SCORE_SUBSTRING = 600
+SCORE_FUZZY = 400
+# Popularity prior: up to this many points by MAL score rank. Kept well
+# below the gap between bands so it only reorders titles of equal match quality.
+PRIOR_WEIGHT = 10
+LENGTH_PENALTY = 1.0      # Per character of the matched title; shorter (base) titles first
+MAX_PENALIZED_LEN = 80    # Caps the length penalty so it never crosses a band
+
+_STRIP_RE = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """Width/case folding, katakana -> hiragana, punctuation and spaces removed."""
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = ''.join(chr(ord(c) - 0x60) if 'ァ' <= c <= 'ヶ' else c for c in text)
+    return _STRIP_RE.sub('', text)
+
+
+def _bigrams(text: str) -> set:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def max_typos(query: str) -> int:
+    """Edit-distance bound: none for very short queries, at most 2 for long Latin ones."""
+    if len(query) < 4:
+        return 0
+    if query.isascii():
+        return 1 if len(query) < 8 else 2
+    return 1  # CJK characters carry more information each
+
+
+def substring_distance(pattern: str, text: str, limit: int) -> int:
+    """
+    Smallest edit distance (adjacent swaps count as one edit) between
+    pattern and any substring of text (Sellers' algorithm); returns
+    limit + 1 as soon as it is exceeded.
+    """
+    prev2 = None
+    prev = [0] * (len(text) + 1)  # Match may start anywhere in text
+    for i, pc in enumerate(pattern, 1):
+        cur = [i] + [0] * len(text)
+        best = i
+        for j, tc in enumerate(text, 1):
+            v = prev[j - 1] + (pc != tc)
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            if prev2 and j > 1 and pc == text[j - 2] and pattern[i - 2] == tc and prev2[j - 2] + 1 < v:
+                v = prev2[j - 2] + 1
+            cur[j] = v
+            if v < best:
+                best = v
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return min(prev)
+
+
+def group_franchises(results: List[Anime]) -> List[Anime]:
+    """Stable regroup: each franchise's titles follow its best-ranked one."""
+    groups: Dict[int, List[Anime]] = {}
+    for anime in results:
+        groups.setdefault(anime.franchise_id, []).append(anime)
+    return [anime for members in groups.values() for anime in members]
+
+
+class SearchIndex:
+    """
+    Ranked, typo-tolerant title search over CN / EN / JP titles, derived
+    aliases (season markers stripped, franchise prefix) and the manual
+    alias table. Literal matches come from a scan of normalized keys;
+    typos are found through a bigram inverted index and verified with a
+    bounded edit distance.
+
+    Titles are ranked by match quality plus a popularity prior. Short
+    queries (the first few keystrokes, where the most titles match) are
+    answered from a precomputed top-k table per prefix.
+    """
+
+    def __init__(self, anime_list: List[Anime], aliases: Optional[Dict[str, List[str]]] = None):
+        self.anime_list = anime_list
+        self.keys: List[str] = []       # Normalized search strings
+        self.key_owner: List[int] = []  # key index -> anime_list index
+        self.key_len: List[int] = []    # Length the key is ranked by (see below)
+        self.postings: Dict[str, List[int]] = {}
+        self.exact: Dict[str, Anime] = {}
+        self.prior = self._popularity_prior(anime_list)
+
+        aliases = aliases or {}
+        for i, a in enumerate(anime_list):
+            # Key -> length it ranks by. Derived aliases ("鬼滅之刃" from a sequel
+            # title) keep the length of the name they came from, so the base
+            # entry wins over its sequels.
+            ranked: Dict[str, int] = {}
+            for name in (a.name_cn, a.name_en, a.name_jp):
+                full = len(normalize(name))
+                for alias in title_aliases(name):
+                    key = normalize(alias)
+                    if key and full < ranked.get(key, full + 1):
+                        ranked[key] = full
+            for name in (a.name_cn, a.name_en, a.name_jp, *aliases.get(str(a.id), [])):
+                key = normalize(name)
+                if key:
+                    ranked[key] = len(key)
+            for key, key_len in ranked.items():
+                k = len(self.keys)
+                self.keys.append(key)
+                self.key_owner.append(i)
+                self.key_len.append(min(key_len, MAX_PENALIZED_LEN))
+                for gram in _bigrams(key):
+                    self.postings.setdefault(gram, []).append(k)
+            # Submit-by-name lookup keeps the old rule: full CN or EN title, any case
+            for name in (a.name_cn, a.name_en):
+                self.exact.setdefault(name.lower(), a)
+
+        self.prefix_top: Dict[str, List[Tuple[float, int]]] = self._build_prefix_table()
+
+    @staticmethod
+    def _popularity_prior(anime_list: List[Anime]) -> List[float]:
+        """0..PRIOR_WEIGHT by score rank (ranks, since MAL scores sit in a narrow band)."""
+        order = sorted(range(len(anime_list)), key=lambda i: anime_list[i].score)
+        prior = [0.0] * len(anime_list)
+        span = max(1, len(order) - 1)
+        for rank, i in enumerate(order):
+            prior[i] = PRIOR_WEIGHT * rank / span
+        return prior
+
+    def _literal_score(self, k: int, pos: int, exact: bool) -> float:
+        owner = self.key_owner[k]
+        quality = self.prior[owner] - self.key_len[k] * LENGTH_PENALTY
+        if exact:
+            return SCORE_EXACT + quality
+        if pos == 0:
+            return SCORE_PREFIX + quality
+        return SCORE_SUBSTRING - min(pos, MAX_PENALIZED_LEN) + quality
+
+    def _build_prefix_table(self) -> Dict[str, List[Tuple[float, int]]]:
+        """prefix -> best (score, anime index) pairs for every key prefix up to PREFIX_TABLE_LEN."""
+        best: Dict[str, Dict[int, float]] = {}
+        for k, key in enumerate(self.keys):
+            owner = self.key_owner[k]
+            for n in range(1, min(len(key), PREFIX_TABLE_LEN) + 1):
+                p = key[:n]
+                score = self._literal_score(k, 0, n == len(key))
+                owners = best.setdefault(p, {})
+                if score > owners.get(owner, -1):
+                    owners[owner] = score
+        return {
+            p: sorted(((sc, i) for i, sc in owners.items()), key=lambda t: (-t[0], t[1]))[:PREFIX_TOP_K]
+            for p, owners in best.items()
+        }
+
+    def find_exact(self, text: str) -> Optional[Anime]:
+        return self.exact.get(text.strip().lower())
+
+    def search(self, query: str, limit: int = 10,
+               accept: Optional[Callable[[Anime], bool]] = None,
+               budget_ms: float = LATENCY_BUDGET_MS, group: bool = False) -> List[Anime]:
+        """
+        Best `limit` titles for query, most relevant first. With group,
+        seasons of one franchise are listed together (see group_franchises).
+        """
+        q = normalize(query)
+        if not q:
+            return []
+
+        # Fast path: every prefix hit outranks every substring / fuzzy hit,
+        # so if enough accepted titles are in the table, the answer is exact.
+        top = self.prefix_top.get(q) if len(q) <= PREFIX_TABLE_LEN else None
+        if top:
+            results = []
+            for _, i in top:
+                anime = self.anime_list[i]
+                if accept is None or accept(anime):
+                    results.append(anime)
+                    if len(results) >= limit:
+                        return group_franchises(results) if group else results
+
+        scores = self.score_all(q, budget_ms)
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        results = []
+        for i, _ in ranked:
+            anime = self.anime_list[i]
+            if accept is None or accept(anime):
+                results.append(anime)
+                if len(results) >= limit:
+                    break
+        return group_franchises(results) if group else results
+
+    def score_all(self, q: str, budget_ms: float = LATENCY_BUDGET_MS) -> Dict[int, float]:
+        """anime_list index -> match score, for a normalized query."""
+        scores: Dict[int, float] = {}
+
+        def offer(owner, score):
+            if score > scores.get(owner, -1):
+                scores[owner] = score
+
+        # 1. Literal matches (exact > prefix > earlier substring, shorter key first, then popularity)
+        for k, key in enumerate(self.keys):
+            pos = key.find(q)
+            if pos < 0:
+                continue
+            offer(self.key_owner[k], self._literal_score(k, pos, key == q))
+
+        # 2. Typos: keys sharing enough bigrams, verified by edit distance
+        limit = max_typos(q)
+        if limit == 0:
+            return scores
+        grams = _bigrams(q)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for k in self.postings.get(gram, ()):
+                shared[k] = shared.get(k, 0) + 1
+        # Each edit destroys at most two bigrams
+        need = max(1, len(grams) - 2 * limit)
+        candidates = sorted((k for k, n in shared.items() if n >= need), key=lambda k: -shared[k])
+
+        deadline = time.perf_counter() + budget_ms / 1000
+        for n, k in enumerate(candidates[:MAX_VERIFY]):
+            if n % 16 == 0 and time.perf_counter() > deadline:
+                break
+            owner = self.key_owner[k]
+            if scores.get(owner, 0) > SCORE_FUZZY + PRIOR_WEIGHT:
+                continue  # Already a literal hit
+            dist = substring_distance(q, self.keys[k], limit)
+            if dist <= limit:
+                offer(owner, SCORE_FUZZY - dist * 100 - self.key_len[k] * LENGTH_PENALTY + self.prior[owner])
+        return scores
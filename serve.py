@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import gc
+import json
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import zlib
+from typing import Optional
+
+from anime_data import load_anime_data
+from catalog import PACK_ENV, CatalogSession, get_catalog
+from catalog_pack import write_pack
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+HOST = "127.0.0.1"
+PUBLIC_PORT = 8550
+WORKER_BASE_PORT = 8600   # Worker i listens on WORKER_BASE_PORT + i (localhost only)
+PACK_PATH = 'data/catalog.pack'
+CONNECT_RETRIES = 50      # Workers may still be starting when the first clients arrive
+CONNECT_RETRY_DELAY = 0.1
+BUFFER_SIZE = 64 * 1024
+
+
+# --- Workers ---
+
+def run_worker(port: int, pack_path: Optional[str], headless: bool):
+    # Forked workers inherit the parent's catalog; spawned ones (no fork) read the pack
+    if pack_path:
+        os.environ[PACK_ENV] = pack_path
+    if headless:
+        asyncio.run(serve_headless(port))
+        return
+
+    import flet as ft
+    from main import main
+    ft.app(target=main, view=None, host=HOST, port=port, assets_dir="assets")
+
+
+async def serve_headless(port: int):
+    """
+    Game handlers without Flet, for load generation: one JSON request per
+    line, one session per connection. Requests:
+    {"op": "search", "q": str}, {"op": "guess", "id": int}, {"op": "new"}.
+    """
+    catalog = get_catalog()
+
+    async def handle(reader, writer):
+        sim = CatalogSession(catalog, random.Random())
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "search":
+                    reply = {"ids": [a.id for a in sim.on_search_change(request["q"])]}
+                elif op == "guess":
+                    anime = catalog.by_id.get(request["id"])
+                    if anime is None or sim.session.game_over or sim.session.has_guessed(anime):
+                        reply = {"error": "invalid guess"}
+                    else:
+                        sim.process_guess(anime)
+                        reply = {"won": sim.session.won, "remaining": sim.candidates.count}
+                elif op == "new":
+                    sim = CatalogSession(catalog, sim.rng)
+                    reply = {"ok": True}
+                else:
+                    reply = {"error": f"unknown op: {op}"}
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, HOST, port)
+    async with server:
+        await server.serve_forever()
+
+
+# --- Proxy ---
+
+class StickyProxy:
+    """
+    TCP front door on the public port. Each connection is pinned to one
+    worker for its whole lifetime (a Flet session is one WebSocket, so all
+    of its events reach the same process).
+
+    affinity="ip" also keeps every connection from one client address on
+    the same worker, so a reconnecting browser finds its session again;
+    affinity="connection" picks the least busy worker per connection.
+    """
+
+    def __init__(self, worker_ports, affinity: str = "ip"):
+        self.worker_ports = worker_ports
+        self.affinity = affinity
+        self.active = [0] * len(worker_ports)
+
+    def pick(self, peer) -> int:
+        if self.affinity == "ip" and peer:
+            # Stable across processes and restarts (unlike hash())
+            return zlib.crc32(peer[0].encode()) % len(self.worker_ports)
+        return min(range(len(self.worker_ports)), key=self.active.__getitem__)
+
+    async def _connect(self, port):
+        for _ in range(CONNECT_RETRIES):
+            try:
+                return await asyncio.open_connection(HOST, port)
+            except OSError:
+                await asyncio.sleep(CONNECT_RETRY_DELAY)
+        raise ConnectionError(f"Worker on port {port} is not responding")
+
+    async def handle(self, client_reader, client_writer):
+        i = self.pick(client_writer.get_extra_info("peername"))
+        try:
+            upstream_reader, upstream_writer = await self._connect(self.worker_ports[i])
+        except ConnectionError as e:
+            print(f"  {e}")
+            client_writer.close()
+            return
+
+        self.active[i] += 1
+        try:
+            await asyncio.gather(
+                _pipe(client_reader, upstream_writer),
+                _pipe(upstream_reader, client_writer),
+            )
+        finally:
+            self.active[i] -= 1
+
+    async def serve(self, port: int, host: str):
+        server = await asyncio.start_server(self.handle, host, port)
+        stop = asyncio.Event()
+        try:
+            # Shut down cleanly on SIGTERM too (process managers, bench_serve.py)
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C only
+        async with server:
+            await stop.wait()
+
+
+async def _pipe(reader, writer):
+    try:
+        while data := await reader.read(BUFFER_SIZE):
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Anidle with several worker processes behind one port.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=PUBLIC_PORT)
+    parser.add_argument("--host", default=HOST, help="public bind address (0.0.0.0 to expose)")
+    parser.add_argument("--worker-base-port", type=int, default=WORKER_BASE_PORT)
+    parser.add_argument("--affinity", choices=["ip", "connection"], default="ip")
+    parser.add_argument("--headless", action="store_true",
+                        help="serve the game handlers over a JSON-lines protocol (for bench_serve.py)")
+    args = parser.parse_args()
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Build the catalog (titles, search index, filter tables) once, here.
+        # Forked workers share its pages copy-on-write; gc.freeze() keeps
+        # the collector from writing to (and so copying) those objects.
+        catalog = get_catalog()
+        if not catalog.anime_list:
+            print("No data loaded.")
+            return
+        gc.freeze()
+        context, pack_path = multiprocessing.get_context("fork"), None
+        print(f"Catalog built once, shared by forked workers ({len(catalog.anime_list)} titles)")
+    else:
+        # No fork (Windows): every worker builds its catalog from the pack
+        anime_list = load_anime_data()
+        if not anime_list:
+            print("No data loaded.")
+            return
+        write_pack(PACK_PATH, anime_list)
+        context, pack_path = multiprocessing.get_context("spawn"), PACK_PATH
+        print(f"Wrote {PACK_PATH} ({os.path.getsize(PACK_PATH) / 1024:.0f} KB, {len(anime_list)} titles)")
+
+    ports = [args.worker_base_port + i for i in range(args.workers)]
+    workers = [
+        context.Process(target=run_worker, args=(port, pack_path, args.headless), daemon=True)
+        for port in ports
+    ]
+    for w in workers:
+        w.start()
+
+    mode = "headless" if args.headless else "flet"
+    print(f"Serving on http://{args.host}:{args.port} ({args.workers} {mode} workers, affinity={args.affinity})")
+    try:
+        asyncio.run(StickyProxy(ports, args.affinity).serve(args.port, args.host))
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        for w in workers:
+            w.terminate()
+        for w in workers:
+            w.join()
+
+
+if __name__ == "__main__":
+    main()
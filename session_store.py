@@ -0,0 +1,102 @@
+import base64
+import inspect
+import json
+from typing import List, Optional
+
+import flet as ft
+
+from anime_data import Anime
+from game_engine import GameSession
+from player_stats import PlayerStats
+
+# Config
+STORAGE_KEY = "anidle.session"
+STATS_KEY = "anidle.stats"
+
+
+class ClientStorage:
+    """
+    Async key/value access to browser storage: page.shared_preferences
+    (Flet >= 0.70) or page.client_storage on older versions; both sync and
+    async backends are accepted. Failures are logged and ignored, the game
+    keeps working without storage.
+    """
+
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self.backend = getattr(page, "shared_preferences", None) or getattr(page, "client_storage", None)
+
+    async def _call(self, method: str, *args):
+        if self.backend is None:
+            return None
+        result = getattr(self.backend, method)(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self._call("get", key)
+        except Exception as e:
+            print(f"Warning: could not read {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: str):
+        try:
+            await self._call("set", key, value)
+        except Exception as e:
+            print(f"Warning: could not write {key}: {e}")
+
+    async def remove(self, key: str):
+        try:
+            await self._call("remove", key)
+        except Exception as e:
+            print(f"Warning: could not remove {key}: {e}")
+
+
+class SessionStore(ClientStorage):
+    """
+    Keeps the current game in browser storage so a page refresh resumes it.
+    The value is GameSession.to_bytes() as URL-safe base64 (a few dozen chars).
+    """
+
+    def __init__(self, page: ft.Page, key: str = STORAGE_KEY):
+        super().__init__(page)
+        self.key = key
+
+    async def save(self, session: GameSession):
+        if session.game_over:
+            await self.remove(self.key)  # Finished games are not resumed
+        else:
+            await self.set(self.key, base64.urlsafe_b64encode(session.to_bytes()).decode("ascii"))
+
+    async def load(self, anime_list: List[Anime]) -> Optional[GameSession]:
+        token = await self.get(self.key)
+        if not token:
+            return None
+        try:
+            return GameSession.from_bytes(base64.urlsafe_b64decode(token), anime_list)
+        except Exception as e:
+            # Unknown version, catalog changed, corrupt value: start fresh
+            print(f"Warning: could not restore session: {e}")
+            return None
+
+
+class StatsStore(ClientStorage):
+    """PlayerStats as JSON; size stays bounded by PlayerStats' own compaction."""
+
+    def __init__(self, page: ft.Page, key: str = STATS_KEY):
+        super().__init__(page)
+        self.key = key
+
+    async def save(self, stats: PlayerStats):
+        await self.set(self.key, json.dumps(stats.to_dict(), separators=(",", ":")))
+
+    async def load(self) -> PlayerStats:
+        raw = await self.get(self.key)
+        if raw:
+            try:
+                return PlayerStats.from_dict(json.loads(raw))
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Warning: could not read stats, starting over: {e}")
+        return PlayerStats()
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import math
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from anime_data import load_anime_data
+from game_engine import GameSession, compare as _compare
+from candidate_filter import CandidateIndex
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+DEFAULT_GAMES = 5          # Games per target
+DEFAULT_SEED = 2024
+MAX_GUESSES = 200          # Safety cap per game
+ENTROPY_GUESS_SAMPLE = 40  # Guesses scored per turn by the entropy strategy
+ENTROPY_TARGET_SAMPLE = 150  # Candidates used to estimate each guess's entropy
+
+
+# compare() calls made in this process (the throughput benchmark figure)
+_compare_calls = 0
+
+
+def compare(guess, target):
+    global _compare_calls
+    _compare_calls += 1
+    return _compare(guess, target)
+
+
+# --- Strategies ---
+# A strategy picks the next guess from the remaining pool.
+# `candidates` are the titles still consistent with every row shown so far.
+
+def choose_random(session, candidates, unguessed, rng):
+    """Baseline: ignore the feedback entirely."""
+    return rng.choice(unguessed)
+
+
+def choose_greedy(session, candidates, unguessed, rng):
+    """Guess any title that is still consistent with the feedback."""
+    return rng.choice(candidates)
+
+
+def choose_entropy(session, candidates, unguessed, rng):
+    """Guess the title whose feedback splits the candidates most evenly."""
+    if len(candidates) <= 2:
+        return candidates[0]
+
+    targets = candidates
+    if len(targets) > ENTROPY_TARGET_SAMPLE:
+        targets = rng.sample(targets, ENTROPY_TARGET_SAMPLE)
+    pool = candidates if len(candidates) <= ENTROPY_GUESS_SAMPLE else rng.sample(candidates, ENTROPY_GUESS_SAMPLE)
+
+    best, best_entropy = None, -1.0
+    n = len(targets)
+    for guess in pool:
+        buckets = Counter(compare(guess, t).key() for t in targets)
+        entropy = -sum((c / n) * math.log2(c / n) for c in buckets.values())
+        if entropy > best_entropy:
+            best, best_entropy = guess, entropy
+    return best
+
+
+STRATEGIES = {
+    "random": choose_random,
+    "greedy": choose_greedy,
+    "entropy": choose_entropy,
+}
+
+
+def play_game(anime_list, target, strategy, rng, index):
+    """Play one headless game; returns the number of guesses to solve."""
+    session = GameSession(anime_list, target=target, rng=rng)
+    consistent = index.new_set()
+    candidates = list(anime_list)
+    unguessed = list(anime_list)
+
+    while not session.game_over and len(session.guesses) < MAX_GUESSES:
+        guess = strategy(session, candidates, unguessed, rng)
+        feedback = session.guess(guess)
+        unguessed.remove(guess)
+
+        # Keep only titles that would have produced exactly this row
+        consistent.apply(guess, feedback)
+        candidates = consistent.members()
+        if not candidates:
+            candidates = unguessed
+
+    # Each session.guess() ran one compare() inside the engine
+    global _compare_calls
+    _compare_calls += len(session.guesses)
+    return len(session.guesses)
+
+
+# --- Worker process ---
+
+_catalog = None
+_index = None
+
+
+def _init_worker():
+    global _catalog, _index
+    # Duplicate ids exist in the raw data; keep the first occurrence
+    seen = {}
+    for a in load_anime_data():
+        seen.setdefault(a.id, a)
+    _catalog = list(seen.values())
+    _index = CandidateIndex(_catalog)
+
+
+def _run_target(job):
+    index, strategy_name, games, seed = job
+    target = _catalog[index]
+    strategy = STRATEGIES[strategy_name]
+    results = []
+    calls_before = _compare_calls
+    for g in range(games):
+        # Deterministic per (seed, target, game) regardless of scheduling
+        rng = random.Random(f"{seed}:{target.id}:{g}")
+        results.append(play_game(_catalog, target, strategy, rng, _index))
+    return target.id, target.name_cn, results, _compare_calls - calls_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Anidle difficulty simulator.")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="greedy")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="games per target")
+    parser.add_argument("--limit", type=int, default=0, help="only simulate the first N targets")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--top", type=int, default=20, help="hardest titles to list")
+    parser.add_argument("--csv", help="write per-anime results to this CSV file")
+    args = parser.parse_args()
+
+    _init_worker()
+    total_targets = len(_catalog) if not args.limit else min(args.limit, len(_catalog))
+    jobs = [(i, args.strategy, args.games, args.seed) for i in range(total_targets)]
+
+    print(f"Simulating {args.games} game(s) x {total_targets} targets "
+          f"with '{args.strategy}' strategy...")
+    start = time.perf_counter()
+    with Pool(processes=args.workers, initializer=_init_worker) as pool:
+        rows = pool.map(_run_target, jobs, chunksize=max(1, len(jobs) // 200))
+    elapsed = time.perf_counter() - start
+
+    games = sum(len(r[2]) for r in rows)
+    compares = sum(r[3] for r in rows)
+    all_counts = [n for r in rows for n in r[2]]
+    stats = sorted(((sum(r[2]) / len(r[2]), max(r[2]), r[0], r[1]) for r in rows), reverse=True)
+
+    print(f"\nGames played: {games} in {elapsed:.2f}s ({games / elapsed:,.0f} games/s)")
+    print(f"compare() calls: {compares:,} ({compares / elapsed:,.0f}/s)")
+    print(f"Average guesses to solve: {sum(all_counts) / len(all_counts):.2f}"
+          f" (capped at {MAX_GUESSES})")
+    histogram = Counter(min(n, 10) for n in all_counts)
+    print("Distribution: " + ", ".join(
+        f"{'10+' if k == 10 else k}: {histogram[k]}" for k in sorted(histogram)))
+
+    print(f"\n--- Hardest {args.top} titles ---")
+    for avg, worst, mal_id, name in stats[:args.top]:
+        print(f"{avg:6.2f} (max {worst:3d})  [{mal_id}] {name}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "name_cn", "avg_guesses", "max_guesses"])
+            for avg, worst, mal_id, name in stats:
+                writer.writerow([mal_id, name, f"{avg:.3f}", worst])
+        print(f"\nSaved to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
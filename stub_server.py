@@ -0,0 +1,98 @@
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cassette import CASSETTE_DIR, TRANSLATE_PATH, Cassette, body_bytes, http_key
+
+# Fix stdout encoding for Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Config
+HOST = "127.0.0.1"
+PORT = 8765
+LATENCY_MS = 0            # Added to every reply, to mimic the real APIs in benchmarks
+
+
+def load_cassettes(directory):
+    """All cassettes in directory merged into one (keys are full URLs, so they do not collide)."""
+    interactions = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json.gz'))):
+        interactions += Cassette.load(path).interactions
+    return Cassette(interactions)
+
+
+def make_handler(cassette: Cassette, latency_ms: float):
+    class Handler(BaseHTTPRequestHandler):
+        """
+        Serves recorded responses: GET /<scheme>/<host>/<path>?<query> replays
+        GET <scheme>://<host>/<path>?<query>; GET /__translate__?key=... replays
+        a translator call. Unknown requests get a 404.
+        """
+
+        def do_GET(self):
+            parts = urllib.parse.urlsplit(self.path)
+            if parts.path == TRANSLATE_PATH:
+                key = urllib.parse.parse_qs(parts.query).get('key', [''])[0]
+            else:
+                scheme, _, rest = parts.path.lstrip('/').partition('/')
+                key = http_key('GET', f"{scheme}://{rest}" + (f"?{parts.query}" if parts.query else ''))
+
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            item = cassette.next(key)
+            if item is None:
+                self.send_error(404, "Not in cassette")
+                return
+            body = body_bytes(item)
+            self.send_response(item['status'])
+            for k, v in item['headers'].items():
+                self.send_header(k, v)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # One line per request would drown the pipeline output
+
+    return Handler
+
+
+def serve(directory=CASSETTE_DIR, host=HOST, port=PORT, latency_ms=LATENCY_MS):
+    """Start the stub server in a background thread. Returns the server (call shutdown() to stop)."""
+    cassette = load_cassettes(directory)
+    server = ThreadingHTTPServer((host, port), make_handler(cassette, latency_ms))
+    server.cassette = cassette
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded API responses (see cassette.py) over HTTP.")
+    parser.add_argument('--dir', default=CASSETTE_DIR)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--latency', type=float, default=LATENCY_MS, help="milliseconds added to every reply")
+    args = parser.parse_args()
+
+    server = serve(args.dir, args.host, args.port, args.latency)
+    print(f"Replaying {len(server.cassette.interactions)} interactions from {args.dir} "
+          f"on http://{args.host}:{args.port} (latency {args.latency:g} ms)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.shutdown()
+        if server.cassette.misses:
+            print(f"{len(server.cassette.misses)} request(s) were not in the cassettes.")
+
+
+if __name__ == "__main__":
+    main()
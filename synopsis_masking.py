@@ -0,0 +1,213 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Set, Tuple
+
+MASK = "[***]"
+
+# Season / edition markers stripped from titles to get the franchise name
+SEASON_MARKERS = [
+    r'第\s*[一二三四五六七八九十百\d]+\s*[季期部章]',
+    r'(?:最終|最终)季', r'完結篇', r'完结篇', r'劇場版', r'剧场版', r'続編', r'続章', r'續章',
+    r'電影', r'电影', r'映画',
+    r'\b(?:season|part|cour)\s*\.?\s*\d+\b', r'\b\d+(?:st|nd|rd|th)\s+season\b',
+    r'\bthe\s+(?:final|movie)\b', r'\bfinal\s+season\b', r'\bmovie\b',
+    r'\b(?:ii|iii|iv|vi{0,3})\b\s*$', r'[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]+', r'\s\d+\s*$',
+]
+_MARKER_RE = re.compile('|'.join(SEASON_MARKERS), re.IGNORECASE)
+
+# Title separators: the part before one is usually the franchise name
+_SEPARATOR_RE = re.compile(r"[：:～~\-–—!！?？()（）「」『』《》【】\[\]/／|]")
+
+MIN_CJK_ALIAS = 2    # e.g. "銀魂"
+MIN_LATIN_ALIAS = 4  # Shorter Latin words are too likely to be ordinary text
+# A derived alias (not a full title) found inside this many other anime's
+# titles is a common word ("命運", "偶像"), not a franchise name
+GENERIC_ALIAS_TITLES = 3
+SHORT_ALIAS_TITLES = 2   # Stricter for short ones (SHORT_CJK_ALIAS characters)
+SHORT_CJK_ALIAS = 2
+
+
+def _is_latin(text: str) -> bool:
+    return all(ord(c) < 0x2E80 for c in text)
+
+
+def _to_fullwidth(text: str) -> str:
+    return ''.join(chr(ord(c) + 0xFEE0) if '!' <= c <= '~' else ('　' if c == ' ' else c)
+                   for c in text)
+
+
+def _clean(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip(" .,:;-–—~・·'’°")
+
+
+def title_aliases(*titles: str, generic: Set[str] = frozenset()) -> Set[str]:
+    """
+    All strings that give the answer away: full titles, titles without
+    season markers, the leading segment before a separator (plus CJK
+    subtitles), and their half/full-width variants. Derived aliases in
+    generic (see generic_aliases) are left out; full titles never are.
+    """
+    aliases = set()
+    for title in titles:
+        if not title or title == "Unknown":
+            continue
+        base = unicodedata.normalize('NFKC', title)
+        stripped = _clean(_MARKER_RE.sub(' ', base))
+        full = {_clean(t) for t in (title, base, base.replace(":", "："), base.replace("：", ":"))}
+        candidates = full | {stripped}
+        for text in (base, stripped):
+            parts = [_clean(p) for p in _SEPARATOR_RE.split(text)]
+            candidates.add(_clean(_MARKER_RE.sub(' ', parts[0])))
+            # Latin subtitles ("Brotherhood") are too often ordinary words
+            candidates.update(p for p in parts[1:] if not _is_latin(p) and len(p) > MIN_CJK_ALIAS)
+        # CJK titles put the franchise first: "劇場版 鏈鋸人 蕾塞篇" -> "鏈鋸人"
+        head = stripped.split(' ')[0]
+        if not _is_latin(head):
+            candidates.add(head)
+
+        for c in candidates:
+            c = _clean(c)
+            if not c or c.isdigit() or not _clean(_MARKER_RE.sub(' ', c)):
+                continue  # Empty, a bare number, or only a marker ("劇場版", "The Movie")
+            if len(c) < (MIN_LATIN_ALIAS if _is_latin(c) else MIN_CJK_ALIAS):
+                continue
+            if c not in full and c.lower() in generic:
+                continue
+            aliases.add(c)
+            aliases.add(_to_fullwidth(c))
+    return aliases
+
+
+def _joins(a: str, b: str) -> bool:
+    """Adjacent letters of one script are one word; digits, numerals and a script change are not."""
+    return a.isalpha() and b.isalpha() and _is_latin(a) == _is_latin(b)
+
+
+def _inside_word(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] runs into a neighbouring letter of the same script."""
+    before = text[start - 1] if start else ' '
+    after = text[end] if end < len(text) else ' '
+    return _joins(before, text[start]) or _joins(text[end - 1], after)
+
+
+def generic_aliases(catalog_titles: List[Tuple[str, ...]]) -> Set[str]:
+    """
+    CJK aliases that are common words rather than franchise names: inside
+    the titles of other anime they run into a longer word ("命運" in
+    "命運石之門", "日常" in "...的日常"), in at least GENERIC_ALIAS_TITLES
+    anime (SHORT_ALIAS_TITLES for short aliases). In its sequels a
+    franchise name is followed by a separator, number or other script
+    ("銀魂'", "傷物語Ⅱ", "機動戰士高達SEED"), so it is kept.
+    """
+    # Latin aliases only mask whole words (mask_text), and a whole word in
+    # another title is as likely a sequel as a common word: CJK only
+    own = [{a for a in title_aliases(*titles) if not _is_latin(a)} for titles in catalog_titles]
+    texts = ['\n'.join(unicodedata.normalize('NFKC', t) for t in titles if t).lower()
+             for titles in catalog_titles]
+    lengths = sorted({len(a) for aliases in own for a in aliases})
+    owners: Dict[str, Set[int]] = {}
+    for i, aliases in enumerate(own):
+        for a in aliases:
+            owners.setdefault(a, set()).add(i)
+
+    # alias -> other anime whose titles contain it inside a longer word
+    embedded: Dict[str, Set[int]] = {}
+    for i, text in enumerate(texts):
+        for n in lengths:
+            for start in range(len(text) - n + 1):
+                piece = text[start:start + n]
+                if piece not in owners or i in owners[piece]:
+                    continue
+                if _inside_word(text, start, start + n):
+                    embedded.setdefault(piece, set()).add(i)
+
+    generic = set()
+    for a, others in embedded.items():
+        if len(others) >= (SHORT_ALIAS_TITLES if len(a) <= SHORT_CJK_ALIAS else GENERIC_ALIAS_TITLES):
+            generic.add(a)
+    return generic
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: one pass over the text finds every alias occurrence."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[int] = [0]  # Longest pattern length ending at this state
+
+        for p in patterns:
+            state = 0
+            for ch in p:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(0)
+                state = nxt
+            self.out[state] = max(self.out[state], len(p))
+
+        # Breadth-first failure links
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0  # Root children fail to root
+                self.out[nxt] = max(self.out[nxt], self.out[self.fail[nxt]])
+                queue.append(nxt)
+
+    def find_spans(self, text: str) -> List[Tuple[int, int]]:
+        """(start, end) of the longest match ending at each position."""
+        spans = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            if self.out[state]:
+                spans.append((i + 1 - self.out[state], i + 1))
+        return spans
+
+
+def compile_matcher(aliases: Iterable[str]) -> AhoCorasick:
+    # Latin aliases match case-insensitively (text is lowercased before search)
+    return AhoCorasick({a.lower() for a in aliases})
+
+
+def mask_text(text: str, matcher: AhoCorasick) -> str:
+    if not text:
+        return text
+    lowered = text.lower()
+    if len(lowered) != len(text):  # Rare case-mapping that changes length
+        lowered = text
+    spans = sorted(span for span in matcher.find_spans(lowered)
+                   if not (_is_latin(lowered[span[0]:span[1]]) and _inside_word(lowered, *span)))
+    if not spans:
+        return text
+
+    # Merge overlapping/adjacent matches into one mask
+    out = []
+    pos = 0
+    cur_start, cur_end = spans[0]
+    for start, end in spans[1:]:
+        if start <= cur_end:
+            cur_end = max(cur_end, end)
+            continue
+        out.append(text[pos:cur_start])
+        out.append(MASK)
+        pos = cur_end
+        cur_start, cur_end = start, end
+    out.append(text[pos:cur_start])
+    out.append(MASK)
+    out.append(text[cur_end:])
+    return ''.join(out)
+
+
+def mask_synopsis(synopsis: str, *titles: str) -> str:
+    """Mask every alias of the given titles in one pass (used at build time)."""
+    return mask_text(synopsis, compile_matcher(title_aliases(*titles)))
@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from anime_data import load_anime_data
+from candidate_filter import CandidateIndex
+from game_engine import compare
+
+ANIME = load_anime_data()
+INDEX = CandidateIndex(ANIME)
+
+
+def brute_force(rows, franchise_mode):
+    """Every title that would have shown exactly these rows, by plain compare()."""
+    return {a.id for a in ANIME
+            if all(compare(guess, a, franchise_mode).key() == feedback.key() for guess, feedback in rows)}
+
+
+@pytest.mark.parametrize("franchise_mode", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed, franchise_mode):
+    rng = random.Random(seed)
+    target = rng.choice(ANIME)
+    candidates = INDEX.new_set(franchise_mode)
+    rows = []
+    for guess in rng.sample(ANIME, 6):
+        feedback = compare(guess, target, franchise_mode)
+        candidates.apply(guess, feedback)
+        rows.append((guess, feedback))
+
+        expected = brute_force(rows, franchise_mode)
+        assert {a.id for a in candidates.members()} == expected
+        assert candidates.count == len(expected)
+        assert target.id in expected
+        assert all(candidates.contains(a) == (a.id in expected) for a in ANIME)
+
+
+def test_reset():
+    target, guess = ANIME[0], ANIME[1]
+    candidates = INDEX.new_set()
+    candidates.apply(guess, compare(guess, target))
+    assert candidates.count < len(ANIME)
+    candidates.reset()
+    assert candidates.count == len(ANIME)
@@ -0,0 +1,31 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import anime_data
+import embedded_data
+from catalog_schema import SCHEMA_VERSION
+from generate_embedded import collect_data
+from search_index import SearchIndex
+
+
+def test_embedded_data_matches_data_dir(monkeypatch):
+    # embedded_data.py is committed: it must be regenerated whenever data/ changes
+    monkeypatch.chdir(REPO_DIR)
+    data = collect_data()
+    assert data is not None
+    assert set(data) == set(anime_data.DATA_KEYS)
+    for key, value in data.items():
+        assert getattr(embedded_data, key) == value, f"{key} is stale, run generate_embedded.py"
+
+
+def test_embedded_data_is_validated():
+    assert embedded_data.CATALOG_SCHEMA == SCHEMA_VERSION
+
+
+def test_alias_search():
+    index = SearchIndex(anime_data.load_anime_data(), embedded_data.ALIASES)
+    ids = {a.id for a in index.search("鋼鍊")}
+    assert {121, 5114} <= ids  # Fullmetal Alchemist, Brotherhood
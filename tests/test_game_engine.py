@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from anime_data import load_anime_data
+from game_engine import HINT_COSTS, GameSession, _write_varint
+
+ANIME = load_anime_data()
+
+
+def played_session(franchise_mode=False):
+    rng = random.Random(3)
+    target = next(a for a in ANIME if len(a.genres) >= 3)
+    session = GameSession(ANIME, target=target, rng=rng, franchise_mode=franchise_mode)
+    for anime in rng.sample([a for a in ANIME if a.id != target.id], 12):
+        session.guess(anime)
+    session.unlock_hint(1)
+    session.unlock_hint(3)
+    return session
+
+
+def encode(target, guesses, hint_bits, tag_bits, penalty, version=2, flags=0):
+    out = bytearray([version])
+    for value in (target, len(guesses), *guesses, hint_bits, tag_bits, penalty):
+        _write_varint(out, value)
+    if version >= 2:
+        _write_varint(out, flags)
+    return bytes(out)
+
+
+@pytest.mark.parametrize("franchise_mode", [False, True])
+def test_bytes_round_trip(franchise_mode):
+    session = played_session(franchise_mode)
+    data = session.to_bytes()
+    restored = GameSession.from_bytes(data, ANIME)
+    assert restored.to_dict() == session.to_dict()
+    assert restored.known_tag_set == session.known_tag_set
+    assert restored.to_bytes() == data
+    assert len(data) < 60  # 12 guesses: one version byte plus small varints
+
+
+def test_v1_payload_has_no_flags():
+    session = played_session()
+    data = encode(session.target.id, [a.id for a in session.guesses], 0b100,
+                  sum(1 << i for i in session.revealed_tag_indices), session.penalty_count, version=1)
+    restored = GameSession.from_bytes(data, ANIME)
+    assert restored.franchise_mode is False
+    assert restored.to_dict()["guesses"] == session.to_dict()["guesses"]
+
+
+def test_corrupt_payload_is_clamped():
+    target = next(a for a in ANIME if len(a.genres) == 2)
+    # Tag 5 and hint level 7 do not exist, LV1 is not a level, penalty is made up
+    data = encode(target.id, [], hint_bits=0b1000101, tag_bits=0b100001, penalty=999)
+    session = GameSession.from_bytes(data, ANIME)
+    assert session.revealed_tag_indices == {0}
+    assert session.unlocked_hints == {3}
+    assert session.penalty_count == HINT_COSTS[1] + HINT_COSTS[3]
+    # Every restored index is usable by the UI (main.add_hint_tag)
+    assert [session.hint_tags[i] for i in session.revealed_tag_indices]
+
+
+@pytest.mark.parametrize("data", [b"", bytes([2, 0x80]), bytes([9, 1, 0, 0, 0, 0, 0])])
+def test_unreadable_payload_raises(data):
+    with pytest.raises(ValueError):
+        GameSession.from_bytes(data, ANIME)
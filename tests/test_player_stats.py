@@ -0,0 +1,97 @@
+import bisect
+import os
+import random
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from anime_data import load_anime_data
+from game_engine import GameSession
+from player_stats import HISTOGRAM_BOUNDS, HISTORY_LIMIT, MONTHS_KEPT, PlayerStats
+
+ANIME = load_anime_data()
+DAY = 86400
+
+
+def finished_session(rng):
+    """A won game after a few wrong guesses, or one given up."""
+    target = rng.choice(ANIME)
+    session = GameSession(ANIME, target=target, rng=rng)
+    for anime in rng.sample([a for a in ANIME if a.id != target.id], rng.randrange(0, 8)):
+        session.guess(anime)
+    if rng.random() < 0.3:
+        session.unlock_hint(1)
+    if session.guesses and rng.random() < 0.25:
+        session.give_up()
+    else:
+        session.guess(target)
+    return session
+
+
+def play(n, seed=0, start=1_700_000_000):
+    rng = random.Random(seed)
+    stats, results = PlayerStats(), []
+    for i in range(n):
+        session = finished_session(rng)
+        stats.record(session, timestamp=start + i * DAY)
+        results.append((session.won, session.attempts))
+    return stats, results
+
+
+def test_aggregates_match_recount():
+    stats, results = play(300)
+    wins = [attempts for won, attempts in results if won]
+    assert stats.games == len(results)
+    assert stats.wins == len(wins)
+    assert stats.win_attempts == sum(wins)
+
+    histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for attempts in wins:
+        histogram[bisect.bisect_left(HISTOGRAM_BOUNDS, attempts)] += 1
+    assert stats.histogram == histogram
+
+    streak = best = 0
+    for won, _ in results:
+        streak = streak + 1 if won else 0
+        best = max(best, streak)
+    assert (stats.current_streak, stats.best_streak) == (streak, best)
+
+
+def test_history_is_compacted():
+    stats, _ = play(HISTORY_LIMIT + 60)
+    assert len(stats.history) <= HISTORY_LIMIT
+    folded = sum(totals[0] for totals in stats.monthly.values())
+    assert folded + len(stats.history) == stats.games
+    assert sum(totals[1] for totals in stats.monthly.values()) + sum(r[2] for r in stats.history) == stats.wins
+    # The kept history is the most recent games, in order
+    assert [r[0] for r in stats.history] == sorted(r[0] for r in stats.history)
+
+
+def test_old_months_are_dropped():
+    stats, _ = play(1200)
+    assert len(stats.monthly) <= MONTHS_KEPT
+    assert stats.games == 1200  # All-time aggregates keep everything
+
+
+def test_dict_round_trip():
+    stats, _ = play(HISTORY_LIMIT + 30)
+    restored = PlayerStats.from_dict(stats.to_dict())
+    assert restored.to_dict() == stats.to_dict()
+
+
+def test_give_up_records_a_loss():
+    rng = random.Random(1)
+    stats = PlayerStats()
+    target = ANIME[0]
+    won = GameSession(ANIME, target=target, rng=rng)
+    won.guess(target)
+    stats.record(won)
+
+    lost = GameSession(ANIME, target=target, rng=rng)
+    lost.guess(ANIME[1])
+    lost.give_up()
+    assert lost.game_over and not lost.won
+    stats.record(lost)
+    assert (stats.games, stats.wins, stats.current_streak, stats.best_streak) == (2, 1, 0, 1)
+    assert sum(stats.histogram) == 1
@@ -0,0 +1,59 @@
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import embedded_data
+from anime_data import load_anime_data
+from search_index import SearchIndex, substring_distance
+
+ANIME = load_anime_data()
+INDEX = SearchIndex(ANIME, embedded_data.ALIASES)
+
+
+def ids(query, **kwargs):
+    return [a.id for a in INDEX.search(query, **kwargs)]
+
+
+@pytest.mark.parametrize("query, anime_id", [
+    ("AOT", 16498),
+    ("KNY", 38000),
+    ("間諜家家酒", 50265),
+    ("fmab", 5114),
+])
+def test_alias_hit(query, anime_id):
+    assert ids(query)[0] == anime_id
+
+
+@pytest.mark.parametrize("query, anime_id", [
+    ("Atack on Titan", 16498),      # Missing letter
+    ("Attack on Titen", 16498),     # Wrong letter
+    ("Spy x Famliy", 50265),        # Swapped letters
+    ("Kimetsu no Yaoba", 38000),
+])
+def test_typo_hit(query, anime_id):
+    assert anime_id in ids(query, limit=5)
+
+
+def test_exact_title_ranks_first():
+    assert ids("Fullmetal Alchemist")[0] == 121
+    assert ids("進擊的巨人")[0] == 16498
+
+
+def test_accept_filters_results():
+    result = ids("Fullmetal", accept=lambda a: a.id != 121)
+    assert 121 not in result and 5114 in result
+
+
+def test_find_exact():
+    assert INDEX.find_exact("  attack on titan ").id == 16498
+    assert INDEX.find_exact("鬼滅之刃").id == 38000
+    assert INDEX.find_exact("Attack on") is None
+
+
+def test_substring_distance():
+    assert substring_distance("titen", "attackontitan", 2) == 1
+    assert substring_distance("abc", "xyz", 1) > 1
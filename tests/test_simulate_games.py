@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_simulator(tmp_path, strategy, hash_seed):
+    out = tmp_path / f"{strategy}-{hash_seed}.csv"
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    subprocess.run(
+        [sys.executable, "simulate_games.py", "--strategy", strategy, "--games", "2",
+         "--limit", "40", "--workers", "2", "--csv", str(out)],
+        cwd=REPO_DIR, env=env, check=True, capture_output=True,
+    )
+    return out.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("strategy", ["greedy", "entropy"])
+def test_results_do_not_depend_on_hash_seed(tmp_path, strategy):
+    # Same --seed must give the same per-title results in every process
+    assert run_simulator(tmp_path, strategy, 1) == run_simulator(tmp_path, strategy, 2)
@@ -3,6 +3,7 @@ import os
 import time
 from deep_translator import GoogleTranslator
 from opencc import OpenCC
+from catalog_schema import load_raw_anime
 
 # Config
 RAW_DATA_PATH = 'data/rawAnime.json'
@@ -34,9 +35,7 @@ def is_mostly_english(text):
 
 def main():
     print("Loading data...")
-    raw_data = load_json(RAW_DATA_PATH)
-    if isinstance(raw_data, dict): 
-        raw_data = raw_data.get('data', [])
+    raw_data = load_raw_anime(RAW_DATA_PATH)
     
     cn_synopsis = load_json(CN_SYNOPSIS_PATH)
     